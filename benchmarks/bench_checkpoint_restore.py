@@ -0,0 +1,83 @@
+"""
+Benchmark: parameter server time-to-serving after a restart.
+
+Runs a number of one-update rounds (each anchored and checkpointed), then measures
+how long a new FederatedLearningServicer takes to come up from the ledger + the
+memory-mapped checkpoint, against a cold start and against unpickling the same
+weights with torch.load.
+
+Run from the repository root:
+    python benchmarks/bench_checkpoint_restore.py [--rounds 50] [--repeats 5]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, 'shared'))
+sys.path.append(os.path.join(project_root, 'parameter-server'))
+
+
+class _Context:
+    def set_code(self, code):
+        pass
+
+    def set_details(self, details):
+        pass
+
+    def invocation_metadata(self):
+        return ()
+
+
+def best_of(repeats, build):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            build()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=50)
+    parser.add_argument('--repeats', type=int, default=5)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix='sctl-bench-'))  # keep ledger/checkpoint files out of the repo
+    os.environ['SCTL_ROUND_TARGET'] = '1'
+    import torch
+    import app
+    import federated_service_pb2 as pb2
+    from shared.utils import get_weights_as_bytes
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        servicer = app.FederatedLearningServicer()
+        for _ in range(args.rounds):
+            blob = get_weights_as_bytes(app.SimpleCNN())
+            servicer.SendModelUpdate(pb2.ModelUpdate(worker_id='w', round_number=servicer.current_round,
+                                                     num_samples=10, weights_data=blob), _Context())
+        servicer.committer.flush()
+
+    buffer = io.BytesIO()
+    torch.save(servicer.global_model.state_dict(), buffer)
+    pickled = buffer.getvalue()
+
+    def unpickle():
+        model = app.SimpleCNN()
+        model.load_state_dict(torch.load(io.BytesIO(pickled), weights_only=True))
+
+    restored = best_of(args.repeats, app.FederatedLearningServicer)
+    app.CHECKPOINT_DIR = ''
+    cold = best_of(args.repeats, app.FederatedLearningServicer)
+
+    print(f"{args.rounds} rounds on the ledger, {len(servicer.checkpoints.history())} checkpointed")
+    print(f"{'restart from mmap checkpoint':<32}{restored:>10.1f} ms")
+    print(f"{'cold start (no checkpoint)':<32}{cold:>10.1f} ms")
+    print(f"{'torch.load of the same weights':<32}{best_of(args.repeats, unpickle):>10.1f} ms")
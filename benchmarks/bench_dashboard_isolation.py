@@ -0,0 +1,135 @@
+"""
+Benchmark: model ingestion throughput while the dashboard API is under load,
+with Flask inside the parameter server (thread) vs a separate API process (process).
+
+For each mode, a servicer folds a fixed batch of uploads while a child process hammers
+/api/system-overview and /api/blockchain queries with HTTP clients. Reports uploads/s
+against an idle baseline. Isolation only shows with spare cores for the API process.
+
+Run from the repository root:
+    python benchmarks/bench_dashboard_isolation.py [--uploads 60] [--clients 16]
+"""
+import argparse
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, 'shared'))
+sys.path.append(os.path.join(project_root, 'parameter-server'))
+
+PATHS = ['/api/system-overview', '/api/blockchain?limit=20', '/api/blockchain/round/0']
+
+
+class _Context:
+    def set_code(self, code):
+        pass
+
+    def set_details(self, details):
+        pass
+
+
+def hammer(port, clients, duration):
+    """Child process: `clients` threads issuing dashboard GETs for `duration` seconds."""
+    served = [0] * clients
+
+    def client(i):
+        deadline = time.time() + duration
+        while time.time() < deadline:
+            try:
+                with urllib.request.urlopen(f'http://127.0.0.1:{port}{PATHS[i % len(PATHS)]}', timeout=5) as r:
+                    r.read()
+                served[i] += 1
+            except OSError:
+                time.sleep(0.05)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    print(sum(served))
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/api/system-overview', timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("Dashboard API did not come up")
+
+
+def run(mode, uploads, clients, port):
+    os.chdir(tempfile.mkdtemp(prefix='sctl-bench-'))  # keep ledger/snapshot files out of the repo
+    os.environ['SCTL_SNAPSHOT_PATH'] = os.path.abspath('dashboard_state')
+    os.environ['SCTL_ROUND_TARGET'] = '10'
+    import app
+    import federated_service_pb2 as pb2
+    from shared.utils import get_weights_as_bytes
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        servicer = app.FederatedLearningServicer()
+    app.global_servicer = servicer
+    api_process = None
+    if mode == 'thread':
+        threading.Thread(target=lambda: app.app.run(host='127.0.0.1', port=port, use_reloader=False),
+                         daemon=True).start()
+    elif mode == 'process':
+        api_process = subprocess.Popen(
+            [sys.executable, os.path.join(project_root, 'parameter-server', 'dashboard_api.py'),
+             '--port', str(port), '--snapshot', os.environ['SCTL_SNAPSHOT_PATH'], '--ledger', servicer.dlt.filename],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    if mode != 'idle':
+        wait_for_port(port)
+
+    blob = get_weights_as_bytes(servicer.global_model)
+    load = None
+    if mode != 'idle':
+        load = subprocess.Popen([sys.executable, __file__, '--hammer', str(port), str(clients), '600'],
+                                stdout=subprocess.PIPE, text=True)
+        time.sleep(1.0)  # let the load ramp up
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(uploads):
+            update = pb2.ModelUpdate(worker_id=f'w{i % 10}', round_number=servicer.current_round,
+                                     num_samples=10, weights_data=blob)
+            servicer.SendModelUpdate(update, _Context())
+    elapsed = time.perf_counter() - start
+
+    if load is not None:
+        load.terminate()
+    if api_process is not None:
+        api_process.terminate()
+    return uploads / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--uploads', type=int, default=60)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--mode', choices=['idle', 'thread', 'process'])
+    parser.add_argument('--hammer', nargs=3, type=int, metavar=('PORT', 'CLIENTS', 'SECONDS'))
+    args = parser.parse_args()
+
+    if args.hammer:
+        hammer(*args.hammer)
+    elif args.mode:
+        print(f"{run(args.mode, args.uploads, args.clients, 5099):.1f}")
+    else:
+        # Each mode in a fresh interpreter: Flask threads cannot be stopped once started
+        print(f"{'dashboard':<12}{'uploads/s':>12}")
+        for mode in ('idle', 'thread', 'process'):
+            out = subprocess.run([sys.executable, __file__, '--mode', mode, '--uploads', str(args.uploads),
+                                  '--clients', str(args.clients)], capture_output=True, text=True)
+            print(f"{mode:<12}{out.stdout.strip().splitlines()[-1] if out.stdout.strip() else 'failed':>12}")
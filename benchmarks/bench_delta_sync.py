@@ -0,0 +1,67 @@
+"""
+Benchmark: global model download size, full weights vs delta-sync diff.
+
+Simulates FedAvg rounds (each worker takes a few SGD steps from the global model, the
+server averages) and, for every round, measures the diff a worker holding the
+previous round's model would download, plus the time to build and apply it.
+
+Run from the repository root:
+    python benchmarks/bench_delta_sync.py [--rounds 5] [--workers 3] [--steps 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+import torch
+import torch.nn.functional as F
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, 'parameter-server'))
+
+from cnn_model import SimpleCNN
+from shared.model_diff import encode_model_diff, apply_model_diff
+from shared.model_hash import state_dict_hash
+from shared.utils import get_weights_as_bytes
+
+
+def local_training(global_state, steps):
+    model = SimpleCNN()
+    model.load_state_dict(global_state)
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.01)
+    for _ in range(steps):
+        optimizer.zero_grad()
+        F.cross_entropy(model(torch.randn(10, 3, 32, 32)), torch.randint(0, 10, (10,))).backward()
+        optimizer.step()
+    return model.state_dict()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--workers', type=int, default=3)
+    parser.add_argument('--steps', type=int, default=5)
+    args = parser.parse_args()
+
+    torch.manual_seed(0)
+    model = SimpleCNN()
+    previous = {name: tensor.clone() for name, tensor in model.state_dict().items()}
+    print(f"{'round':>5}{'full KB':>10}{'diff KB':>10}{'saved':>8}{'encode ms':>11}{'apply ms':>10}")
+    for round_num in range(1, args.rounds + 1):
+        updates = [local_training(previous, args.steps) for _ in range(args.workers)]
+        current = {name: sum(update[name] for update in updates) / args.workers for name in previous}
+        model.load_state_dict(current)
+        full = get_weights_as_bytes(model)
+
+        started = time.perf_counter()
+        diff = encode_model_diff(previous, current)
+        encoded = time.perf_counter()
+        rebuilt = apply_model_diff(previous, diff)
+        applied = time.perf_counter()
+        assert state_dict_hash(rebuilt) == state_dict_hash(current), "diff is not lossless"
+
+        print(f"{round_num:>5}{len(full) / 1024:>10.1f}{len(diff) / 1024:>10.1f}"
+              f"{100 * (1 - len(diff) / len(full)):>7.1f}%{(encoded - started) * 1000:>11.2f}"
+              f"{(applied - encoded) * 1000:>10.2f}")
+        previous = {name: tensor.clone() for name, tensor in current.items()}
@@ -0,0 +1,75 @@
+"""
+Ingest benchmark: decode + validate throughput for incoming update blobs,
+on the handler threads (GIL-bound) vs the shared-memory process pool.
+
+Run from the repository root:
+    python benchmarks/bench_ingest.py [updates] [encoding: raw|fp16|int8|topk]
+"""
+import os
+import sys
+import time
+from concurrent import futures
+
+import torch
+
+UPDATES = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+ENCODING = sys.argv[2] if len(sys.argv) > 2 else 'raw'
+HANDLER_THREADS = 10   # matches the sync gRPC server's pool
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, 'shared'))
+sys.path.append(os.path.join(project_root, 'parameter-server'))
+
+import federated_service_pb2 as pb2
+from cnn_model import SimpleCNN
+from aggregation import FedAvgAccumulator
+from update_ingest import IngestPool, decode_blob, flatten_update, check_values
+from shared.update_codec import ENCODINGS_BY_NAME, encode_update
+
+
+def run(label, ingest_one, blobs):
+    with futures.ThreadPoolExecutor(max_workers=HANDLER_THREADS) as pool:
+        list(pool.map(ingest_one, blobs[:HANDLER_THREADS]))   # warm-up
+        start = time.perf_counter()
+        list(pool.map(ingest_one, blobs))
+        elapsed = time.perf_counter() - start
+    print(f"{label:<22}{len(blobs) / elapsed:>10.0f} updates/s")
+
+
+def main():
+    encoding = ENCODINGS_BY_NAME[ENCODING]
+    is_delta = encoding != pb2.ENCODING_RAW
+    template = SimpleCNN().state_dict()
+    accumulator = FedAvgAccumulator(template, max_pending=HANDLER_THREADS)
+
+    blobs = []
+    for _ in range(UPDATES):
+        state = {name: torch.randn_like(tensor) for name, tensor in template.items()}
+        blobs.append(encode_update(state, encoding)[0])
+    print(f"{UPDATES} {ENCODING} updates of {len(blobs[0]) / 1024:.1f} KB, "
+          f"{HANDLER_THREADS} handler threads, {os.cpu_count()} cores")
+
+    def ingest_inline(blob):
+        pending = accumulator.begin_update()
+        try:
+            flatten_update(decode_blob(blob, encoding, is_delta), encoding, accumulator.layout, pending.buffer)
+            check_values(pending.buffer)
+        finally:
+            accumulator.discard_update(pending)
+
+    run("inline (threads)", ingest_inline, blobs)
+
+    for processes in sorted({1, 2, os.cpu_count() or 1}):
+        ingest_pool = IngestPool(accumulator.layout, accumulator.num_params, processes)
+
+        def ingest_pooled(blob):
+            with ingest_pool.decode(blob, encoding, is_delta):
+                pass
+
+        run(f"pool x{processes}", ingest_pooled, blobs)
+        ingest_pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
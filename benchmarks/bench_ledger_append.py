@@ -0,0 +1,56 @@
+"""
+Ledger append latency vs. chain length: the append-only log must cost the same
+at 10^3 blocks as at 10^6. Also reports the one-time startup (load) cost.
+
+Run from the repository root:
+    python benchmarks/bench_ledger_append.py [appends_per_size]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+APPENDS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+from dlt_network.append_log import AppendLog
+from dlt_network.blockchain import ModelLedger
+
+
+def synthetic_chain(num_blocks):
+    chain = [{'index': 1, 'timestamp': time.time(), 'round_num': 0, 'model_hash': 'GENESIS', 'previous_hash': '1'}]
+    for i in range(2, num_blocks + 1):
+        # Links are not real hashes: only the storage cost is measured here
+        chain.append({'index': i, 'timestamp': time.time(), 'round_num': i - 1,
+                      'model_hash': f'{i:064x}', 'previous_hash': f'{i - 1:064x}'})
+    return chain
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix='sctl-ledger-bench-')
+    print(f"{'blocks':>10}{'load s':>10}{'append p50 ms':>16}{'append p99 ms':>16}")
+    for num_blocks in (10 ** 3, 10 ** 5, 10 ** 6):
+        filename = os.path.join(workdir, f'ledger-{num_blocks}.jsonl')
+        AppendLog.create(filename, synthetic_chain(num_blocks))
+
+        start = time.perf_counter()
+        ledger = ModelLedger(filename=filename, legacy_filename=filename + '.absent')
+        load_s = time.perf_counter() - start
+
+        latencies = []
+        for i in range(APPENDS):
+            start = time.perf_counter()
+            ledger.create_block(model_hash=f'{i:064x}', round_num=num_blocks + i, previous_hash='bench')
+            latencies.append(time.perf_counter() - start)
+        ledger.log.close()
+        latencies.sort()
+        print(f"{num_blocks:>10}{load_s:>10.2f}{statistics.median(latencies) * 1e3:>16.3f}"
+              f"{latencies[int(0.99 * (len(latencies) - 1))] * 1e3:>16.3f}")
+        os.remove(filename)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Ledger audit cost at 10^5 and 10^6 blocks:
+  legacy       re-hash every previous block (the pre-checkpoint is_chain_valid)
+  full x1      cached-hash verification, one process
+  full xN      same, split across N worker processes
+  incremental  audit after 10 new blocks, resuming from the persisted checkpoint
+
+Run from the repository root:
+    python benchmarks/bench_ledger_verify.py [processes]
+"""
+import os
+import sys
+import tempfile
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+
+from dlt_network.append_log import AppendLog
+from dlt_network.blockchain import ModelLedger, compute_block_hash
+
+PROCESSES = int(sys.argv[1]) if len(sys.argv) > 1 else max(os.cpu_count() or 1, 2)
+
+
+def real_chain(num_blocks):
+    chain = []
+    previous_hash = '1'
+    for i in range(1, num_blocks + 1):
+        block = {'index': i, 'timestamp': time.time(), 'round_num': i - 1,
+                 'model_hash': f'{i:064x}', 'previous_hash': previous_hash}
+        block['hash'] = previous_hash = compute_block_hash(block)
+        chain.append(block)
+    return chain
+
+
+def legacy_is_chain_valid(chain):
+    for i in range(1, len(chain)):
+        if chain[i]['previous_hash'] != compute_block_hash(chain[i - 1]):
+            return False
+    return True
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    assert result, "benchmark chain failed verification"
+    return (time.perf_counter() - start) * 1e3
+
+
+def main():
+    workdir = tempfile.mkdtemp(prefix='sctl-verify-bench-')
+    print(f"{'blocks':>10}{'legacy ms':>12}{'full x1 ms':>12}{f'full x{PROCESSES} ms':>14}{'incremental ms':>16}")
+    for num_blocks in (10 ** 5, 10 ** 6):
+        filename = os.path.join(workdir, f'ledger-{num_blocks}.jsonl')
+        AppendLog.create(filename, real_chain(num_blocks))
+        ledger = ModelLedger(filename=filename, legacy_filename=filename + '.absent')
+
+        legacy = timed(lambda: legacy_is_chain_valid(ledger.chain))
+        sequential = timed(lambda: ledger.is_chain_valid(full=True, processes=1))
+        parallel = timed(lambda: ledger.is_chain_valid(full=True, processes=PROCESSES))
+        for i in range(10):
+            ledger.add_model_update(round_num=num_blocks + i, model_hash=f'{i:064x}')
+        incremental = timed(ledger.is_chain_valid)
+
+        print(f"{num_blocks:>10}{legacy:>12.0f}{sequential:>12.0f}{parallel:>14.0f}{incremental:>16.2f}")
+        ledger.log.close()
+
+
+if __name__ == "__main__":
+    main()
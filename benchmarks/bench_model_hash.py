@@ -0,0 +1,62 @@
+"""
+Benchmark: fingerprinting the global model by serialize-then-hash vs the canonical
+tensor-level hash (shared/model_hash.py), which reads each tensor buffer in place.
+
+Run from the repository root:
+    python benchmarks/bench_model_hash.py
+"""
+import hashlib
+import io
+import os
+import sys
+import time
+
+import torch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, 'parameter-server'))
+
+from cnn_model import SimpleCNN
+from shared.tensor_codec import encode_state_dict
+from shared.model_hash import state_dict_hash
+
+REPEATS = 20
+
+
+def torch_save_hash(state_dict):
+    buffer = io.BytesIO()
+    torch.save(state_dict, buffer)
+    return hashlib.sha256(buffer.getvalue()).hexdigest()
+
+
+def flat_blob_hash(state_dict):
+    return hashlib.sha256(encode_state_dict(state_dict)).hexdigest()
+
+
+def time_call(fn, arg):
+    fn(arg)  # warm-up
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn(arg)
+    return (time.perf_counter() - start) / REPEATS * 1e3
+
+
+def large_state_dict():
+    """A ~25M parameter stand-in for bigger models than SimpleCNN."""
+    return {f"layer{i}.weight": torch.randn(1024, 1024) for i in range(24)}
+
+
+def run(label, state_dict):
+    print(f"\n{label}")
+    print(f"{'method':<28}{'ms':>10}")
+    for name, fn in (("torch.save + sha256", torch_save_hash),
+                     ("flat blob + sha256", flat_blob_hash),
+                     ("tensor-level (no blob)", state_dict_hash)):
+        print(f"{name:<28}{time_call(fn, state_dict):>10.3f}")
+
+
+if __name__ == "__main__":
+    torch.manual_seed(0)
+    run("SimpleCNN", SimpleCNN().state_dict())
+    run("Large (24 x 1024x1024 fp32)", large_state_dict())
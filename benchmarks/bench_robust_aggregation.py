@@ -0,0 +1,50 @@
+"""
+Cost of each aggregation strategy vs. number of workers, on one
+[workers x params] matrix of SimpleCNN-sized updates.
+
+Run from the repository root:
+    python benchmarks/bench_robust_aggregation.py [max_workers] [repeats]
+"""
+import os
+import sys
+import time
+
+import torch
+
+MAX_WORKERS = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+REPEATS = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, 'shared'))
+sys.path.append(os.path.join(project_root, 'parameter-server'))
+
+from cnn_model import SimpleCNN
+from robust_aggregation import STRATEGIES
+
+
+def time_strategy(strategy, updates, weights):
+    strategy(updates, weights)   # warm-up
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        strategy(updates, weights)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    num_params = sum(t.numel() for t in SimpleCNN().state_dict().values())
+    counts = [n for n in (8, 32, 128, 256, 512, 1024) if n <= MAX_WORKERS]
+    print(f"{num_params} params per update, {torch.get_num_threads()} torch threads, best of {REPEATS} (ms)")
+    print(f"{'workers':>8}" + "".join(f"{name:>14}" for name in STRATEGIES))
+
+    for num_workers in counts:
+        updates = torch.randn(num_workers, num_params)
+        weights = torch.randint(1, 100, (num_workers,)).to(torch.float32)
+        timings = [time_strategy(strategy, updates, weights) * 1e3 for strategy in STRATEGIES.values()]
+        print(f"{num_workers:>8}" + "".join(f"{ms:>14.1f}" for ms in timings))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Load benchmark: sync (thread-pool) vs grpc.aio parameter server.
+
+Spawns the server in a child process and drives it with N fake workers from this
+process. Every worker runs: GetGlobalModel -> SendModelUpdate -> WaitForNextRound,
+for a few rounds. Reports p50/p99 latency per RPC and overall throughput.
+
+Run from the repository root:
+    python benchmarks/bench_server_load.py [--workers 200] [--rounds 3] [--modes sync aio]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, 'shared'))
+sys.path.append(os.path.join(project_root, 'parameter-server'))
+
+import grpc
+import federated_service_pb2 as pb2
+import federated_service_pb2_grpc as pb2_grpc
+
+WORKERS_PER_CHANNEL = 50
+LONG_POLL_MS = 2000
+
+
+def run_server(mode, port):
+    """Child process: an insecure parameter server with one round per `workers` updates."""
+    os.chdir(tempfile.mkdtemp(prefix='sctl-bench-'))  # keep the ledger file out of the repo
+    import app
+    from aio_server import serve_aio
+
+    servicer = app.FederatedLearningServicer()
+    address = f'localhost:{port}'
+    print("READY", flush=True)
+    sys.stdout = open(os.devnull, 'w')  # per-update logs would fill the unread pipe
+    if mode == 'aio':
+        asyncio.run(serve_aio(servicer, address))
+    else:
+        server = app.build_sync_server(servicer)
+        server.add_insecure_port(address)
+        server.start()
+        server.wait_for_termination()
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('localhost', 0))
+        return s.getsockname()[1]
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1e3
+
+
+async def fake_worker(stub, worker_id, rounds, blob, latencies, rejected):
+    held_round, held_hash = 0, ""
+    for _ in range(rounds):
+        start = time.perf_counter()
+        weights = await stub.GetGlobalModel(
+            pb2.ModelRequest(worker_id=worker_id, round_number=held_round, model_hash=held_hash)
+        )
+        latencies['GetGlobalModel'].append(time.perf_counter() - start)
+        held_round = weights.round_number
+        held_hash = weights.model_hash or held_hash
+
+        start = time.perf_counter()
+        try:
+            await stub.SendModelUpdate(pb2.ModelUpdate(
+                worker_id=worker_id, round_number=held_round, weights_data=blob, num_samples=100
+            ))
+        except grpc.aio.AioRpcError:
+            # e.g. the round closed at its deadline before this upload got a handler
+            rejected.append(worker_id)
+        latencies['SendModelUpdate'].append(time.perf_counter() - start)
+
+        # Short long-polls: on the sync server every waiting worker pins a handler thread
+        status = await stub.WaitForNextRound(
+            pb2.RoundQuery(worker_id=worker_id, after_round=held_round, timeout_ms=LONG_POLL_MS)
+        )
+        while status.round_number <= held_round:
+            status = await stub.WaitForNextRound(
+                pb2.RoundQuery(worker_id=worker_id, after_round=held_round, timeout_ms=LONG_POLL_MS)
+            )
+
+
+async def drive(port, workers, rounds):
+    from cnn_model import SimpleCNN
+    from shared.utils import get_weights_as_bytes
+    blob = get_weights_as_bytes(SimpleCNN())
+
+    channels = [grpc.aio.insecure_channel(f'localhost:{port}') for _ in range(0, workers, WORKERS_PER_CHANNEL)]
+    stubs = [pb2_grpc.FederatedLearningStub(channel) for channel in channels]
+    latencies = {'GetGlobalModel': [], 'SendModelUpdate': []}
+    rejected = []
+
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        fake_worker(stubs[i // WORKERS_PER_CHANNEL], f"bench-{i}", rounds, blob, latencies, rejected)
+        for i in range(workers)
+    ])
+    elapsed = time.perf_counter() - start
+    for channel in channels:
+        await channel.close()
+    return latencies, elapsed, len(rejected)
+
+
+def bench(mode, workers, rounds):
+    port = free_port()
+    env = dict(os.environ, SCTL_ROUND_TARGET=str(workers), SCTL_ROUND_DEADLINE_S='10',
+               SCTL_OVER_SELECTION='0')
+    child = subprocess.Popen(
+        [sys.executable, __file__, '--serve', mode, '--port', str(port)],
+        env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    try:
+        while child.stdout.readline().strip() != "READY":
+            pass
+        time.sleep(1.0)  # let the server bind its port
+        latencies, elapsed, rejected = asyncio.run(drive(port, workers, rounds))
+    finally:
+        child.terminate()
+        child.wait()
+
+    total_rpcs = sum(len(v) for v in latencies.values())
+    for rpc, samples in latencies.items():
+        print(f"{mode:<5}{rpc:<18}{percentile(samples, 0.5):>10.1f}{percentile(samples, 0.99):>10.1f}"
+              f"{statistics.mean(samples) * 1e3:>10.1f}")
+    print(f"{mode:<5}{'throughput':<18}{total_rpcs / elapsed:>10.0f} RPC/s over {elapsed:.1f}s, {rejected} uploads rejected\n")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--modes', nargs='+', default=['sync', 'aio'])
+    parser.add_argument('--serve', choices=['sync', 'aio'])
+    parser.add_argument('--port', type=int)
+    args = parser.parse_args()
+
+    if args.serve:
+        run_server(args.serve, args.port)
+        return
+
+    print(f"{args.workers} fake workers x {args.rounds} rounds")
+    print(f"{'mode':<5}{'rpc':<18}{'p50 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    for mode in args.modes:
+        bench(mode, args.workers, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
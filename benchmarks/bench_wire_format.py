@@ -0,0 +1,65 @@
+"""
+Benchmark: legacy torch.save/torch.load blobs vs the SCTL flat-tensor wire format.
+
+Run from the repository root:
+    python benchmarks/bench_wire_format.py
+"""
+import io
+import os
+import sys
+import time
+
+import torch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, 'parameter-server'))
+
+from cnn_model import SimpleCNN
+from shared.tensor_codec import encode_state_dict, decode_state_dict
+
+REPEATS = 50
+
+
+def legacy_encode(state_dict):
+    buffer = io.BytesIO()
+    torch.save(state_dict, buffer)
+    return buffer.getvalue()
+
+
+def legacy_decode(blob):
+    return torch.load(io.BytesIO(blob), weights_only=True)
+
+
+def time_call(fn, arg):
+    fn(arg)  # warm-up
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn(arg)
+    return (time.perf_counter() - start) / REPEATS * 1e3
+
+
+def large_state_dict():
+    """A ~25M parameter stand-in for bigger models than SimpleCNN."""
+    return {f"layer{i}.weight": torch.randn(1024, 1024) for i in range(24)}
+
+
+def run(label, state_dict):
+    legacy_blob = legacy_encode(state_dict)
+    flat_blob = encode_state_dict(state_dict)
+
+    rows = [
+        ("torch.save", len(legacy_blob), time_call(legacy_encode, state_dict), time_call(legacy_decode, legacy_blob)),
+        ("flat v1", len(flat_blob), time_call(encode_state_dict, state_dict), time_call(decode_state_dict, flat_blob)),
+    ]
+
+    print(f"\n{label}")
+    print(f"{'format':<12}{'bytes':>14}{'encode ms':>12}{'decode ms':>12}")
+    for name, size, enc, dec in rows:
+        print(f"{name:<12}{size:>14,}{enc:>12.3f}{dec:>12.3f}")
+
+
+if __name__ == "__main__":
+    torch.manual_seed(0)
+    run("SimpleCNN", SimpleCNN().state_dict())
+    run("Large (24 x 1024x1024 fp32)", large_state_dict())
@@ -0,0 +1,94 @@
+"""
+Benchmark: edge worker per-round data setup and epoch time.
+
+Writes CIFAR-10 style batch files to a temp directory, then compares rebuilding the
+in-memory dataset every round (decode the batches, normalize, wrap in a TensorDataset)
+with the memory-mapped cache the worker builds once and reuses across rounds.
+
+Run from the repository root:
+    python benchmarks/bench_worker_data.py [--samples 20000] [--rounds 3] [--batch-size 32] [--num-workers 0]
+"""
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+import numpy as np
+import torch
+from torch.utils.data import DataLoader, TensorDataset
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(project_root, 'edge-worker-1'))
+
+from local_data import CIFAR_MEAN, CIFAR_STD, find_cifar_batches, prepare_dataset, MappedImageDataset, build_loader
+
+
+def write_fake_cifar(data_dir, samples, per_file=10000):
+    rng = np.random.default_rng(0)
+    for number, start in enumerate(range(0, samples, per_file), start=1):
+        count = min(per_file, samples - start)
+        with open(os.path.join(data_dir, f'data_batch_{number}'), 'wb') as f:
+            pickle.dump({b'data': rng.integers(0, 256, (count, 3072), dtype=np.uint8),
+                         b'labels': rng.integers(0, 10, count).tolist()}, f)
+
+
+def in_memory_loader(data_dir, batch_size):
+    """The per-round path: decode every batch file and hold the whole fp32 dataset in RAM."""
+    images, labels = [], []
+    for path in find_cifar_batches(data_dir):
+        with open(path, 'rb') as f:
+            batch = pickle.load(f, encoding='bytes')
+        images.append(torch.from_numpy(batch[b'data']).view(-1, 3, 32, 32))
+        labels.append(torch.tensor(batch[b'labels']))
+    mean = torch.tensor(CIFAR_MEAN).view(1, 3, 1, 1)
+    std = torch.tensor(CIFAR_STD).view(1, 3, 1, 1)
+    X = (torch.cat(images).float() / 255 - mean) / std
+    return DataLoader(TensorDataset(X, torch.cat(labels)), batch_size=batch_size, shuffle=True)
+
+
+def epoch(loader):
+    samples = 0
+    for data, target in loader:
+        samples += len(target)
+    return samples
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--samples', type=int, default=20000)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--num-workers', type=int, default=0)
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix='sctl-bench-data-')
+    write_fake_cifar(data_dir, args.samples)
+    cache_dir = os.path.join(data_dir, 'cache')
+
+    started = time.perf_counter()
+    prepare_dataset(data_dir, cache_dir)
+    print(f"{args.samples} samples, one-time cache build: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    print(f"{'round':>5}{'rebuild setup ms':>18}{'rebuild epoch ms':>18}{'mapped setup ms':>17}{'mapped epoch ms':>17}")
+    loader = None
+    for round_num in range(1, args.rounds + 1):
+        started = time.perf_counter()
+        rebuilt = in_memory_loader(data_dir, args.batch_size)
+        built = time.perf_counter()
+        epoch(rebuilt)
+        rebuilt_done = time.perf_counter()
+        del rebuilt
+
+        # Only the first round pays for mapping the cache (and starting loader processes)
+        mapped_started = time.perf_counter()
+        if loader is None:
+            dataset = MappedImageDataset(cache_dir, prepare_dataset(data_dir, cache_dir))
+            loader = build_loader(dataset, args.batch_size, args.num_workers)
+        mapped_built = time.perf_counter()
+        assert epoch(loader) == args.samples
+        mapped_done = time.perf_counter()
+
+        print(f"{round_num:>5}{(built - started) * 1000:>18.1f}{(rebuilt_done - built) * 1000:>18.1f}"
+              f"{(mapped_built - mapped_started) * 1000:>17.1f}{(mapped_done - mapped_built) * 1000:>17.1f}")
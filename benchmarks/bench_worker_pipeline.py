@@ -0,0 +1,94 @@
+"""
+Benchmark: edge worker rounds/hour, sequential vs pipelined round loop.
+
+Starts an in-process parameter server that closes a round on every update, then runs
+the worker's round loop (client_main.run_rounds) against it over a local channel,
+once strictly sequential and once pipelined (next round's data prefetched while the
+upload is in flight, inclusion proofs checked in the background).
+Every RPC is delayed by a simulated round trip, as on a WAN link to the server;
+--rtt-ms 0 measures the pure compute overlap.
+
+Run from the repository root:
+    python benchmarks/bench_worker_pipeline.py [--rounds 20] [--repeats 3] [--samples 1000] [--rtt-ms 50]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from concurrent import futures
+
+import grpc
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, 'shared'))
+sys.path.append(os.path.join(project_root, 'parameter-server'))
+sys.path.append(os.path.join(project_root, 'edge-worker-1'))
+
+
+class SimulatedLink(grpc.ServerInterceptor):
+    """Server interceptor that holds every call for one round trip before handling it."""
+    def __init__(self, rtt):
+        self.rtt = rtt
+
+    def _delayed(self, behavior):
+        def call(request, context):
+            time.sleep(self.rtt)
+            return behavior(request, context)
+        return call
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None:
+            return None
+        for kind in ('unary_unary', 'unary_stream', 'stream_unary', 'stream_stream'):
+            behavior = getattr(handler, kind)
+            if behavior is not None:
+                factory = getattr(grpc, f'{kind}_rpc_method_handler')
+                return factory(self._delayed(behavior), handler.request_deserializer, handler.response_serializer)
+        return handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=20)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--samples', type=int, default=1000, help="synthetic local samples per worker")
+    parser.add_argument('--rtt-ms', type=float, default=50.0, help="simulated worker <-> server round trip")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp(prefix='sctl-bench-'))  # keep ledger/checkpoint/data files out of the repo
+    os.environ['SCTL_ROUND_TARGET'] = '1'
+    import app
+    import client_main
+    import federated_service_pb2_grpc as pb2_grpc
+
+    client_main.DATA_DIR = None
+    client_main.SYNTHETIC_SAMPLES = args.samples
+    client_main.DATA_CACHE_DIR = os.path.abspath('data')
+    with contextlib.redirect_stdout(io.StringIO()):
+        core = app.FederatedLearningServicer()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10),
+                         interceptors=[SimulatedLink(args.rtt_ms / 1000)])
+    pb2_grpc.add_FederatedLearningServicer_to_server(core, server)
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+    stub = pb2_grpc.FederatedLearningStub(grpc.insecure_channel(f'localhost:{port}'))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        client_main.run_rounds(stub, 'bench', max_rounds=3)   # warm-up: data cache, first-call overheads
+
+    print(f"{args.rounds} rounds per run, {args.samples} local samples, {args.rtt_ms:.0f} ms RTT, best of {args.repeats}")
+    for pipeline in (False, True):
+        client_main.PIPELINE = pipeline
+        best = 0.0
+        for _ in range(args.repeats):
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                client_main.run_rounds(stub, 'bench', max_rounds=args.rounds)
+            best = max(best, args.rounds * 3600 / (time.perf_counter() - started))
+        print(f"{'pipelined' if pipeline else 'sequential':<12}{best:>10.0f} rounds/hour")
+    server.stop(0)
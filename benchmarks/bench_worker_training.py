@@ -0,0 +1,88 @@
+"""
+Benchmark: edge worker local training throughput (samples/sec per round).
+
+Trains SimpleCNN on synthetic data from the memory-mapped cache with the worker's
+LocalTrainer under several configurations: the old per-round path (fresh SGD, batch 10,
+eager) and combinations of batch size, channels_last, bf16 autocast and torch.compile.
+The first round includes warm-up (and compilation), so it is reported separately.
+
+Run from the repository root:
+    python benchmarks/bench_worker_training.py [--samples 2000] [--rounds 4] [--threads 0] [--compile]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import torch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(project_root, 'edge-worker-1'))
+
+from cnn_model import SimpleCNN
+from local_data import prepare_dataset, MappedImageDataset, build_loader
+from local_trainer import LocalTrainer, configure_threads, cpu_supports_bf16
+
+
+def per_round_optimizer(dataset, rounds):
+    """The old worker loop: a new plain SGD every round, batch 10, eager."""
+    model = SimpleCNN()
+    loader = build_loader(dataset, 10)
+    criterion = torch.nn.CrossEntropyLoss()
+    rates = []
+    for _ in range(rounds):
+        optimizer = torch.optim.SGD(model.parameters(), lr=0.01)
+        started, samples = time.perf_counter(), 0
+        for data, target in loader:
+            optimizer.zero_grad()
+            criterion(model(data), target).backward()
+            optimizer.step()
+            samples += len(target)
+        rates.append(samples / (time.perf_counter() - started))
+    return rates
+
+
+def engine(dataset, rounds, batch_size, **options):
+    trainer = LocalTrainer(SimpleCNN(), **options)
+    loader = build_loader(dataset, batch_size)
+    global_state = {name: tensor.clone() for name, tensor in trainer.state_dict().items()}
+    rates = []
+    for _ in range(rounds):
+        trainer.load_state_dict(global_state)
+        _, samples, seconds = trainer.train_round(loader)
+        rates.append(samples / seconds)
+    return rates
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--samples', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=0)
+    parser.add_argument('--compile', action='store_true', help="also measure torch.compile (slow first round)")
+    args = parser.parse_args()
+
+    configure_threads(args.threads)
+    cache_dir = tempfile.mkdtemp(prefix='sctl-bench-train-')
+    dataset = MappedImageDataset(cache_dir, prepare_dataset(None, cache_dir, synthetic_samples=args.samples))
+    print(f"{args.samples} samples/round, {torch.get_num_threads()} thread(s), "
+          f"native bf16: {'yes' if cpu_supports_bf16() else 'no'}")
+
+    configs = [
+        ('per-round SGD, batch 10', lambda: per_round_optimizer(dataset, args.rounds)),
+        ('engine, batch 10', lambda: engine(dataset, args.rounds, 10)),
+        ('engine, batch 32', lambda: engine(dataset, args.rounds, 32)),
+        ('batch 32 + channels_last', lambda: engine(dataset, args.rounds, 32, channels_last=True)),
+        ('batch 32 + bf16', lambda: engine(dataset, args.rounds, 32, use_bf16=True)),
+        ('batch 32 + channels_last + bf16', lambda: engine(dataset, args.rounds, 32, channels_last=True, use_bf16=True)),
+    ]
+    if args.compile:
+        configs.append(('batch 32 + compile', lambda: engine(dataset, args.rounds, 32, compile_model=True)))
+
+    print(f"{'configuration':<34}{'round 1':>12}{'steady':>12}  samples/s")
+    for name, run in configs:
+        torch.manual_seed(0)
+        rates = run()
+        steady = sum(rates[1:]) / max(1, len(rates) - 1)
+        print(f"{name:<34}{rates[0]:>12.0f}{steady:>12.0f}")
@@ -0,0 +1,92 @@
+"""
+Stress check: fire many concurrent uploads (unary + streamed) at an in-process
+parameter server and assert the aggregated model is EXACTLY the sample-weighted
+mean. Weights are small integers so every fp32 partial sum is exact regardless
+of which handler thread / shard folded which update.
+
+Run from the repository root:
+    python benchmarks/stress_concurrent_uploads.py [uploads_per_round] [rounds]
+"""
+import os
+import sys
+import tempfile
+import time
+from concurrent import futures
+
+import torch
+
+UPLOADS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+ROUNDS = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(project_root)
+sys.path.append(os.path.join(project_root, 'shared'))
+sys.path.append(os.path.join(project_root, 'parameter-server'))
+
+# The round closes exactly when the last upload of the round lands
+os.environ['SCTL_ROUND_TARGET'] = str(UPLOADS)
+os.environ['SCTL_ROUND_DEADLINE_S'] = '600'
+os.chdir(tempfile.mkdtemp(prefix='sctl-stress-'))  # keep the ledger file out of the repo
+
+import grpc
+import federated_service_pb2 as pb2
+import federated_service_pb2_grpc as pb2_grpc
+import app
+from cnn_model import SimpleCNN
+from shared.tensor_codec import encode_state_dict
+from shared.streaming import iter_update_chunks
+
+
+def integer_state_dict(template, generator):
+    return {k: torch.randint(-4, 5, t.shape, generator=generator).to(torch.float32) for k, t in template.items()}
+
+
+def upload(stub, worker_id, round_number, state_dict, num_samples, streamed):
+    update = pb2.ModelUpdate(worker_id=worker_id, round_number=round_number, num_samples=num_samples)
+    blob = encode_state_dict(state_dict)
+    if streamed:
+        return stub.SendModelUpdateStream(iter_update_chunks(update, blob, chunk_size=16 * 1024))
+    update.weights_data = blob
+    return stub.SendModelUpdate(update)
+
+
+def main():
+    servicer = app.FederatedLearningServicer()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=32))
+    pb2_grpc.add_FederatedLearningServicer_to_server(servicer, server)
+    port = server.add_insecure_port('localhost:0')
+    server.start()
+    stub = pb2_grpc.FederatedLearningStub(grpc.insecure_channel(f'localhost:{port}'))
+
+    template = SimpleCNN().state_dict()
+    generator = torch.Generator().manual_seed(0)
+    try:
+        for round_number in range(ROUNDS):
+            updates = [
+                (f"w{i}", integer_state_dict(template, generator), 1 + i % 8, i % 2 == 0)
+                for i in range(UPLOADS)
+            ]
+            expected_sum = {k: torch.zeros_like(t) for k, t in template.items()}
+            for _, state_dict, n, _ in updates:
+                for k in expected_sum:
+                    expected_sum[k] += state_dict[k] * n
+            total = float(sum(n for _, _, n, _ in updates))
+
+            start = time.perf_counter()
+            with futures.ThreadPoolExecutor(max_workers=64) as pool:
+                acks = list(pool.map(lambda u: upload(stub, u[0], round_number, u[1], u[2], u[3]), updates))
+            elapsed = time.perf_counter() - start
+
+            assert all(ack.success for ack in acks), "Some uploads were rejected"
+            assert servicer.current_round == round_number + 1, "Round did not close exactly once"
+            result = servicer.global_model.state_dict()
+            for k, s in expected_sum.items():
+                assert torch.equal(result[k], (s / total).to(result[k].dtype)), f"Aggregate mismatch in {k}"
+            print(f"✅ Round {round_number}: {UPLOADS} concurrent uploads aggregated exactly "
+                  f"({UPLOADS / elapsed:.0f} uploads/s)")
+    finally:
+        server.stop(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,109 @@
 import hashlib
 import json
+import math
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from time import time
 
-class ModelLedger:
-    def __init__(self, filename="sctl_ledger.json"):
+from dlt_network.append_log import AppendLog
+from dlt_network.ledger_index import LedgerIndex
+
+# Below this many blocks a full audit is faster in-process than spawning workers
+PARALLEL_VERIFY_MIN_BLOCKS = 50_000
+
+
+# sort_keys=True is vital to ensure the hash is always the same. Same output as
+# json.dumps(block, sort_keys=True), without building a new encoder per call.
+_CANONICAL_JSON = json.JSONEncoder(sort_keys=True)
+
+
+def compute_block_hash(block):
+    """SHA-256 of a block's contents. The cached 'hash' field itself is not hashed."""
+    contents = dict(block)
+    contents.pop('hash', None)
+    return hashlib.sha256(_CANONICAL_JSON.encode(contents).encode()).hexdigest()
+
+
+def verify_blocks(blocks, previous_hash):
+    """
+    Checks a contiguous run of blocks: each cached hash must match the block's contents and
+    each block must link to the hash before it (previous_hash for the first one, None = genesis).
+    Returns the index of the first broken block, or None.
+    """
+    for block in blocks:
+        if block.get('hash') != compute_block_hash(block):
+            return block['index']
+        if previous_hash is not None and block['previous_hash'] != previous_hash:
+            return block['index']
+        previous_hash = block['hash']
+    return None
+
+class LedgerView:
+    """
+    Read-only queries over a loaded chain (self.chain) and its LedgerIndex (self.index).
+    Shared by the writable ModelLedger and the read-only LedgerTail of API processes.
+    """
+    def get_last_block(self):
+        return self.chain[-1]
+
+    def get_block(self, index):
+        """Block by its 1-based index, or None."""
+        if 1 <= index <= len(self.chain):
+            return self.chain[index - 1]
+        return None
+
+    def recent_blocks(self, limit, before=None, offset=0):
+        """
+        Newest-first page of blocks. `before` is a cursor (only blocks with a smaller
+        index are returned); without it, `offset` blocks from the tip are skipped.
+        Returns (blocks, cursor for the next page or None).
+        """
+        end = min(before - 1, len(self.chain)) if before is not None else len(self.chain) - offset
+        start = max(end - limit, 0)
+        blocks = self.chain[start:max(end, 0)][::-1]
+        return blocks, (blocks[-1]['index'] if blocks and start > 0 else None)
+
+    def blocks_by_round(self, round_num):
+        return [self.chain[index - 1] for index in self.index.rounds(round_num)]
+
+    def blocks_by_hash(self, model_hash):
+        return [self.chain[index - 1] for index in self.index.hashes(model_hash)]
+
+    def blocks_in_time_range(self, start, end, limit, after=None):
+        """Oldest-first page of blocks with start <= timestamp < end. Returns (blocks, cursor)."""
+        indexes, cursor = self.index.time_range(start, end, limit, after)
+        return [self.chain[index - 1] for index in indexes], cursor
+
+class ModelLedger(LedgerView):
+    def __init__(self, filename="sctl_ledger.jsonl", legacy_filename="sctl_ledger.json"):
+        # Append-only log: one JSON block per line, so adding a block never rewrites the chain
         self.filename = filename
+        self.legacy_filename = legacy_filename
         self.chain = []
+        self.index = LedgerIndex()
+        self._lock = threading.Lock()
+        # Blocks [0, verified_upto) passed an audit; later audits start from there
+        self.checkpoint_filename = filename + '.verified'
+        self.verified_upto = 0
         
         # Load existing chain from disk if it exists, otherwise create Genesis
-        if not self.load_from_disk():
+        loaded = self.load_from_disk()
+        self.log = AppendLog(self.filename)
+        if not loaded:
             # Create Genesis Block (The first link in the Zero-Trust chain)
             self.create_block(model_hash='GENESIS', round_num=0, previous_hash='1')
             print("🌱 Genesis Block created.")
 
     def create_block(self, model_hash, round_num, previous_hash):
+        with self._lock:
+            block, seq = self._append_block(model_hash, round_num, previous_hash)
+        self.log.sync(seq) # Durable before we return (one fsync may cover several blocks)
+        return block
+
+    def _append_block(self, model_hash, round_num, previous_hash, extra=None):
+        """Caller holds self._lock. Returns (block, log sequence number)."""
         block = {
             'index': len(self.chain) + 1,
             'timestamp': time(),
@@ -21,56 +111,131 @@ class ModelLedger:
             'model_hash': model_hash,
             'previous_hash': previous_hash,
         }
+        block.update(extra or {})
+        # Each block's own hash is computed once and persisted with it
+        block['hash'] = compute_block_hash(block)
+        seq = self.log.write(block) # O(1): appends one line, never rewrites the file
         self.chain.append(block)
-        self.save_to_disk() # Ensure every new block is written to the file
-        return block
+        self.index.add(block)
+        return block, seq
     
-    def get_last_block(self):
-        return self.chain[-1]
-
     def hash_block(self, block):
         # Encodes a block into a SHA-256 string for the next link
-        # sort_keys=True is vital to ensure the hash is always the same
-        encoded_block = json.dumps(block, sort_keys=True).encode()
-        return hashlib.sha256(encoded_block).hexdigest()
-
-    def add_model_update(self, round_num, model_hash):
-        """Adds a new model update to the chain by linking it to the previous block's hash."""
-        last_block = self.get_last_block()
-        last_hash = self.hash_block(last_block)
-        
-        new_block = self.create_block(model_hash, round_num, last_hash)
+        return compute_block_hash(block)
+
+    def add_model_update(self, round_num, model_hash, updates_root=None, num_updates=None):
+        """
+        Adds a new model update to the chain by linking it to the previous block's hash.
+        updates_root optionally anchors the Merkle root of the round's individual worker updates.
+        """
+        extra = {}
+        if updates_root is not None:
+            extra = {'updates_root': updates_root, 'num_updates': num_updates}
+        # Read the tip and append under one lock so concurrent anchors cannot fork the chain
+        with self._lock:
+            last_hash = self.get_last_block()['hash']
+            new_block, seq = self._append_block(model_hash, round_num, last_hash, extra)
+        self.log.sync(seq)
         print(f"📦 Block #{new_block['index']} anchored to DLT for Round {round_num}")
         return new_block
 
     def save_to_disk(self):
-        """Saves the ledger to a JSON file so the Dashboard team can read it."""
-        try:
-            with open(self.filename, 'w') as f:
-                json.dump(self.chain, f, indent=4)
-        except Exception as e:
-            print(f"❌ Error saving ledger: {e}")
+        """Blocks are persisted as they are created; this only forces pending appends to disk."""
+        self.log.sync()
 
     def load_from_disk(self):
         """Loads the ledger from disk to resume training after a restart."""
+        if not os.path.exists(self.filename) and os.path.exists(self.legacy_filename):
+            self.migrate_legacy_json()
         try:
-            with (open(self.filename, 'r')) as f:
-                self.chain = json.load(f)
-                return True
-        except (FileNotFoundError, json.JSONDecodeError):
+            # Tolerates (and trims) a record torn by a crash mid-append
+            self.chain = AppendLog.load(self.filename)
+        except FileNotFoundError:
             return False
+        for block in self.chain:
+            if 'hash' not in block:
+                # Written before hashes were cached: fill in memory, audits still check the links
+                block['hash'] = compute_block_hash(block)
+            self.index.add(block)
+        self.load_checkpoint()
+        return len(self.chain) > 0
+
+    def migrate_legacy_json(self):
+        """One-shot conversion of the old whole-file JSON ledger into the append-only log."""
+        try:
+            with open(self.legacy_filename, 'r') as f:
+                chain = json.load(f)
+        except json.JSONDecodeError as e:
+            # A crash during the old full rewrite leaves a truncated file; do not silently start over
+            raise ValueError(f"Legacy ledger {self.legacy_filename} is unreadable, refusing to migrate: {e}")
 
-    def is_chain_valid(self):
+        for block in chain:
+            block['hash'] = compute_block_hash(block)
+        AppendLog.create(self.filename, chain)
+        os.replace(self.legacy_filename, self.legacy_filename + '.migrated')
+        print(f"🔁 Migrated {len(chain)} blocks from {self.legacy_filename} to {self.filename}")
+
+    def load_checkpoint(self):
+        """Resumes from the last audit, if the block it covered is still the one on disk."""
+        try:
+            with open(self.checkpoint_filename, 'r') as f:
+                checkpoint = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        index = checkpoint.get('index', 0)
+        if 0 < index <= len(self.chain) and self.chain[index - 1]['hash'] == checkpoint.get('hash'):
+            self.verified_upto = index
+        else:
+            print("⚠️ Ledger audit checkpoint does not match the chain, the next audit is a full one.")
+
+    def save_checkpoint(self):
+        tmp_filename = self.checkpoint_filename + '.tmp'
+        with open(tmp_filename, 'w') as f:
+            json.dump({'index': self.verified_upto, 'hash': self.chain[self.verified_upto - 1]['hash']}, f)
+        os.replace(tmp_filename, self.checkpoint_filename)
+
+    def is_chain_valid(self, full=False, processes=None):
         """
-        ZTNA Audit: Verifies the integrity of the entire blockchain.
-        Checks if every block's 'previous_hash' matches the actual hash of the block before it.
+        ZTNA Audit: Verifies the integrity of the blockchain.
+        Checks that every block's cached hash matches its contents and that every
+        'previous_hash' matches the hash of the block before it.
+
+        By default only blocks added since the last successful audit are checked
+        (the checkpoint is persisted next to the log). full=True re-verifies the whole
+        chain, split into chunks across `processes` worker processes.
         """
-        for i in range(1, len(self.chain)):
-            current = self.chain[i]
-            previous = self.chain[i-1]
-            
-            # 1. Verify the link
-            if current['previous_hash'] != self.hash_block(previous):
-                print(f"🚨 INTEGRITY BREACH: Block {i} link is broken!")
-                return False
-        return True
\ No newline at end of file
+        # The chain only ever grows, so a length read under the lock is a stable snapshot
+        with self._lock:
+            end = len(self.chain)
+        start = 0 if full else self.verified_upto
+        if start >= end:
+            return True
+        previous_hash = self.chain[start - 1]['hash'] if start > 0 else None
+
+        processes = processes or os.cpu_count() or 1
+        if full and processes > 1 and end - start >= PARALLEL_VERIFY_MIN_BLOCKS:
+            broken = self._verify_parallel(start, end, processes)
+        else:
+            broken = verify_blocks(self.chain[start:end], previous_hash)
+
+        if broken is not None:
+            print(f"🚨 INTEGRITY BREACH: Block {broken} link is broken!")
+            return False
+        self.verified_upto = max(self.verified_upto, end)
+        self.save_checkpoint()
+        return True
+
+    def _verify_parallel(self, start, end, processes):
+        """Verifies chain[start:end] in chunks; chunk boundaries link through the cached hashes."""
+        chunk_size = math.ceil((end - start) / (processes * 4))
+        # Spawned workers: the parameter server forks badly once gRPC threads are running
+        with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn')) as pool:
+            results = pool.map(
+                verify_blocks,
+                (self.chain[i:min(i + chunk_size, end)] for i in range(start, end, chunk_size)),
+                (self.chain[i - 1]['hash'] if i > 0 else None for i in range(start, end, chunk_size))
+            )
+            for broken in results:
+                if broken is not None:
+                    return broken
+        return None
@@ -0,0 +1,45 @@
+import bisect
+
+
+class LedgerIndex:
+    """
+    In-memory secondary indexes over the chain, rebuilt from the log at startup.
+    Block N sits at chain[N - 1], so lookups by index need no structure at all;
+    round and model hash map to block indexes, timestamps are kept sorted for bisect.
+    """
+    def __init__(self):
+        self.by_round = {}
+        self.by_hash = {}
+        # (timestamp, block index), sorted; appends are nearly always in order
+        self.by_time = []
+
+    def add(self, block):
+        index = block['index']
+        self.by_round.setdefault(block['round_num'], []).append(index)
+        self.by_hash.setdefault(block['model_hash'], []).append(index)
+        entry = (block['timestamp'], index)
+        if not self.by_time or entry >= self.by_time[-1]:
+            self.by_time.append(entry)
+        else:
+            # Wall clock stepped backwards: keep the list sorted anyway
+            bisect.insort(self.by_time, entry)
+
+    def rounds(self, round_num):
+        return self.by_round.get(round_num, [])
+
+    def hashes(self, model_hash):
+        return self.by_hash.get(model_hash, [])
+
+    def time_range(self, start, end, limit, after=None):
+        """
+        Block indexes with start <= timestamp < end, oldest first, at most `limit`.
+        `after` is the (timestamp, index) of the last entry of the previous page.
+        Returns (indexes, cursor for the next page or None).
+        """
+        lo = bisect.bisect_left(self.by_time, (start, 0))
+        if after is not None:
+            lo = max(lo, bisect.bisect_right(self.by_time, after))
+        hi = bisect.bisect_left(self.by_time, (end, 0))
+        page = self.by_time[lo:min(hi, lo + limit)]
+        cursor = page[-1] if page and lo + limit < hi else None
+        return [index for _, index in page], cursor
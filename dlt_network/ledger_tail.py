@@ -0,0 +1,43 @@
+import json
+import os
+import threading
+
+from dlt_network.blockchain import LedgerView
+from dlt_network.ledger_index import LedgerIndex
+
+
+class LedgerTail(LedgerView):
+    """
+    Read-only follower of another process's ledger log. The log is append-only, so
+    refresh() only reads the bytes added since the last call and never re-parses the
+    chain. A record still being written (no trailing newline yet) is left for next time.
+    """
+    def __init__(self, filename="sctl_ledger.jsonl"):
+        self.filename = filename
+        self.chain = []
+        self.index = LedgerIndex()
+        self._offset = 0
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def refresh(self):
+        """Picks up newly appended blocks. Returns how many were added."""
+        with self._lock:
+            try:
+                with open(self.filename, 'rb') as f:
+                    if os.fstat(f.fileno()).st_size < self._offset:
+                        raise ValueError(f"Ledger log {self.filename} shrank below what was already read")
+                    f.seek(self._offset)
+                    data = f.read()
+            except FileNotFoundError:
+                return 0
+
+            complete = data[:data.rfind(b'\n') + 1]
+            added = 0
+            for line in complete.splitlines():
+                block = json.loads(line)
+                self.chain.append(block)
+                self.index.add(block)
+                added += 1
+            self._offset += len(complete)
+            return added
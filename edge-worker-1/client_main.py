@@ -1,40 +1,200 @@
 import grpc
 import torch
-import torch.nn as nn
-import torch.optim as optim
-from torch.utils.data import DataLoader, TensorDataset
 from cnn_model import SimpleCNN 
-import numpy as np
+from local_data import prepare_dataset, MappedImageDataset, build_loader, BatchPrefetcher
+from local_trainer import LocalTrainer, configure_threads, cpu_supports_bf16
 import time
 import sys
-import io
 import os
-from google.protobuf import empty_pb2
+import json
+import hashlib
+import zlib
+from concurrent import futures
+from contextlib import ExitStack, contextmanager
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '..'))
 shared_dir = os.path.join(current_dir, '..', 'shared')
+sys.path.append(project_root)
 sys.path.append(os.path.abspath(shared_dir))
 
 import federated_service_pb2 as pb2
 import federated_service_pb2_grpc as pb2_grpc
+from shared.utils import load_state_dict_from_bytes
+from shared.update_codec import UpdateEncoder, ENCODINGS_BY_NAME, ENCODING_NAMES
+from shared.streaming import iter_update_chunks, assemble_weights
+from shared.merkle import verify_proof
+from shared.model_hash import verify_state_dict
+from shared.model_diff import apply_model_diff
+from shared.metrics import Counter, Histogram, SIZE_BUCKETS, start_metrics_server
+from shared.tracing import TRACER
 
 # --- CONFIGURATION ---
 #NGINX_ADDRESS = 'localhost:443' 
 NGINX_ADDRESS = 'localhost:50051'
 SERVER_HOST_NAME = 'localhost' # Must match the Cert CN from Vault
 
+# Upload compression: 'raw', 'fp16', 'int8' or 'topk' (topk requires deltas)
+UPDATE_ENCODING = 'int8'
+UPDATE_AS_DELTA = True   # Send W_t^k - W_t instead of the full weights
+TOPK_RATIO = 0.01        # Fraction of each tensor kept by 'topk'
+
+# Chunked streaming RPCs: no 50MB message limits needed, flat memory on both ends
+USE_STREAMING = True
+
+# Re-hash every downloaded model (tensor-level, no re-serialization) against the served hash
+VERIFY_DOWNLOADS = True
+
+# Ask for a diff against the model we already hold instead of the full weights (server may still send them)
+DELTA_SYNC = True
+
+# After each round, fetch a Merkle proof that our update is in the root anchored on the DLT
+VERIFY_INCLUSION = True
+
+# GET /metrics on this port (Prometheus text format); 0 = off. Give each worker on a host its own port.
+METRICS_PORT = int(os.environ.get('SCTL_WORKER_METRICS_PORT', 0))
+
+# Directory for per-round Chrome-trace timelines (open in Perfetto); empty = tracing off
+TRACE_DIR = os.environ.get('SCTL_TRACE_DIR', '')
+
+# Uploads the server turns away as busy (RESOURCE_EXHAUSTED) are sent again, up to this many attempts
+UPLOAD_ATTEMPTS = 3
+UPLOAD_RETRY_S = 2.0
+
+# A long-poll the server answers sooner than this (busy, or round deadline) is retried after this pause
+POLL_BACKOFF_S = 1.0
+
+# Pipelined rounds: the next round's data loads while the upload is in flight and inclusion
+# proofs are checked in the background. 0 = strictly sequential.
+PIPELINE = os.environ.get('SCTL_WORKER_PIPELINE', '1') == '1'
+
+# --- LOCAL DATA ---
+# CIFAR-10 python batches (data_batch_*) live here; without them the worker trains on synthetic demo data
+DATA_DIR = os.environ.get('SCTL_DATA_DIR', os.path.join(current_dir, 'data'))
+SYNTHETIC_SAMPLES = int(os.environ.get('SCTL_SYNTHETIC_SAMPLES', 100))
+# Memory-mapped cache built from DATA_DIR on first start; empty = data_cache/worker-<id> next to this file
+DATA_CACHE_DIR = os.environ.get('SCTL_DATA_CACHE', '')
+# Background processes prefetching batches (0 = load in the training thread). On a single core they
+# would only compete with training, so the default leaves one core free for it.
+DATA_WORKERS = int(os.environ.get('SCTL_DATA_WORKERS', min(2, (os.cpu_count() or 1) - 1)))
+# Page-locked batch buffers for faster host-to-GPU copies (ignored without CUDA)
+PIN_MEMORY = os.environ.get('SCTL_PIN_MEMORY', '0') == '1'
+# Batches a background thread keeps loaded ahead of training
+PREFETCH_BATCHES = int(os.environ.get('SCTL_PREFETCH_BATCHES', 4))
+BATCH_SIZE = int(os.environ.get('SCTL_BATCH_SIZE', 32))
+
+# --- LOCAL TRAINING ---
+LOCAL_EPOCHS = int(os.environ.get('SCTL_LOCAL_EPOCHS', 1))
+LEARNING_RATE = float(os.environ.get('SCTL_LEARNING_RATE', 0.01))
+MOMENTUM = float(os.environ.get('SCTL_MOMENTUM', 0.9))    # Momentum buffers persist across rounds
+# torch intra-op / inter-op threads; 0 = torch's default (one per core)
+TORCH_THREADS = int(os.environ.get('SCTL_TORCH_THREADS', 0))
+TORCH_INTEROP_THREADS = int(os.environ.get('SCTL_TORCH_INTEROP_THREADS', 0))
+CHANNELS_LAST = os.environ.get('SCTL_CHANNELS_LAST', '0') == '1'
+# torch.compile the model (needs a C++ toolchain; falls back to eager without one)
+COMPILE_MODEL = os.environ.get('SCTL_TORCH_COMPILE', '0') == '1'
+# bf16 autocast: 'auto' = only on CPUs with native bf16 (AVX512-BF16 / AMX), '1' = always, '0' = never
+BF16 = os.environ.get('SCTL_BF16', '0')
+
+# --- METRICS ---
+PHASE_SECONDS = Histogram('sctl_worker_phase_seconds', "Time per phase of a worker round", ['phase'])
+DOWNLOAD_BYTES = Counter('sctl_worker_downloaded_bytes_total', "Global model bytes downloaded")
+UPLOAD_BYTES = Histogram('sctl_worker_upload_size_bytes', "Size of uploaded update payloads", buckets=SIZE_BUCKETS)
+ROUNDS_COMPLETED = Counter('sctl_worker_rounds_total', "Rounds by outcome", ['result'])
+
+@contextmanager
+def phase(name, worker_id, round_number):
+    """Times one phase of a round: always in PHASE_SECONDS, and on the round's timeline if tracing is on."""
+    with PHASE_SECONDS.labels(name).time(), TRACER.span(name, round_number, worker=str(worker_id)) as span:
+        yield span
+
 def load_local_data(worker_id):
-    """Generates synthetic training data for the demo"""
-    print(f"📊 [Worker-{worker_id}] Generating synthetic data...")
-    # Random images: 100 samples, 3 channels, 32x32 pixels
-    X_train = torch.randn(100, 3, 32, 32)
-    y_train = torch.randint(0, 10, (100,))
-    
-    dataset = TensorDataset(X_train, y_train)
-    return DataLoader(dataset, batch_size=10, shuffle=True), len(dataset)
+    """Maps the worker's local dataset (preprocessed on first start) behind a loader reused every round"""
+    cache_dir = DATA_CACHE_DIR or os.path.join(current_dir, 'data_cache', f"worker-{worker_id}")
+    index = prepare_dataset(DATA_DIR, cache_dir, SYNTHETIC_SAMPLES, seed=zlib.crc32(str(worker_id).encode()))
+    print(f"📊 [Worker-{worker_id}] {index['num_samples']} {index['source']} samples mapped from {cache_dir}")
+    dataset = MappedImageDataset(cache_dir, index)
+    loader = build_loader(dataset, BATCH_SIZE, DATA_WORKERS, PIN_MEMORY)
+    return BatchPrefetcher(loader, PREFETCH_BATCHES), len(dataset)
+
+def negotiate_encoder(encoder, supported_encodings):
+    """Uses the configured upload encoding if the server accepts it, else plain fp32 weights."""
+    wanted = ENCODINGS_BY_NAME[UPDATE_ENCODING]
+    if wanted in supported_encodings:
+        encoding, as_delta = wanted, UPDATE_AS_DELTA
+    else:
+        encoding, as_delta = pb2.ENCODING_RAW, False
+
+    # Keep the existing encoder (and its error-feedback residual) if nothing changed
+    if encoder is not None and (encoder.encoding, encoder.as_delta) == (encoding, as_delta):
+        return encoder
+    print(f"🗜️  Upload encoding: {ENCODING_NAMES[encoding]}{' delta' if as_delta else ''}")
+    return UpdateEncoder(encoding, as_delta, TOPK_RATIO)
+
+def wait_for_next_round(stub, worker_id, after_round):
+    """Long-polls the server until a round newer than after_round opens (no fixed sleep)."""
+    while True:
+        polled = time.time()
+        try:
+            status = stub.WaitForNextRound(
+                pb2.RoundQuery(worker_id=str(worker_id), after_round=after_round, timeout_ms=30000)
+            )
+        except grpc.RpcError as e:
+            if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+                raise
+            # Older server without round scheduling
+            print("⏳ Waiting 10s for aggregation...")
+            time.sleep(10)
+            return None
+        if status.round_number > after_round:
+            return status
+        print(f"⏳ Round {status.round_number} still open "
+              f"({status.updates_received}/{status.target_updates} updates)...")
+        if time.time() - polled < POLL_BACKOFF_S:
+            # Answered early (server busy or round deadline): do not hammer it with re-polls
+            time.sleep(POLL_BACKOFF_S)
+
+def start_upload(stub, update_msg, weights_bytes, metadata):
+    """Sends the update as a gRPC future, so the caller can move on while it is on the wire."""
+    if USE_STREAMING:
+        return stub.SendModelUpdateStream.future(iter_update_chunks(update_msg, weights_bytes), metadata=metadata)
+    update_msg.weights_data = weights_bytes     # Changed from model_data
+    return stub.SendModelUpdate.future(update_msg, metadata=metadata)
+
+def verify_contribution(stub, worker_id, round_number, payload):
+    """Checks that our upload for round_number is a leaf of the round's anchored Merkle tree."""
+    payload_sha256 = hashlib.sha256(payload).hexdigest()
+    try:
+        proof = stub.GetUpdateProof(pb2.ProofRequest(
+            worker_id=str(worker_id), round_number=round_number, update_sha256=payload_sha256
+        ))
+    except grpc.RpcError as e:
+        if e.code() in (grpc.StatusCode.UNIMPLEMENTED, grpc.StatusCode.NOT_FOUND):
+            print(f"🧾 No inclusion proof available for round {round_number}: {e.details()}")
+            return False
+        raise
+
+    path = [(step.sibling, step.sibling_on_left) for step in proof.path]
+    included = json.loads(proof.leaf)['sha256'] == payload_sha256 and verify_proof(proof.leaf, path, proof.root)
+    if included:
+        anchor = f"anchored in block #{proof.block_index}" if proof.block_index else "anchoring pending"
+        print(f"🧾 Update verified in round {round_number} (leaf {proof.leaf_index + 1}/{proof.num_leaves}, "
+              f"root {proof.root[:16]}... {anchor})")
+    else:
+        print(f"🚨 Inclusion proof for round {round_number} does NOT verify!")
+    return included
+
+def report_proof_error(proof):
+    if proof.exception() is not None:
+        print(f"⚠️  Inclusion check failed: {proof.exception()}")
 
 def run_worker(worker_id):
     print(f"🚀 Launching Edge Worker: {worker_id}")
+    if METRICS_PORT:
+        start_metrics_server(METRICS_PORT)
+    if TRACE_DIR:
+        TRACER.enable(TRACE_DIR, f"worker-{worker_id}")
+    configure_threads(TORCH_THREADS, TORCH_INTEROP_THREADS)
     
     # 1. LOAD ZTNA CREDENTIALS (ISSUED BY VAULT)
     try:
@@ -63,74 +223,162 @@ def run_worker(worker_id):
     with grpc.secure_channel(NGINX_ADDRESS, creds, options=options) as channel:
         stub = pb2_grpc.FederatedLearningStub(channel)
         
-        # Local Model Instance
-        model = SimpleCNN()
-
-        # 3. CONTINUOUS LEARNING LOOP
-        while True:
-            try:
-                # A. SYNC: Download Global Model
-                print(f"\n⬇️  [Worker-{worker_id}] Requesting Global Model...")
-                
-                # FIX 1: Send the correct Request object defined in your .proto
-                # (The .proto says GetGlobalModel takes 'ModelRequest', not 'Empty')
-                req = pb2.ModelRequest(worker_id=str(worker_id))
-                global_response = stub.GetGlobalModel(req)    
-                
-                # FIX 2: Use 'weights_data' (as defined in your .proto), NOT 'model_data'
-                buffer = io.BytesIO(global_response.weights_data)
-                
-                state_dict = torch.load(buffer)
-                model.load_state_dict(state_dict)
-                
-                current_round = getattr(global_response, 'round_number', 0)
-                print(f"✅ Synced. Starting Round {current_round}")
-
-                # B. TRAIN: Local SGD
-                trainloader, num_samples = load_local_data(worker_id)
-                optimizer = optim.SGD(model.parameters(), lr=0.01)
-                criterion = nn.CrossEntropyLoss()
-                
-                model.train()
-                for epoch in range(1): # Fast epoch for demo
-                    for data, target in trainloader:
-                        optimizer.zero_grad()
-                        output = model(data)
-                        loss = criterion(output, target)
-                        loss.backward()
-                        optimizer.step()
-                
-                print(f"🧠 Training Complete. Loss: {loss.item():.4f}")
-
-                # C. UPLOAD: Serialize and Send
-                save_buffer = io.BytesIO()
-                torch.save(model.state_dict(), save_buffer)
-                weights_bytes = save_buffer.getvalue()
-
-                print("⬆️  Uploading Gradients to Server...")
-                
-                # FIX: Names must match your .proto definition EXACTLY
-                update_msg = pb2.ModelUpdate(
-                    worker_id=str(worker_id),    # Changed from client_id
-                    round_number=current_round,
-                    weights_data=weights_bytes,     # Changed from model_data
-                    num_samples=num_samples,        # Changed from data_samples
-                    anomaly_score=0.0               # Added because it exists in your proto
-                )
-                
-                resp = stub.SendModelUpdate(update_msg)
-                print(f"🎉 Success: {resp.message}")  # Changed .status to .message (usually clearer)
-                
-                # Wait for others before next round
-                print("⏳ Waiting 10s for aggregation...")
-                time.sleep(10)
-
-            except grpc.RpcError as e:
-                print(f"⚠️  RPC Error: {e.details()}")
-                time.sleep(5)
-            except Exception as e:
-                print(f"❌ Error: {e}")
-                time.sleep(5)
+        run_rounds(stub, worker_id)
+
+def run_rounds(stub, worker_id, max_rounds=None):
+    """The continuous learning loop over an open channel; max_rounds=None runs until interrupted."""
+    # Local Model Instance
+    model = SimpleCNN()
+    use_bf16 = BF16 == '1' or (BF16 == 'auto' and cpu_supports_bf16())
+    trainer = LocalTrainer(model, LEARNING_RATE, MOMENTUM, LOCAL_EPOCHS, CHANNELS_LAST, COMPILE_MODEL, use_bf16)
+    print(f"🏋️  Local training: {LOCAL_EPOCHS} epoch(s), batch {BATCH_SIZE}, {torch.get_num_threads()} thread(s)"
+          f"{', channels_last' if CHANNELS_LAST else ''}{', compiled' if COMPILE_MODEL else ''}{', bf16' if use_bf16 else ''}")
+
+    # Last global model we downloaded (pristine, before local training)
+    global_state = None
+    held_round, held_hash = 0, ""
+    encoder = None
+
+    # Built once: later rounds just start a new pass over the mapped data
+    trainloader, num_samples = load_local_data(worker_id)
+
+    # Inclusion proofs are checked in the background in pipelined mode
+    proofs = futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='sctl-proof')
+    rounds_done = 0
+
+    # 3. CONTINUOUS LEARNING LOOP
+    while max_rounds is None or rounds_done < max_rounds:
+        try:
+            # A. SYNC: Download Global Model
+            print(f"\n⬇️  [Worker-{worker_id}] Requesting Global Model...")
+            
+            # FIX 1: Send the correct Request object defined in your .proto
+            # (The .proto says GetGlobalModel takes 'ModelRequest', not 'Empty')
+            req = pb2.ModelRequest(
+                worker_id=str(worker_id),
+                round_number=held_round,
+                model_hash=held_hash,
+                accept_delta=DELTA_SYNC and global_state is not None
+            )
+            with phase('sync', worker_id, held_round + 1) as span:
+                if USE_STREAMING:
+                    global_response, weights_data = assemble_weights(
+                        stub.GetGlobalModelStream(req, metadata=span.metadata()))
+                else:
+                    global_response = stub.GetGlobalModel(req, metadata=span.metadata())    
+                    # FIX 2: Use 'weights_data' (as defined in your .proto), NOT 'model_data'
+                    weights_data = global_response.weights_data
+                # Only the server knows which round this download opens
+                span.set_round(global_response.round_number)
+            DOWNLOAD_BYTES.inc(len(weights_data))
+            
+            if global_response.round_full:
+                # Enough workers were already selected: skip training this round
+                print(f"🚦 Round {global_response.round_number} is full, waiting for the next one...")
+                wait_for_next_round(stub, worker_id, global_response.round_number)
+                continue
+
+            if global_response.not_modified and global_state is not None:
+                # Server says we already hold this round: reset to it, no download
+                print("♻️  Global model unchanged, reusing cached copy.")
+            else:
+                if global_response.delta_base_hash:
+                    # A diff against the model we hold; the hash check below covers the result
+                    if global_response.delta_base_hash != held_hash:
+                        global_state, held_hash = None, ""
+                        raise ValueError("Server sent a diff against a model we do not hold")
+                    global_state = apply_model_diff(global_state, weights_data)
+                else:
+                    global_state = load_state_dict_from_bytes(weights_data)
+                if VERIFY_DOWNLOADS and global_response.model_hash:
+                    with phase('verify', worker_id, global_response.round_number):
+                        ok, bad_layers = verify_state_dict(
+                            global_state, global_response.model_hash, dict(global_response.layer_hashes)
+                        )
+                    if not ok:
+                        global_state, held_hash = None, ""
+                        raise ValueError(f"Global model failed its integrity check (layers: {bad_layers or 'all'})")
+                held_hash = global_response.model_hash
+            trainer.load_state_dict(global_state)
+            
+            current_round = getattr(global_response, 'round_number', 0)
+            held_round = current_round
+            encoder = negotiate_encoder(encoder, global_response.supported_encodings)
+            print(f"✅ Synced. Starting Round {current_round}")
+
+            # B. TRAIN: Local SGD
+            with phase('train', worker_id, current_round):
+                loss, samples, seconds = trainer.train_round(trainloader)
+            print(f"🧠 Training Complete. Loss: {loss:.4f} ({samples / seconds:.0f} samples/s)")
+
+            # C. UPLOAD: Serialize (and compress) and Send
+            with phase('serialize', worker_id, current_round):
+                weights_bytes = encoder.encode(trainer.state_dict(), global_state)
+            UPLOAD_BYTES.observe(len(weights_bytes))
+            raw_size = sum(t.numel() for t in global_state.values()) * 4
+            print(f"⬆️  Uploading Gradients to Server... {len(weights_bytes) / 1024:.1f} KB "
+                  f"({100.0 * (1 - len(weights_bytes) / raw_size):.1f}% smaller than fp32)")
+            
+            # FIX: Names must match your .proto definition EXACTLY
+            update_msg = pb2.ModelUpdate(
+                worker_id=str(worker_id),    # Changed from client_id
+                round_number=current_round,
+                num_samples=num_samples,        # Changed from data_samples
+                anomaly_score=0.0,              # Added because it exists in your proto
+                encoding=encoder.encoding,
+                is_delta=encoder.as_delta,
+                base_model_hash=held_hash
+            )
+            
+            # The upload runs on gRPC's threads; its phase ends when the call completes
+            upload_phase = ExitStack()
+            span = upload_phase.enter_context(phase('upload', worker_id, current_round))
+            upload = start_upload(stub, update_msg, weights_bytes, span.metadata())
+            upload.add_done_callback(lambda _: upload_phase.close())
+            if PIPELINE:
+                # Next round's first batches load while the update is on the wire (local work only:
+                # the long-poll waits for the ack, so a sync server never gives us two threads)
+                trainloader.prime()
+            for attempt in range(1, UPLOAD_ATTEMPTS + 1):
+                try:
+                    resp = upload.result()
+                    break
+                except grpc.RpcError as e:
+                    # Server out of update buffers: the round is still open, send the same update again
+                    if e.code() != grpc.StatusCode.RESOURCE_EXHAUSTED or attempt == UPLOAD_ATTEMPTS:
+                        raise
+                    print(f"🚧 Server busy ({e.details()}), retrying the upload in {UPLOAD_RETRY_S:.0f}s...")
+                    time.sleep(UPLOAD_RETRY_S)
+                    upload = start_upload(stub, update_msg, weights_bytes, span.metadata())
+
+            # Wait for others: returns as soon as the server opens the next round
+            with phase('wait', worker_id, current_round):
+                status = wait_for_next_round(stub, worker_id, current_round)
+            print(f"🎉 Success: {resp.message}")  # Changed .status to .message (usually clearer)
+            ROUNDS_COMPLETED.labels('accepted' if resp.success else 'rejected').inc()
+            rounds_done += 1
+            TRACER.flush_round(current_round)
+            if status:
+                print(f"🔔 Round {status.round_number} is open.")
+                if VERIFY_INCLUSION and resp.success:
+                    if PIPELINE:
+                        # Off the critical path: the proof is checked while the next round trains
+                        proofs.submit(verify_contribution, stub, worker_id, current_round,
+                                      weights_bytes).add_done_callback(report_proof_error)
+                    else:
+                        verify_contribution(stub, worker_id, current_round, weights_bytes)
+
+        except grpc.RpcError as e:
+            ROUNDS_COMPLETED.labels('error').inc()
+            print(f"⚠️  RPC Error: {e.details()}")
+            time.sleep(5)
+        except Exception as e:
+            ROUNDS_COMPLETED.labels('error').inc()
+            print(f"❌ Error: {e}")
+            time.sleep(5)
+
+    # Let background inclusion checks finish before handing the channel back
+    proofs.shutdown(wait=True)
 
 if __name__ == "__main__":
     # Allow running "python client_main.py 2" to simulate worker 2
@@ -0,0 +1,218 @@
+import glob
+import hashlib
+import json
+import os
+import pickle
+import queue
+import threading
+
+import numpy as np
+import torch
+from torch.utils.data import BatchSampler, DataLoader, Dataset, RandomSampler
+
+# --- LOCAL TRAINING DATA (memory-mapped cache) ---
+# The worker's dataset is decoded ONCE into a flat uint8 file (N x 3 x 32 x 32) plus labels
+# and a small JSON index. Every round (and every restart) maps that file instead of
+# re-reading the sources, and a batch only becomes resident while it is being copied
+# out, so datasets larger than RAM train with bounded memory.
+IMAGE_SHAPE = (3, 32, 32)
+CACHE_VERSION = 1
+
+# CIFAR-10 channel statistics, applied per batch on the fly
+CIFAR_MEAN = (0.4914, 0.4822, 0.4465)
+CIFAR_STD = (0.2470, 0.2435, 0.2616)
+
+
+def find_cifar_batches(data_dir):
+    """CIFAR-10 'python version' batch files (data_batch_1..5) under data_dir, sorted."""
+    if not data_dir or not os.path.isdir(data_dir):
+        return []
+    return sorted(glob.glob(os.path.join(data_dir, 'data_batch_*')) +
+                  glob.glob(os.path.join(data_dir, 'cifar-10-batches-py', 'data_batch_*')))
+
+
+def _fingerprint(paths):
+    digest = hashlib.sha1()
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def _iter_cifar(paths):
+    """(images uint8 [n, 3, 32, 32], labels uint8 [n]) one batch file at a time."""
+    for path in paths:
+        with open(path, 'rb') as f:
+            batch = pickle.load(f, encoding='bytes')
+        images = np.asarray(batch[b'data'], dtype=np.uint8).reshape(-1, *IMAGE_SHAPE)
+        yield images, np.asarray(batch[b'labels'], dtype=np.uint8)
+
+
+def _iter_synthetic(num_samples, seed):
+    rng = np.random.default_rng(seed)
+    yield (rng.integers(0, 256, (num_samples, *IMAGE_SHAPE), dtype=np.uint8),
+           rng.integers(0, 10, num_samples, dtype=np.uint8))
+
+
+def prepare_dataset(data_dir, cache_dir, synthetic_samples=100, seed=0):
+    """
+    Builds the memory-mapped cache unless an up-to-date one exists. Sources are CIFAR-10
+    batches in data_dir; without them, synthetic demo data. Returns the cache index.
+    """
+    sources = find_cifar_batches(data_dir)
+    fingerprint = _fingerprint(sources) if sources else f"synthetic:{synthetic_samples}:{seed}"
+    index_path = os.path.join(cache_dir, 'index.json')
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+        if index.get('version') == CACHE_VERSION and index.get('fingerprint') == fingerprint:
+            return index
+    except (FileNotFoundError, ValueError):
+        pass
+
+    os.makedirs(cache_dir, exist_ok=True)
+    batches = _iter_cifar(sources) if sources else _iter_synthetic(synthetic_samples, seed)
+    num_samples = 0
+    # Streamed one source batch at a time; the index is written last and marks the cache complete
+    with open(os.path.join(cache_dir, 'images.u8.tmp'), 'wb') as images_file, \
+            open(os.path.join(cache_dir, 'labels.u8.tmp'), 'wb') as labels_file:
+        for images, labels in batches:
+            images_file.write(np.ascontiguousarray(images).tobytes())
+            labels_file.write(labels.tobytes())
+            num_samples += len(labels)
+    for name in ('images.u8', 'labels.u8'):
+        os.replace(os.path.join(cache_dir, name + '.tmp'), os.path.join(cache_dir, name))
+
+    index = {
+        'version': CACHE_VERSION,
+        'fingerprint': fingerprint,
+        'source': 'cifar10' if sources else 'synthetic',
+        'num_samples': num_samples,
+        'image_shape': list(IMAGE_SHAPE),
+    }
+    with open(index_path + '.tmp', 'w') as f:
+        json.dump(index, f)
+    os.replace(index_path + '.tmp', index_path)
+    return index
+
+
+class MappedImageDataset(Dataset):
+    """
+    Batch-level dataset over the cache: __getitem__ takes a list of sample indices and
+    returns (normalized fp32 images, int64 labels) for all of them in one read.
+    """
+    def __init__(self, cache_dir, index):
+        self.cache_dir = cache_dir
+        self.num_samples = index['num_samples']
+        self.image_shape = tuple(index['image_shape'])
+        self.mean = torch.tensor(CIFAR_MEAN).view(1, 3, 1, 1)
+        self.std = torch.tensor(CIFAR_STD).view(1, 3, 1, 1)
+        self._images = None
+        self._labels = None
+
+    def __len__(self):
+        return self.num_samples
+
+    def __getstate__(self):
+        # Loader processes map the files themselves instead of receiving a pickled copy
+        state = dict(self.__dict__)
+        state['_images'] = state['_labels'] = None
+        return state
+
+    def _open(self):
+        self._images = np.memmap(os.path.join(self.cache_dir, 'images.u8'), dtype=np.uint8, mode='r',
+                                 shape=(self.num_samples, *self.image_shape))
+        self._labels = np.memmap(os.path.join(self.cache_dir, 'labels.u8'), dtype=np.uint8, mode='r',
+                                 shape=(self.num_samples,))
+
+    def __getitem__(self, indices):
+        if self._images is None:
+            self._open()
+        # Sorted reads walk the file forwards; order inside a batch does not matter for SGD
+        indices = np.sort(np.asarray(indices))
+        images = torch.from_numpy(self._images[indices])
+        labels = torch.from_numpy(self._labels[indices].astype(np.int64))
+        return images.float().div_(255.0).sub_(self.mean).div_(self.std), labels
+
+
+def build_loader(dataset, batch_size, num_workers=0, pin_memory=False, prefetch_factor=2):
+    """
+    Shuffled batches with num_workers background processes prefetching prefetch_factor
+    batches each. Build it once: the processes persist and every iteration is a new epoch.
+    """
+    sampler = BatchSampler(RandomSampler(dataset), batch_size, drop_last=False)
+    options = {}
+    if num_workers > 0:
+        options = {
+            'num_workers': num_workers,
+            'persistent_workers': True,
+            'prefetch_factor': prefetch_factor,
+            # Forking a process that already runs gRPC threads is unsafe
+            'multiprocessing_context': 'spawn',
+        }
+    return DataLoader(dataset, sampler=sampler, batch_size=None,
+                      pin_memory=pin_memory and torch.cuda.is_available(), **options)
+
+
+class _PrefetchedEpoch:
+    """One pass over a loader, filled by a background thread at most `depth` batches ahead."""
+    def __init__(self, loader, depth):
+        self._queue = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        threading.Thread(target=self._fill, args=(loader,), daemon=True, name='sctl-prefetch').start()
+
+    def _put(self, item):
+        # Gives up once the consumer stops reading (e.g. training failed mid-epoch)
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _fill(self, loader):
+        try:
+            for batch in loader:
+                if not self._put((batch, None)):
+                    return
+            self._put((None, None))
+        except Exception as e:
+            self._put((None, e))
+
+    def __iter__(self):
+        try:
+            while True:
+                batch, error = self._queue.get()
+                if error is not None:
+                    raise error
+                if batch is None:
+                    return
+                yield batch
+        finally:
+            self._stop.set()
+
+
+class BatchPrefetcher:
+    """
+    Wraps a loader so every epoch is loaded by a background thread while training runs.
+    prime() starts the next epoch early, e.g. while the worker waits on the network.
+    depth <= 0 iterates the loader directly.
+    """
+    def __init__(self, loader, depth=4):
+        self.loader = loader
+        self.depth = depth
+        self._primed = None
+
+    def __len__(self):
+        return len(self.loader)
+
+    def prime(self):
+        if self.depth > 0 and self._primed is None:
+            self._primed = _PrefetchedEpoch(self.loader, self.depth)
+
+    def __iter__(self):
+        if self.depth <= 0:
+            return iter(self.loader)
+        epoch, self._primed = self._primed or _PrefetchedEpoch(self.loader, self.depth), None
+        return iter(epoch)
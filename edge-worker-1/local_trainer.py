@@ -0,0 +1,88 @@
+import time
+from contextlib import nullcontext
+
+import torch
+import torch.nn as nn
+import torch.optim as optim
+
+
+def configure_threads(num_threads=0, interop_threads=0):
+    """Pins torch's intra-op / inter-op thread pools (0 = leave torch's default). Call before any training."""
+    if num_threads > 0:
+        torch.set_num_threads(num_threads)
+    if interop_threads > 0:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError:
+            # Can only be set once, before the first inter-op parallel work
+            print(f"⚠️  Inter-op threads already fixed at {torch.get_num_interop_threads()}")
+
+
+def cpu_supports_bf16():
+    """True if the CPU has native bf16 matmul support (AVX512-BF16 or AMX)."""
+    try:
+        return torch.cpu._is_avx512_bf16_supported() or torch.cpu._is_amx_tile_supported()
+    except AttributeError:
+        return False
+
+
+class LocalTrainer:
+    """
+    Local SGD engine that lives as long as the worker, not just one round: the optimizer
+    (and its momentum buffers) persists while load_state_dict() swaps the global weights
+    into the same parameters each round.
+    """
+    def __init__(self, model, lr=0.01, momentum=0.9, epochs=1, channels_last=False,
+                 compile_model=False, use_bf16=False):
+        self.model = model
+        self.epochs = epochs
+        self.channels_last = channels_last
+        self.use_bf16 = use_bf16
+        if channels_last:
+            model.to(memory_format=torch.channels_last)
+        # Parameters are updated in place by load_state_dict, so the optimizer keeps tracking them
+        self.optimizer = optim.SGD(model.parameters(), lr=lr, momentum=momentum)
+        self.criterion = nn.CrossEntropyLoss()
+        # The compiled module only runs forward/backward; state_dict() stays on the plain model
+        self.forward = torch.compile(model) if compile_model else model
+
+    def load_state_dict(self, state_dict):
+        self.model.load_state_dict(state_dict)
+
+    def state_dict(self):
+        if not self.channels_last:
+            return self.model.state_dict()
+        # Encoders and hashes expect the standard contiguous layout
+        return {name: tensor.contiguous() for name, tensor in self.model.state_dict().items()}
+
+    def _autocast(self):
+        return torch.autocast('cpu', dtype=torch.bfloat16) if self.use_bf16 else nullcontext()
+
+    def _step(self, data, target):
+        if self.channels_last:
+            data = data.contiguous(memory_format=torch.channels_last)
+        self.optimizer.zero_grad(set_to_none=True)
+        with self._autocast():
+            loss = self.criterion(self.forward(data), target)
+        loss.backward()
+        self.optimizer.step()
+        return loss
+
+    def train_round(self, loader):
+        """Runs the configured epochs over loader. Returns (last loss, samples seen, seconds)."""
+        self.model.train()
+        started = time.perf_counter()
+        loss, samples = None, 0
+        for _ in range(self.epochs):
+            for data, target in loader:
+                try:
+                    loss = self._step(data, target)
+                except Exception as e:
+                    if self.forward is self.model:
+                        raise
+                    # torch.compile needs a working toolchain; carry on in eager mode without it
+                    print(f"⚠️  torch.compile unavailable ({type(e).__name__}: {e}); training in eager mode")
+                    self.forward = self.model
+                    loss = self._step(data, target)
+                samples += len(target)
+        return (loss.item() if loss is not None else float('nan')), samples, time.perf_counter() - started
@@ -0,0 +1,196 @@
+import queue
+import threading
+
+import torch
+
+
+class StagingBusy(Exception):
+    """Every staging buffer stayed in use for the whole wait; the upload may be retried shortly."""
+
+
+class PendingUpdate:
+    """
+    Staging slot for one streamed update. Layers are written here as they are
+    decoded and only reach the running sum once the whole update is verified,
+    so an aborted or corrupted stream leaves the round untouched.
+    Layers must already be checked against the model (see update_ingest).
+    """
+    def __init__(self, accumulator, buffer):
+        self.accumulator = accumulator
+        self.buffer = buffer
+        self.layers_seen = set()
+
+    def add_layer(self, key, tensor):
+        offset, numel = self.accumulator.offsets[key]
+        if tensor.numel() != numel:
+            raise ValueError(f"Layer '{key}' has {tensor.numel()} values, expected {numel}")
+        self.buffer[offset:offset + numel].copy_(tensor.reshape(-1))
+        self.layers_seen.add(key)
+
+    def add_sparse_layer(self, key, indices, values):
+        offset, numel = self.accumulator.offsets[key]
+        self.buffer[offset:offset + numel].index_add_(0, indices, values.to(torch.float32))
+        self.layers_seen.add(key)
+
+
+class _Shard:
+    """One handler thread's private slice of the running sum (written without locks)."""
+    def __init__(self, num_params):
+        self.running_sum = torch.zeros(num_params, dtype=torch.float32)
+        self.total_weight = 0.0
+        # Share of total_weight that arrived as deltas against the round's global model
+        self.delta_weight = 0.0
+        self.count = 0
+
+    def reset(self):
+        self.running_sum.zero_()
+        self.total_weight = 0.0
+        self.delta_weight = 0.0
+        self.count = 0
+
+
+class FedAvgAccumulator:
+    """
+    Streaming, sample-weighted FedAvg.
+    Every accepted update is folded into a preallocated flat fp32 buffer as it
+    arrives, so memory per round stays constant no matter how many workers report.
+
+    Thread-safety: each handler thread folds into its own shard, so concurrent
+    uploads never contend on a lock. Shards are merged in finalize(), which the
+    caller must run while no add_flat/commit is in flight (see RoundGate).
+    """
+    def __init__(self, template_state_dict, max_pending=16):
+        # Remember the layout of the global model: (name, shape, dtype, offset, numel)
+        self.layout = []
+        offset = 0
+        for key, tensor in template_state_dict.items():
+            numel = tensor.numel()
+            self.layout.append((key, tuple(tensor.shape), tensor.dtype, offset, numel))
+            offset += numel
+        self.num_params = offset
+        self.offsets = {key: (offset, numel) for key, _, _, offset, numel in self.layout}
+
+        # Bounded pool of staging buffers for streamed updates (see PendingUpdate)
+        self.max_pending = max_pending
+        self._free_slots = queue.Queue()
+        self._slots_created = 0
+        self._slots_lock = threading.Lock()
+
+        # Per-thread partial sums; one shard per handler thread, never per worker
+        self._local = threading.local()
+        self._shards = []
+        self._shards_lock = threading.Lock()
+        self._merged = torch.zeros(self.num_params, dtype=torch.float32)
+
+    def _shard(self):
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = _Shard(self.num_params)
+            with self._shards_lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    @property
+    def count(self):
+        """Updates folded into the current round so far (across all shards)."""
+        with self._shards_lock:
+            return sum(shard.count for shard in self._shards)
+
+    def add_flat(self, flat, num_samples, is_delta=False, weight_scale=1.0):
+        """
+        Folds one update, a flat fp32 vector in the global model layout, into the running sum,
+        weighted by n_k (times weight_scale, e.g. a staleness discount). With is_delta=True the
+        vector is W_t^k - W_t; the base W_t is added back once at finalize.
+        """
+        if flat.numel() != self.num_params:
+            raise ValueError(f"Flat update has {flat.numel()} values, expected {self.num_params}")
+        weight = self._weight(num_samples, weight_scale)
+        shard = self._shard()
+        shard.running_sum.add_(flat, alpha=weight)
+        self._count(shard, weight, is_delta)
+
+    def begin_update(self, timeout=30.0):
+        """
+        Reserves a zeroed staging buffer for a streamed update. Blocks up to `timeout` while
+        all slots are busy, then raises StagingBusy.
+        """
+        try:
+            buffer = self._free_slots.get_nowait()
+        except queue.Empty:
+            with self._slots_lock:
+                can_allocate = self._slots_created < self.max_pending
+                if can_allocate:
+                    self._slots_created += 1
+            if can_allocate:
+                buffer = torch.empty(self.num_params, dtype=torch.float32)
+            else:
+                # Peak memory stays at max_pending buffers
+                try:
+                    buffer = self._free_slots.get(timeout=timeout)
+                except queue.Empty:
+                    raise StagingBusy(f"All {self.max_pending} update buffers are busy, retry shortly") from None
+        buffer.zero_()
+        return PendingUpdate(self, buffer)
+
+    def commit_update(self, pending, num_samples, is_delta=False, weight_scale=1.0):
+        """Folds a fully received, verified streamed update into the running sum."""
+        try:
+            self.add_flat(pending.buffer, num_samples, is_delta, weight_scale)
+        finally:
+            self.discard_update(pending)
+
+    def discard_update(self, pending):
+        """Returns the staging buffer to the pool without touching the running sum."""
+        if pending.buffer is not None:
+            self._free_slots.put(pending.buffer)
+            pending.buffer = None
+
+    def _weight(self, num_samples, weight_scale=1.0):
+        # Older workers may leave num_samples unset (0); they count as one sample
+        return float(max(num_samples, 1)) * weight_scale
+
+    def _count(self, shard, weight, is_delta):
+        shard.total_weight += weight
+        if is_delta:
+            shard.delta_weight += weight
+        shard.count += 1
+
+    def finalize(self, model):
+        """
+        Writes sum(n_k * W_k) / sum(n_k) into the model's parameters in place.
+        Caller must guarantee no concurrent add_flat/commit (shards are read here).
+        """
+        with self._shards_lock:
+            shards = list(self._shards)
+        count = sum(shard.count for shard in shards)
+        if count == 0:
+            raise RuntimeError("Cannot aggregate a round with no updates")
+
+        total_weight = sum(shard.total_weight for shard in shards)
+        if not total_weight > 0.0:
+            raise RuntimeError("Cannot aggregate a round whose updates carry no weight")
+        delta_weight = sum(shard.delta_weight for shard in shards)
+        with torch.no_grad():
+            # Merge the per-thread partial sums into one reusable buffer
+            self._merged.zero_()
+            for shard in shards:
+                if shard.count:
+                    self._merged.add_(shard.running_sum)
+
+            global_dict = model.state_dict()
+            average = self._merged.div_(total_weight)
+            if delta_weight:
+                # Deltas were taken against the model we are about to overwrite
+                base = torch.cat([global_dict[key].reshape(-1).to(torch.float32) for key, *_ in self.layout])
+                average.add_(base, alpha=delta_weight / total_weight)
+            for key, shape, dtype, offset, numel in self.layout:
+                global_dict[key].copy_(average[offset:offset + numel].view(shape).to(dtype))
+        return model
+
+    def reset(self):
+        """Reuses the same buffers for the next round."""
+        with self._shards_lock:
+            for shard in self._shards:
+                if shard.count:
+                    shard.reset()
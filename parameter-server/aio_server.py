@@ -0,0 +1,165 @@
+import asyncio
+import os
+from concurrent import futures
+
+import grpc
+
+import federated_service_pb2_grpc as pb2_grpc
+from round_coordinator import LONG_POLL_MAX_S
+from shared.tracing import TRACER
+
+# Threads for CPU-bound work (decode, fold, round close). Connections themselves
+# cost no thread at all, so thousands of workers can be attached at once.
+OFFLOAD_THREADS = int(os.environ.get('SCTL_OFFLOAD_THREADS', os.cpu_count() or 4))
+
+
+class _RecordedContext:
+    """
+    Stand-in for the aio context inside executor threads: records status calls
+    so they can be applied on the event loop afterwards.
+    """
+    def __init__(self, context):
+        self._context = context
+        self.code = None
+        self.details = None
+
+    def set_code(self, code):
+        self.code = code
+
+    def set_details(self, details):
+        self.details = details
+
+    def invocation_metadata(self):
+        return self._context.invocation_metadata()
+
+    def apply(self):
+        if self.code is not None:
+            self._context.set_code(self.code)
+        if self.details is not None:
+            self._context.set_details(self.details)
+
+
+class AsyncFederatedLearningServicer(pb2_grpc.FederatedLearningServicer):
+    """
+    grpc.aio front-end for FederatedLearningServicer.
+    Round state and aggregation logic stay in the sync servicer (`core`); this class only
+    moves blocking work off the event loop and turns long-polls into asyncio waits.
+    """
+    def __init__(self, core, executor=None):
+        self.core = core
+        self.executor = executor or futures.ThreadPoolExecutor(
+            max_workers=OFFLOAD_THREADS, thread_name_prefix='sctl-offload'
+        )
+        self.loop = None
+        self._round_event = None
+        core.coordinator.add_listener(self._on_round_opened)
+
+    def bind_loop(self, loop):
+        self.loop = loop
+        self._round_event = asyncio.Event()
+
+    async def _offload(self, handler, *args, context):
+        recorded = _RecordedContext(context)
+        try:
+            return await self.loop.run_in_executor(self.executor, handler, *args, recorded)
+        finally:
+            recorded.apply()
+
+    async def _prepare_download(self, request):
+        if request.accept_delta:
+            # Finding the diff may mean waiting for (or doing) its computation: keep that off the loop
+            return await self.loop.run_in_executor(self.executor, self.core.prepare_download, request)
+        return self.core.prepare_download(request)
+
+    async def GetGlobalModel(self, request, context):
+        # With the payload prepared, the rest is a lookup: cheap enough to answer on the loop
+        prepared = await self._prepare_download(request)
+        return self.core.GetGlobalModel(request, context, prepared)
+
+    async def GetGlobalModelStream(self, request, context):
+        prepared = await self._prepare_download(request)
+        for chunk in self.core.GetGlobalModelStream(request, context, prepared):
+            yield chunk
+
+    async def SendModelUpdate(self, request, context):
+        return await self._offload(self.core.SendModelUpdate, request, context=context)
+
+    async def SendModelUpdateStream(self, request_iterator, context):
+        """
+        Chunks are received on the event loop; a thread is only taken to decode each one and
+        to fold the finished update, so a slow uploader holds neither a thread nor, until its
+        header checks out, a staging slot.
+        """
+        try:
+            first = await request_iterator.__anext__()
+        except StopAsyncIteration:
+            first = None
+        upload, rejection = self.core.open_update_stream(first, context)
+        if rejection:
+            return rejection
+
+        update = upload.update
+        with TRACER.rpc_span('SendModelUpdateStream', context, update.round_number, update.worker_id,
+                             bytes=upload.total_size):
+            try:
+                await self.loop.run_in_executor(self.executor, upload.feed, first)
+                async for chunk in request_iterator:
+                    await self.loop.run_in_executor(self.executor, upload.feed, chunk)
+                return await self._offload(upload.finish, context=context)
+            except Exception as e:
+                return self.core.stream_failed(update, e, context)
+            finally:
+                # Not awaited: on cancellation a feed may still be running, close() waits for it
+                self.loop.run_in_executor(self.executor, upload.close)
+
+    async def GetUpdateProof(self, request, context):
+        return await self._offload(self.core.GetUpdateProof, request, context=context)
+
+    async def WaitForNextRound(self, request, context):
+        """Same contract as the sync version, but a waiting worker costs no thread."""
+        timeout = min(request.timeout_ms / 1000.0 if request.timeout_ms else LONG_POLL_MAX_S, LONG_POLL_MAX_S)
+        # Capped at the round deadline, exactly like the sync wait_for_round
+        deadline = self.loop.time() + self.core.coordinator.poll_timeout(timeout)
+        while True:
+            # Grab the event BEFORE checking, so an opening in between is never missed
+            event = self._round_event
+            if self.core.coordinator.current_round > request.after_round:
+                break
+            remaining = deadline - self.loop.time()
+            if remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(event.wait(), remaining)
+            except asyncio.TimeoutError:
+                break
+        return self.core.round_status(self.core.coordinator.status())
+
+    def _on_round_opened(self, round_number):
+        # Called from whichever thread closed the round
+        if self.loop is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(self._fire_round_event)
+
+    def _fire_round_event(self):
+        event, self._round_event = self._round_event, asyncio.Event()
+        event.set()
+
+
+def build_aio_server(core, options=None):
+    """Creates (but does not start) a grpc.aio server around an existing servicer."""
+    servicer = AsyncFederatedLearningServicer(core)
+    server = grpc.aio.server(options=options)
+    pb2_grpc.add_FederatedLearningServicer_to_server(servicer, server)
+    return server, servicer
+
+
+async def serve_aio(core, address, creds=None, options=None):
+    server, servicer = build_aio_server(core, options)
+    servicer.bind_loop(asyncio.get_running_loop())
+    if creds is not None:
+        server.add_secure_port(address, creds)
+    else:
+        server.add_insecure_port(address)
+
+    await server.start()
+    print(f"🚀 SCTL Parameter Server (asyncio) live on {address}")
+    await server.wait_for_termination()
@@ -0,0 +1,143 @@
+import atexit
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from server_metrics import ANCHOR_RETRIES, LEDGER_APPEND_SECONDS
+from shared.tracing import TRACER
+
+# One closed round waiting to become durable (weights_data: the model blob to checkpoint, if any)
+AnchorJob = namedtuple('AnchorJob', ['round_num', 'model_hash', 'updates_root', 'num_updates', 'weights_data'],
+                       defaults=(None,))
+
+_STOP = object()
+
+
+class AnchorCommitter:
+    """
+    Makes closed rounds durable off the aggregation critical path.
+
+    aggregate_weights() only submit()s the round and moves on; a single background
+    thread checkpoints the round's model, persists its Merkle leaves and appends + fsyncs
+    its ledger block, strictly in round order. A round counts as *anchored* once that thread confirms it.
+
+    - Back-pressure: at most max_pending rounds may wait; submit() blocks beyond that,
+      so a stuck disk stalls round turnover instead of growing memory without bound.
+    - Retries: a failed attempt is retried with capped exponential backoff. A round is
+      never skipped, later rounds wait behind it (the chain must stay in order).
+    - Shutdown: flush() waits for everything submitted so far; close() runs at exit.
+    """
+    def __init__(self, ledger, update_audit, max_pending=8, retry_backoff_s=0.5, max_backoff_s=30.0, checkpoints=None):
+        self.ledger = ledger
+        self.update_audit = update_audit
+        self.checkpoints = checkpoints
+        self.retry_backoff_s = retry_backoff_s
+        self.max_backoff_s = max_backoff_s
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._cond = threading.Condition()
+        self._submitted = 0
+        self._done = 0
+        self.last_anchored_round = None
+        self.last_error = None
+        self.listeners = []
+
+        self._thread = threading.Thread(target=self._run, name="anchor-committer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def add_listener(self, callback):
+        """Registers callback(round_num), invoked on the committer thread once a round is anchored."""
+        self.listeners.append(callback)
+
+    def submit(self, round_num, model_hash, updates_root, num_updates, weights_data=None):
+        """Queues a closed round for anchoring. Blocks while max_pending rounds are already waiting."""
+        job = AnchorJob(round_num, model_hash, updates_root, num_updates, weights_data)
+        with self._cond:
+            self._submitted += 1
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            print(f"⏳ [DLT] {self._queue.maxsize} rounds waiting to be anchored, round {round_num} is blocked...")
+            self._queue.put(job)
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is _STOP:
+                return
+            self._commit(job)
+            with self._cond:
+                self._done += 1
+                self.last_anchored_round = job.round_num
+                self._cond.notify_all()
+            for callback in self.listeners:
+                # A failing listener must not take down the only anchoring thread
+                try:
+                    callback(job.round_num)
+                except Exception as e:
+                    print(f"⚠️ [DLT] Listener failed after anchoring round {job.round_num}: {e}")
+
+    def _commit(self, job):
+        backoff = self.retry_backoff_s
+        attempt = 1
+        while True:
+            started = time.perf_counter()
+            try:
+                with TRACER.span('ledger_append', job.round_num, attempt=attempt):
+                    if self.checkpoints is not None and job.weights_data is not None:
+                        # Every model hash on the ledger must be restorable after a crash
+                        self.checkpoints.put(job.round_num, job.model_hash, job.weights_data)
+                    # Leaves first: an anchored root must always be provable
+                    self.update_audit.persist(job.round_num)
+                    tip = self.ledger.get_last_block()
+                    if (tip['round_num'], tip['model_hash'], tip.get('updates_root')) == \
+                            (job.round_num, job.model_hash, job.updates_root):
+                        # An earlier attempt appended the block but its fsync failed
+                        self.ledger.save_to_disk()
+                        print(f"📦 Block #{tip['index']} anchored to DLT for Round {job.round_num}")
+                    else:
+                        self.ledger.add_model_update(
+                            round_num=job.round_num,
+                            model_hash=job.model_hash,
+                            updates_root=job.updates_root,
+                            num_updates=job.num_updates
+                        )
+                LEDGER_APPEND_SECONDS.observe(time.perf_counter() - started)
+                self.last_error = None
+                return
+            except Exception as e:
+                ANCHOR_RETRIES.inc()
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"⚠️ [DLT] Anchoring round {job.round_num} failed (attempt {attempt}): {e}; "
+                      f"retrying in {backoff:.1f}s")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff_s)
+                attempt += 1
+
+    def is_anchored(self, round_num):
+        return self.last_anchored_round is not None and round_num <= self.last_anchored_round
+
+    def wait_anchored(self, round_num, timeout=None):
+        """Blocks until round_num is durable on the ledger. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.is_anchored(round_num), timeout)
+
+    def flush(self, timeout=None):
+        """Waits until every round submitted so far is anchored. Returns False on timeout."""
+        with self._cond:
+            target = self._submitted
+            return self._cond.wait_for(lambda: self._done >= target, timeout)
+
+    def pending(self):
+        with self._cond:
+            return self._submitted - self._done
+
+    def close(self, timeout=60.0):
+        if not self._thread.is_alive():
+            return
+        if not self.flush(timeout):
+            print(f"🚨 [DLT] Shutting down with {self.pending()} round(s) not anchored!")
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
@@ -1,16 +1,16 @@
 import grpc
 from concurrent import futures
 import time
-import copy
 import hashlib
-import json
-import torch
 import sys
 import os
-from flask import Flask, jsonify, request
-from flask_cors import CORS
 import threading
-import io
+import itertools
+import argparse
+import asyncio
+import subprocess
+import math
+from contextlib import contextmanager
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = os.path.abspath(os.path.join(current_dir, '..'))
@@ -18,142 +18,850 @@ sys.path.append(project_root)
 sys.path.append(os.path.join(project_root, 'shared'))
 
 
-from google.protobuf import empty_pb2 
-
 import federated_service_pb2 as pb2
 import federated_service_pb2_grpc as pb2_grpc
 
 from cnn_model import SimpleCNN
-from shared.utils import load_weights_from_bytes, get_weights_as_bytes, generate_model_hash
+from robust_aggregation import build_accumulator
+from aggregation import StagingBusy
+from model_cache import build_snapshot, is_current
+from round_coordinator import RoundCoordinator, RoundGate, UpdateRejected, LONG_POLL_MAX_S
+from aio_server import serve_aio
+from update_audit import UpdateAudit
+from anchor_committer import AnchorCommitter
+from checkpoint_store import CheckpointStore
+from delta_sync import DeltaSyncCache
+from dashboard_feed import DashboardFeed
+from dashboard_api import build_dashboard_app, format_block
+from state_snapshot import SnapshotWriter, default_snapshot_path
+from server_metrics import (
+    DECODE_SECONDS, VALIDATE_SECONDS, ACCUMULATE_SECONDS, AGGREGATE_SECONDS, HASH_SECONDS, ROUND_SECONDS,
+    RPC_BYTES_RECEIVED, RPC_BYTES_SENT, MODEL_DOWNLOADS, UPDATE_BYTES, UPDATES, ROUNDS,
+    ANCHOR_QUEUE_DEPTH, ROUND_BUFFERED_UPDATES, INGEST_SLOTS_FREE
+)
+from shared.metrics import start_metrics_server
+from shared.tracing import TRACER
+from update_ingest import (
+    IngestPool, InvalidUpdate, decode_blob, flatten_update, check_values, check_update_header, max_update_size,
+    expected_layers, check_dense_layer, check_sparse_layer
+)
+from shared.update_codec import StreamingUpdateDecoder, ENCODING_NAMES, SUPPORTED_ENCODINGS
+from shared.streaming import iter_weights_chunks
+from shared.merkle import leaf_record
 from dlt_network.blockchain import ModelLedger
 
+# --- ROUND SCHEDULING ---
+ROUND_TARGET_UPDATES = int(os.environ.get('SCTL_ROUND_TARGET', 3))     # N: close as soon as N updates arrive
+ROUND_QUORUM = int(os.environ.get('SCTL_ROUND_QUORUM', 1))             # K: ...or at the deadline with >= K
+ROUND_DEADLINE_S = float(os.environ.get('SCTL_ROUND_DEADLINE_S', 15))
+ROUND_OVER_SELECTION = float(os.environ.get('SCTL_OVER_SELECTION', 0.3))
+STALE_POLICY = os.environ.get('SCTL_STALE_POLICY', 'drop')             # 'drop' or 'downweight'
+
+# --- SYNC SERVER ---
+GRPC_THREADS = int(os.environ.get('SCTL_GRPC_THREADS', 10))             # handler threads of the thread-pool server
+# WaitForNextRound long-polls allowed to hold a handler thread; beyond that a poll is answered at once
+MAX_PARKED_POLLS = int(os.environ.get('SCTL_MAX_PARKED_POLLS', max(1, GRPC_THREADS // 2)))
+
+# --- UPDATE INGEST ---
+INGEST_PROCESSES = int(os.environ.get('SCTL_INGEST_PROCESSES', 0))     # >0: decode/validate in a process pool
+MAX_UPDATE_NORM = float(os.environ.get('SCTL_MAX_UPDATE_NORM', math.inf))  # L2 bound on an uploaded update
+# A stream holds its receive state while it waits for a staging buffer, so it only waits briefly
+STREAM_SLOT_WAIT_S = float(os.environ.get('SCTL_STREAM_SLOT_WAIT_S', 1.0))
+
+# --- AGGREGATION STRATEGY ---
+AGGREGATOR = os.environ.get('SCTL_AGGREGATOR', 'fedavg')      # fedavg | trimmed_mean | median | krum | multi_krum
+TRIM_RATIO = float(os.environ.get('SCTL_TRIM_RATIO', 0.1))      # trimmed_mean: share cut at EACH end
+ASSUMED_BYZANTINE = int(os.environ.get('SCTL_ASSUMED_BYZANTINE', 1))   # krum / multi_krum: f
+ANOMALY_THRESHOLD = float(os.environ.get('SCTL_ANOMALY_THRESHOLD', 1.0))  # reject self-reported scores >= this
+
+# --- DLT ANCHORING ---
+ANCHOR_MAX_PENDING = int(os.environ.get('SCTL_ANCHOR_MAX_PENDING', 8))  # closed rounds allowed to wait for the ledger
+
+# --- CHECKPOINTS ---
+# Every anchored global model, stored by its hash; a restart resumes from the newest one.
+CHECKPOINT_DIR = os.environ.get('SCTL_CHECKPOINT_DIR', 'sctl_checkpoints')   # '' = off: restart from scratch
+CHECKPOINT_KEEP_LAST = int(os.environ.get('SCTL_CHECKPOINT_KEEP_LAST', 10))    # most recent rounds kept
+CHECKPOINT_KEEP_EVERY = int(os.environ.get('SCTL_CHECKPOINT_KEEP_EVERY', 100))  # ...plus every Nth round for good (0 = none)
+
+# --- DELTA SYNC ---
+# Workers holding one of the last N global models download a diff against it (0 = always full weights)
+DELTA_SYNC_BASES = int(os.environ.get('SCTL_DELTA_SYNC_BASES', 4))
+
+# --- DASHBOARD ---
+DASHBOARD_MIN_INTERVAL_S = float(os.environ.get('SCTL_DASHBOARD_INTERVAL_S', 0.5))  # at most one snapshot per interval
+WORKER_OFFLINE_ROUNDS = 3   # Workers silent for this many rounds are shown offline
+DASHBOARD_RECENT_BLOCKS = 10
+# 'process': separate API process reading a shared-memory snapshot (training never serves HTTP)
+# 'thread':  Flask inside this process, as before. 'off': publish the snapshot only (run dashboard_api.py yourself)
+DASHBOARD_MODE = os.environ.get('SCTL_DASHBOARD', 'process')
+# Empty: one segment per ledger (see default_snapshot_path), so servers sharing a host stay apart
+SNAPSHOT_PATH = os.environ.get('SCTL_SNAPSHOT_PATH', '')
+
+# --- TELEMETRY ---
+METRICS_PORT = int(os.environ.get('SCTL_METRICS_PORT', 9100))    # GET /metrics (Prometheus text format); 0 = off
+TRACE_DIR = os.environ.get('SCTL_TRACE_DIR', '')    # per-round Chrome-trace timelines (Perfetto); empty = off
+
+class StreamedUpload:
+    """
+    Receive state of one SendModelUpdateStream call, fed one chunk at a time. The sync
+    handler drives it from its request iterator; the asyncio front-end receives chunks on
+    the event loop and only runs feed() / finish() in its executor.
+    """
+    def __init__(self, servicer, first):
+        self.servicer = servicer
+        self.first = first
+        self.update = first.header
+        self.total_size = first.total_size
+        self.pending = None
+        self.expected = expected_layers(servicer.accumulator.layout)
+        self.decode_seconds = 0.0
+        # The header is checked against the model before any layer is buffered
+        self.decoder = StreamingUpdateDecoder(self.update.encoding, on_header=self._on_header)
+        self.running_hash = hashlib.sha256()
+        self.received = 0
+        self.digest = ""
+        # feed/finish may still run in an executor thread when the call is cancelled
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _on_header(self, entries):
+        check_update_header(entries, self.update.encoding, self.servicer.accumulator.layout)
+        # Staging slots are only handed to streams whose header matches the model
+        self.pending = self.servicer.accumulator.begin_update(timeout=STREAM_SLOT_WAIT_S)
+
+    def feed(self, chunk):
+        """Hashes and decodes one chunk into the staging slot. Raises InvalidUpdate or StagingBusy."""
+        with self._lock:
+            if self._closed:
+                raise InvalidUpdate("Upload was aborted.")
+            self.received += len(chunk.data)
+            RPC_BYTES_RECEIVED.labels('SendModelUpdateStream').inc(len(chunk.data))
+            if self.received > self.total_size:
+                raise InvalidUpdate("Stream is longer than its announced size.")
+            self.running_hash.update(chunk.data)
+            started = time.perf_counter()
+            try:
+                layers = list(self.decoder.feed(chunk.data))
+            except (InvalidUpdate, StagingBusy):
+                raise
+            except Exception as e:
+                raise InvalidUpdate(f"Could not decode update: {e}")
+            # Same per-layer checks as a unary upload (flatten_update)
+            for key, layer in layers:
+                if self.update.encoding == pb2.ENCODING_TOPK:
+                    check_sparse_layer(key, *layer, self.expected)
+                    self.pending.add_sparse_layer(key, *layer)
+                else:
+                    check_dense_layer(key, layer, self.expected)
+                    self.pending.add_layer(key, layer)
+            self.decode_seconds += time.perf_counter() - started
+            if chunk.sha256:
+                self.digest = chunk.sha256
+
+    def finish(self, context):
+        """Verifies the completed stream and folds it into the round. Returns the Acknowledgement."""
+        servicer, update = self.servicer, self.update
+        with self._lock:
+            if self._closed:
+                raise InvalidUpdate("Upload was aborted.")
+            if (self.received != self.total_size or not self.decoder.finished()
+                    or self.digest != self.running_hash.hexdigest()):
+                print(f"⚠️ [REJECTED] Incomplete or corrupted stream from {update.worker_id}")
+                return servicer._reject(context, grpc.StatusCode.DATA_LOSS,
+                                        "Streamed update failed its size/integrity check.", "Corrupted stream.")
+            # Decoding is spread over the chunks: observed once, as its total
+            DECODE_SECONDS.observe(self.decode_seconds)
+            # Dense updates carry every layer; top-k ones only the layers they touch (as in flatten_update)
+            missing = set(self.expected) - self.pending.layers_seen
+            if update.encoding != pb2.ENCODING_TOPK and missing:
+                raise InvalidUpdate(f"Streamed update is missing layers: {sorted(missing)}")
+
+            with VALIDATE_SECONDS.time(), TRACER.span('validate', update.round_number, worker=update.worker_id):
+                check_values(self.pending.buffer, MAX_UPDATE_NORM)
+
+            # Only a complete, verified and admitted update reaches the running sum
+            def fold(weight_scale):
+                servicer.accumulator.commit_update(self.pending, update.num_samples,
+                                                   is_delta=update.is_delta, weight_scale=weight_scale)
+
+            return servicer._fold_update(update, fold, self.received, self.digest, context)
+
+    def close(self):
+        """Returns the staging slot unless finish() already folded it."""
+        with self._lock:
+            self._closed = True
+            if self.pending is not None:
+                self.servicer.accumulator.discard_update(self.pending)
+
+
 class FederatedLearningServicer(pb2_grpc.FederatedLearningServicer):
-    def __init__(self):
+    def __init__(self, rollback_round=None):
         self.global_model = SimpleCNN()
-        # This list will hold updates from workers until we are ready to aggregate
-        self.received_updates = []
         self.dlt = ModelLedger() #Initialize the local ledger
+        # Per-round Merkle tree over every accepted update; only its root is anchored
+        self.update_audit = UpdateAudit()
+        self.checkpoints = None
+        if CHECKPOINT_DIR:
+            self.checkpoints = CheckpointStore(CHECKPOINT_DIR, CHECKPOINT_KEEP_LAST, CHECKPOINT_KEEP_EVERY)
+        # Checkpoints, ledger appends + fsyncs happen on this background thread, not while a round is closing
+        self.committer = AnchorCommitter(self.dlt, self.update_audit, max_pending=ANCHOR_MAX_PENDING,
+                                         checkpoints=self.checkpoints)
+        # Serialized + hashed global model, rebuilt only when a round closes
         self.current_round = 0
+        self.model_snapshot = None
+        if self.checkpoints is not None:
+            self._restore(rollback_round)
+        if self.model_snapshot is None:
+            self.model_snapshot = build_snapshot(self.global_model, self.current_round)
+        self.delta_sync = None
+        if DELTA_SYNC_BASES > 0:
+            self.delta_sync = DeltaSyncCache(DELTA_SYNC_BASES)
+            self.delta_sync.add_base(self.model_snapshot)
+
+        # FedAvg keeps a running sum; robust strategies keep the round's [workers x params] matrix
+        self.accumulator = build_accumulator(
+            AGGREGATOR, self.global_model.state_dict(),
+            trim_ratio=TRIM_RATIO, num_byzantine=ASSUMED_BYZANTINE
+        )
+        # Streamed uploads are not bound by gRPC message limits: cap each at what the model allows
+        self.max_stream_bytes = {encoding: max_update_size(self.accumulator.layout, encoding)
+                                 for encoding in SUPPORTED_ENCODINGS}
+        # Upload bandwidth bookkeeping: bytes actually received vs. uncompressed fp32
+        self.round_bytes_in = 0
+        self.round_bytes_raw = 0
+        self.bytes_lock = threading.Lock()
+
+        # Handlers fold updates concurrently (shared); closing a round is exclusive
+        self.round_gate = RoundGate()
+        self.coordinator = RoundCoordinator(
+            target=ROUND_TARGET_UPDATES,
+            quorum=ROUND_QUORUM,
+            deadline_s=ROUND_DEADLINE_S,
+            over_selection=ROUND_OVER_SELECTION,
+            stale_policy=STALE_POLICY
+        )
+        self.coordinator.open_round(self.current_round)
+        # Optional out-of-process decoding, so ingest scales with cores instead of the GIL
+        self.ingest_pool = None
+        if INGEST_PROCESSES > 0:
+            self.ingest_pool = IngestPool(self.accumulator.layout, self.accumulator.num_params,
+                                          INGEST_PROCESSES, MAX_UPDATE_NORM)
+        # Dashboard: one precomputed snapshot per state change, pushed to every open tab
+        # worker_id -> (num_samples, round, unix time) of its latest accepted update
+        self.worker_activity = {}
+        # Wall-clock split of the last round close, in ms
+        self.phase_timings = {}
+        self.round_started = time.time()
+        # Every snapshot is also copied into shared memory for out-of-process API servers
+        # (not needed when Flask runs in this process, unless a segment was asked for)
+        self.snapshot_path = SNAPSHOT_PATH or default_snapshot_path(self.dlt.filename)
+        self.snapshot_writer = None
+        if DASHBOARD_MODE != 'thread' or SNAPSHOT_PATH:
+            self.snapshot_writer = SnapshotWriter(self.snapshot_path)
+        self.dashboard = DashboardFeed(self.dashboard_state, DASHBOARD_MIN_INTERVAL_S, on_publish=(
+            None if self.snapshot_writer is None else lambda body: self.snapshot_writer.write(body.encode())))
+        self.coordinator.add_listener(lambda round_number: self.dashboard.touch())
+        self.committer.add_listener(lambda round_num: self.dashboard.touch())
+        # A round's timeline ends with its ledger append
+        self.committer.add_listener(TRACER.flush_round)
+
+        # Queue depths are sampled when /metrics is scraped, never on the request path
+        ANCHOR_QUEUE_DEPTH.set_function(self.committer.pending)
+        ROUND_BUFFERED_UPDATES.set_function(lambda: self.coordinator.status()['updates_received'])
+        if self.ingest_pool is not None:
+            INGEST_SLOTS_FREE.set_function(self.ingest_pool.free_slots)
+
+        # Closes rounds whose deadline passes while no new update is arriving
+        threading.Thread(target=self._round_watchdog, daemon=True).start()
     
 
+    def _restore(self, rollback_round=None):
+        """
+        Resumes after a restart: loads the newest checkpoint whose hash is anchored on the
+        ledger (or rollback_round's, an O(1) lookup) straight from its memory map, and
+        continues numbering after the ledger's last round.
+        """
+        tip = self.dlt.get_last_block()
+        if tip['model_hash'] == 'GENESIS':
+            return
+        self.current_round = tip['round_num'] + 1
+
+        if rollback_round is not None:
+            model_hash = self.checkpoints.model_hash(rollback_round)
+            anchored = model_hash is not None and any(
+                block['round_num'] == rollback_round for block in self.dlt.blocks_by_hash(model_hash))
+            if not anchored:
+                raise ValueError(f"Round {rollback_round} has no checkpoint anchored on the ledger")
+            candidates = [(rollback_round, model_hash)]
+        else:
+            # A checkpoint written just before a crash may never have reached the ledger
+            candidates = [(round_num, model_hash) for round_num, model_hash in self.checkpoints.history()
+                          if self.dlt.index.hashes(model_hash)]
+
+        for round_num, model_hash in candidates:
+            try:
+                opened = self.checkpoints.open(model_hash)
+                if opened is None:
+                    continue    # Evicted
+                state_dict, _ = opened
+                self.global_model.load_state_dict(state_dict)
+            except (ValueError, RuntimeError) as e:
+                print(f"⚠️ [Checkpoint] Round {round_num} checkpoint is unreadable: {e}")
+                continue
+            # Re-hashing doubles as the integrity check: the file name is the expected hash
+            snapshot = build_snapshot(self.global_model, self.current_round)
+            if snapshot.model_hash != model_hash:
+                print(f"⚠️ [Checkpoint] Round {round_num} checkpoint does not match its hash, skipping.")
+                continue
+            self.model_snapshot = snapshot
+            print(f"♻️  Restored the global model of round {round_num} ({model_hash[:16]}...), "
+                  f"resuming at round {self.current_round}")
+            return
+
+        if rollback_round is not None:
+            raise ValueError(f"Checkpoint of round {rollback_round} is missing or damaged")
+        print(f"⚠️ [Checkpoint] No usable checkpoint matches the ledger; round {self.current_round} "
+              f"starts from a fresh model.")
+        self.global_model = SimpleCNN()
+
+    def _reject(self, context, code, details, message):
+        UPDATES.labels('rejected').inc()
+        context.set_code(code)
+        context.set_details(details)
+        return pb2.Acknowledgement(success=False, message=f"Validation failed: {message}")
+
+    def _validate_update(self, update, blob_size, max_size, context):
+        """Checks an update's metadata before any decoding. Returns an Acknowledgement on rejection."""
+        min_size = 10 * 1024 
+
+        # Compressed updates are legitimately small; the floor only applies to full fp32 weights
+        is_full_weights = update.encoding == pb2.ENCODING_RAW and not update.is_delta
+        if (is_full_weights and blob_size < min_size) or blob_size > max_size:
+            print(f"⚠️ [REJECTED] Invalid weight size from {update.worker_id}: {blob_size} bytes")
+            return self._reject(context, grpc.StatusCode.INVALID_ARGUMENT,
+                                f"Weight blob size {blob_size} is outside allowed range.", "Invalid weight size.")
+
+        if update.anomaly_score >= ANOMALY_THRESHOLD:
+            print(f"⚠️ [REJECTED] {update.worker_id} flagged itself anomalous (score {update.anomaly_score:.2f})")
+            return self._reject(context, grpc.StatusCode.INVALID_ARGUMENT,
+                                f"Anomaly score {update.anomaly_score:.2f} is above the threshold.", "Anomalous update.")
+
+        if update.encoding not in SUPPORTED_ENCODINGS or (update.encoding == pb2.ENCODING_TOPK and not update.is_delta):
+            print(f"⚠️ [REJECTED] Unsupported encoding from {update.worker_id}: {update.encoding}")
+            return self._reject(context, grpc.StatusCode.INVALID_ARGUMENT,
+                                f"Update encoding {update.encoding} is not accepted.", "Unsupported encoding.")
+        return None
+
+    @contextmanager
+    def _decode_update(self, update):
+        """
+        Yields the update as a validated flat fp32 tensor, decoded in the ingest pool if
+        one is configured, otherwise on this thread into a pooled staging buffer.
+        """
+        if self.ingest_pool is not None:
+            started = time.perf_counter()
+            span = TRACER.span('decode', update.round_number, worker=update.worker_id, pool=True)
+            with span, self.ingest_pool.decode(update.weights_data, update.encoding, update.is_delta) as flat:
+                DECODE_SECONDS.observe(time.perf_counter() - started)
+                yield flat
+            return
+
+        pending = self.accumulator.begin_update()
+        try:
+            with DECODE_SECONDS.time(), TRACER.span('decode', update.round_number, worker=update.worker_id):
+                try:
+                    decoded = decode_blob(update.weights_data, update.encoding, update.is_delta)
+                except Exception as e:
+                    raise InvalidUpdate(f"Could not decode update: {e}")
+                flatten_update(decoded, update.encoding, self.accumulator.layout, pending.buffer)
+            with VALIDATE_SECONDS.time(), TRACER.span('validate', update.round_number, worker=update.worker_id):
+                check_values(pending.buffer, MAX_UPDATE_NORM)
+            yield pending.buffer
+        finally:
+            self.accumulator.discard_update(pending)
+
+    def _reject_invalid(self, update, error, context):
+        print(f"⚠️ [REJECTED] Invalid update from {update.worker_id}: {error}")
+        return self._reject(context, grpc.StatusCode.INVALID_ARGUMENT, str(error), "Invalid update contents.")
+
+    def _reject_busy(self, update, error, context):
+        print(f"🚧 [BUSY] No free update buffer for {update.worker_id}, asked to retry")
+        return self._reject(context, grpc.StatusCode.RESOURCE_EXHAUSTED, str(error), "Server busy, retry shortly.")
+
+    def _admit(self, update):
+        """
+        Round-level checks; must be called inside round_gate.shared() so the round cannot close in between.
+        Returns the FedAvg weight multiplier, or raises UpdateRejected.
+        """
+        if update.is_delta and update.base_model_hash != self.model_snapshot.model_hash:
+            # A delta is only meaningful against the global model of the round being aggregated
+            raise UpdateRejected("Delta was computed against an outdated global model.", stale=True)
+        # The worker's local anomaly score lowers its trust weight: 0 -> full weight, 1 -> none
+        trust = 1.0 - min(max(update.anomaly_score, 0.0), 1.0)
+        if not trust > 0.0:
+            # A zero (or NaN) weight adds nothing, and a round of only those would divide by zero
+            raise UpdateRejected(f"Anomaly score {update.anomaly_score:.2f} leaves the update no weight.")
+        return self.coordinator.admit(update.worker_id, update.round_number) * trust
+
+    def _reject_admission(self, update, error, context):
+        print(f"⚠️ [REJECTED] {update.worker_id}: {error}")
+        return self._reject(context, grpc.StatusCode.FAILED_PRECONDITION, str(error),
+                            "Stale update." if error.stale else "Not admitted to this round.")
+
+    def _fold_update(self, update, fold, blob_size, payload_sha256, context):
+        """
+        Admits a decoded update and folds it in via fold(weight_scale).
+        Runs concurrently with other handlers; only closing the round is exclusive.
+        """
+        with self.round_gate.shared():
+            try:
+                weight_scale = self._admit(update)
+            except UpdateRejected as e:
+                return self._reject_admission(update, e, context)
+            try:
+                with ACCUMULATE_SECONDS.time(), TRACER.span('accumulate', self.current_round, worker=update.worker_id):
+                    fold(weight_scale)
+            except Exception:
+                self.coordinator.release(update.worker_id)
+                raise
+            admitted_round = self.current_round
+            count = self.coordinator.record()
+            self.update_audit.add(leaf_record(
+                admitted_round, update.worker_id, payload_sha256, update.num_samples,
+                ENCODING_NAMES[update.encoding], update.is_delta, update.round_number
+            ))
+            with self.bytes_lock:
+                self.round_bytes_in += blob_size
+                self.round_bytes_raw += self.accumulator.num_params * 4
+
+        return self._update_accepted(update, blob_size, count, admitted_round)
+
+    def _update_accepted(self, update, blob_size, count, admitted_round):
+        """Logging once an update is in the running sum; may close the round."""
+        UPDATES.labels('accepted').inc()
+        UPDATE_BYTES.observe(blob_size)
+        self.worker_activity[update.worker_id] = (update.num_samples, admitted_round, time.time())
+        self.dashboard.touch()
+        print(f"📦 Update encoding: {ENCODING_NAMES[update.encoding]}{' delta' if update.is_delta else ''}, {blob_size / 1024:.1f} KB")
+        
+        print(f"📊 Current Buffer: {count}/{self.coordinator.target} workers received.")
+        
+        # Close the round at N updates (or at the deadline with quorum K)
+        if self.coordinator.ready_to_close():
+            self._close_round(admitted_round)
+
+        return pb2.Acknowledgement(
+            success=True, 
+            message=f"Weights for {update.worker_id} successfully unpacked and stored."
+        )
+
     def SendModelUpdate(self, request, context):
         # 1. Correct: worker_id is correct per your proto
         print(f"🔒 ZTNA Verified: Received update from {request.worker_id}")
         
-        # --- VALIDATION CHECK STARTS HERE ---
-        min_size = 10 * 1024 
-        max_size = 10 * 1024 * 1024 # 10MB limit
-        
+        # --- VALIDATION CHECK ---
         # FIX 2: Use 'weights_data', NOT 'weights_blob'
         blob_size = len(request.weights_data)
-        
-        if blob_size < min_size or blob_size > max_size:
-            print(f"⚠️ [REJECTED] Invalid weight size from {request.worker_id}: {blob_size} bytes")
-            context.set_code(grpc.StatusCode.INVALID_ARGUMENT)
-            context.set_details(f"Weight blob size {blob_size} is outside allowed range.")
-            return pb2.Acknowledgement(success=False, message="Validation failed: Invalid weight size.")
-        # --- VALIDATION CHECK ENDS HERE ---
+        RPC_BYTES_RECEIVED.labels('SendModelUpdate').inc(blob_size)
+        rejection = self._validate_update(request, blob_size, 10 * 1024 * 1024, context) # 10MB limit
+        if rejection:
+            return rejection
 
-        try:
-            worker_model = SimpleCNN()
-            
-            # FIX 2 (Again): Use 'weights_data' here too
-            load_weights_from_bytes(worker_model, request.weights_data)
-            
-            # 3. Store the model
-            self.received_updates.append({
-                'worker_id': request.worker_id,
-                'active_worker':1 ,
-                'model': worker_model,
-                # FIX 3: Use 'num_samples', NOT 'sample_count'
-                'samples': request.num_samples 
-            })
-            
-            print(f"📊 Current Buffer: {len(self.received_updates)}/3 workers received.")
-            
-            # Trigger aggregation if you want to speed up the demo
-            if len(self.received_updates) >= 1: # Changing to 1 for testing speed
-                 self.aggregate_weights()
+        with TRACER.rpc_span('SendModelUpdate', context, request.round_number, request.worker_id, bytes=blob_size):
+            try:
+                # 3. Decode + validate (outside the lock) and fold the update into the running FedAvg sum (weighted by n_k)
+                with self._decode_update(request) as flat:
+                    def fold(weight_scale):
+                        self.accumulator.add_flat(flat, request.num_samples, is_delta=request.is_delta, weight_scale=weight_scale)
 
-            return pb2.Acknowledgement(
-                success=True, 
-                message=f"Weights for {request.worker_id} successfully unpacked and stored."
-            )
-            
-        except Exception as e:
-            print(f"❌ Error unpacking weights: {e}")
-            context.set_code(grpc.StatusCode.INTERNAL)
-            return pb2.Acknowledgement(success=False, message=str(e))
-        
-    def GetGlobalModel(self, request, context):
+                    payload_sha256 = hashlib.sha256(request.weights_data).hexdigest()
+                    return self._fold_update(request, fold, blob_size, payload_sha256, context)
+
+            except InvalidUpdate as e:
+                return self._reject_invalid(request, e, context)
+            except StagingBusy as e:
+                return self._reject_busy(request, e, context)
+            except Exception as e:
+                UPDATES.labels('error').inc()
+                print(f"❌ Error unpacking weights: {e}")
+                context.set_code(grpc.StatusCode.INTERNAL)
+                return pb2.Acknowledgement(success=False, message=str(e))
+
+    def SendModelUpdateStream(self, request_iterator, context):
+        """Chunked upload: each layer is decoded as soon as its bytes arrive, the blob is never held whole."""
+        upload, rejection = self.open_update_stream(next(request_iterator, None), context)
+        if rejection:
+            return rejection
+
+        update = upload.update
+        with TRACER.rpc_span('SendModelUpdateStream', context, update.round_number, update.worker_id,
+                             bytes=upload.total_size):
+            try:
+                for chunk in itertools.chain([upload.first], request_iterator):
+                    upload.feed(chunk)
+                return upload.finish(context)
+            except Exception as e:
+                return self.stream_failed(update, e, context)
+            finally:
+                upload.close()
+
+    def open_update_stream(self, first, context):
+        """
+        Checks the first chunk of a streamed upload (metadata only, nothing is allocated).
+        Returns (StreamedUpload, None), or (None, Acknowledgement) on rejection.
+        """
+        if first is None or not first.HasField('header'):
+            return None, self._reject(context, grpc.StatusCode.INVALID_ARGUMENT,
+                                      "First chunk must carry the ModelUpdate header.", "Missing header.")
+        update = first.header
+        print(f"🔒 ZTNA Verified: Receiving streamed update from {update.worker_id}")
+
+        # Unknown encodings get the largest cap, so they are rejected for the encoding, not the size
+        max_size = self.max_stream_bytes.get(update.encoding, max(self.max_stream_bytes.values()))
+        rejection = self._validate_update(update, first.total_size, max_size, context)
+        if rejection:
+            return None, rejection
+        return StreamedUpload(self, first), None
+
+    def stream_failed(self, update, error, context):
+        """Acknowledgement for a streamed upload that raised while it was received or folded."""
+        if isinstance(error, InvalidUpdate):
+            return self._reject_invalid(update, error, context)
+        if isinstance(error, StagingBusy):
+            return self._reject_busy(update, error, context)
+        UPDATES.labels('error').inc()
+        print(f"❌ Error unpacking streamed weights: {error}")
+        context.set_code(grpc.StatusCode.INTERNAL)
+        return pb2.Acknowledgement(success=False, message=str(error))
+
+    def GetGlobalModel(self, request, context, prepared=None):
         """Worker calls this to download the current model"""
-        # FIX: Use 'self.current_round', not 'global_state'
-        print(f"⚡ [Server] Sending Global Model (Round {self.current_round})")
-        
-        # Serialize model to bytes
-        buffer = io.BytesIO()
-        torch.save(self.global_model.state_dict(), buffer)
-        model_bytes = buffer.getvalue()
+        # Read the snapshot reference once: a round closing mid-call swaps in a new one
+        snapshot, diff = prepared or self.prepare_download(request)
 
-        # FIX: Matches "message ModelWeights" in your .proto file
-        return pb2.ModelWeights(
-            round_number=self.current_round,
-            weights_data=model_bytes  # FIX: Matches "bytes weights_data = 2"
+        with TRACER.rpc_span('GetGlobalModel', context, snapshot.round_number, request.worker_id):
+            if not self.coordinator.select(request.worker_id):
+                # Over-selection cap reached: tell the worker to sit this round out
+                return self._round_full(snapshot)
+
+            if is_current(snapshot, request.round_number, request.model_hash):
+                # Worker already holds this round: skip the download entirely
+                MODEL_DOWNLOADS.labels('not_modified').inc()
+                return pb2.ModelWeights(
+                    round_number=snapshot.round_number,
+                    model_hash=snapshot.model_hash,
+                    not_modified=True,
+                    supported_encodings=SUPPORTED_ENCODINGS,
+                    round_deadline_ms=self.coordinator.status()['deadline_ms']
+                )
+
+            payload, delta_base_hash = self._download_payload(request, snapshot, diff)
+            # FIX: Use 'self.current_round', not 'global_state'
+            print(f"⚡ [Server] Sending Global Model (Round {snapshot.round_number}"
+                  f"{', diff ' if delta_base_hash else ', '}{len(payload) / 1024:.1f} KB)")
+            RPC_BYTES_SENT.labels('GetGlobalModel').inc(len(payload))
+
+            # FIX: Matches "message ModelWeights" in your .proto file
+            return pb2.ModelWeights(
+                round_number=snapshot.round_number,
+                weights_data=payload,  # FIX: Matches "bytes weights_data = 2"
+                model_hash=snapshot.model_hash,
+                layer_hashes=snapshot.layer_hashes,
+                supported_encodings=SUPPORTED_ENCODINGS,
+                round_deadline_ms=self.coordinator.status()['deadline_ms'],
+                delta_base_hash=delta_base_hash
+            )
+    
+    def GetGlobalModelStream(self, request, context, prepared=None):
+        """Chunked download of the cached snapshot; slices are cut from the blob on the fly."""
+        snapshot, diff = prepared or self.prepare_download(request)
+        if not self.coordinator.select(request.worker_id):
+            yield from iter_weights_chunks(self._round_full(snapshot), b'')
+            return
+
+        not_modified = is_current(snapshot, request.round_number, request.model_hash)
+        payload, delta_base_hash = b'', ""
+        if not_modified:
+            MODEL_DOWNLOADS.labels('not_modified').inc()
+        else:
+            payload, delta_base_hash = self._download_payload(request, snapshot, diff)
+            print(f"⚡ [Server] Streaming Global Model (Round {snapshot.round_number}"
+                  f"{', diff ' if delta_base_hash else ', '}{len(payload) / 1024:.1f} KB)")
+            RPC_BYTES_SENT.labels('GetGlobalModelStream').inc(len(payload))
+        header = pb2.ModelWeights(
+            round_number=snapshot.round_number,
+            model_hash=snapshot.model_hash,
+            not_modified=not_modified,
+            supported_encodings=SUPPORTED_ENCODINGS,
+            round_deadline_ms=self.coordinator.status()['deadline_ms'],
+            layer_hashes={} if not_modified else snapshot.layer_hashes,
+            delta_base_hash=delta_base_hash
         )
+        with TRACER.rpc_span('GetGlobalModelStream', context, snapshot.round_number, request.worker_id,
+                             not_modified=not_modified, delta=bool(delta_base_hash)):
+            yield from iter_weights_chunks(header, payload)
+
+    def prepare_download(self, request):
+        """
+        Reads the snapshot a download will serve and the diff against the worker's model, if
+        it gets one (computed by the first request for the pair, cached for the rest).
+        May block on that computation, so an event loop runs it in an executor.
+        Returns (snapshot, diff or None).
+        """
+        snapshot = self.model_snapshot
+        diff = None
+        if (request.accept_delta and request.model_hash and self.delta_sync is not None
+                and not is_current(snapshot, request.round_number, request.model_hash)):
+            diff = self.delta_sync.diff(request.model_hash, snapshot)
+        return snapshot, diff
+
+    def _download_payload(self, request, snapshot, diff):
+        """
+        What a worker that needs this snapshot gets: the prepared diff against the model it
+        holds, otherwise the full weights. Returns (payload, delta_base_hash).
+        """
+        if diff is not None:
+            MODEL_DOWNLOADS.labels('delta').inc()
+            return diff, request.model_hash
+        MODEL_DOWNLOADS.labels('full').inc()
+        return snapshot.weights_data, ""
     
+    def _round_full(self, snapshot):
+        print(f"🚦 Round {snapshot.round_number} is full, worker asked to wait")
+        return pb2.ModelWeights(
+            round_number=snapshot.round_number,
+            model_hash=snapshot.model_hash,
+            round_full=True,
+            supported_encodings=SUPPORTED_ENCODINGS,
+            round_deadline_ms=self.coordinator.status()['deadline_ms']
+        )
+
+    def WaitForNextRound(self, request, context):
+        """Long-poll instead of a fixed sleep: returns the moment a newer round opens."""
+        timeout = min(request.timeout_ms / 1000.0 if request.timeout_ms else LONG_POLL_MAX_S, LONG_POLL_MAX_S)
+        return self.round_status(self.coordinator.wait_for_round(request.after_round, timeout, MAX_PARKED_POLLS))
+
+    def round_status(self, status):
+        """RoundStatus from a coordinator status dict, plus how far the DLT has caught up."""
+        anchored = self.committer.last_anchored_round
+        return pb2.RoundStatus(**status, anchored_round=-1 if anchored is None else anchored)
+
+    def GetUpdateProof(self, request, context):
+        """O(log n) Merkle proof that a worker's update was aggregated into a round."""
+        found = self.update_audit.proof(request.round_number, request.worker_id, request.update_sha256)
+        if found is None:
+            context.set_code(grpc.StatusCode.NOT_FOUND)
+            context.set_details(f"No sealed update from {request.worker_id} in round {request.round_number}.")
+            return pb2.UpdateProof()
+
+        record, position, num_leaves, path, root = found
+        anchors = [block for block in self.dlt.blocks_by_round(request.round_number)
+                   if block.get('updates_root') == root]
+        return pb2.UpdateProof(
+            leaf=record,
+            leaf_index=position,
+            num_leaves=num_leaves,
+            path=[pb2.ProofStep(sibling=sibling, sibling_on_left=on_left) for sibling, on_left in path],
+            root=root,
+            block_index=anchors[-1]['index'] if anchors else 0
+        )
+
+    def dashboard_state(self):
+        """Everything the dashboard shows, as pushed on /api/stream. Built on the feed's thread."""
+        status = self.coordinator.status()
+        selected, contributed = self.coordinator.participants()
+        current_round = status['round_number']
+
+        workers = []
+        for worker_id in sorted(set(self.worker_activity) | selected):
+            samples, last_round, last_seen = self.worker_activity.get(worker_id, (0, current_round, None))
+            if worker_id in selected and worker_id not in contributed:
+                worker_status = "training"
+            elif current_round - last_round >= WORKER_OFFLINE_ROUNDS:
+                worker_status = "offline"
+            else:
+                worker_status = "idle"
+            workers.append({
+                "id": worker_id,
+                "status": worker_status,
+                "dataset": "local",
+                "samples": samples,
+                "progress": 100 if worker_id in contributed else 0,
+                "lastUpdate": time.ctime(last_seen).split()[3] if last_seen else "-",
+            })
+
+        latest = self.dlt.get_last_block()
+        recent, _ = self.dlt.recent_blocks(DASHBOARD_RECENT_BLOCKS)
+        active = sum(worker["status"] != "offline" for worker in workers)
+        return {
+            "overview": {
+                "metrics": [
+                    {"label": "Active Edge Workers", "value": f"{active}/{len(workers)}", "color": "text-green-500"},
+                    {"label": "FL Rounds Completed", "value": str(self.current_round), "color": "text-blue-500"},
+                    {"label": "Models Verified", "value": str(len(self.dlt.chain)), "color": "text-purple-500"},
+                    {"label": "Rounds Pending Anchor", "value": str(self.committer.pending()), "color": "text-yellow-500"},
+                    {"label": "Trust Score", "value": "100%", "color": "text-emerald-500"},
+                ],
+                "services": [
+                     {"name": "API Gateway", "status": "running", "uptime": 100},
+                     {"name": "Parameter Server", "status": "running", "uptime": 99.9},
+                     {"name": "HashiCorp Vault", "status": "running", "uptime": 100},
+                     {"name": "Blockchain Ledger", "status": "running", "uptime": 100},
+                ]
+            },
+            "workers": workers,
+            "blockchain": {
+                "latest_block": {
+                    "index": latest['index'],
+                    "model_hash": latest['model_hash'],
+                    "timestamp": latest['timestamp'],
+                },
+                "recent": [format_block(block) for block in recent],
+                "total": len(self.dlt.chain),
+                "anchored_round": self.committer.last_anchored_round,
+            },
+            "timings": self.phase_timings,
+            "ml": {
+                "round": current_round,
+                "updates_received": status['updates_received'],
+                "target_updates": status['target_updates'],
+                "deadline_ms": status['deadline_ms'],
+            },
+        }
+
+    def _round_watchdog(self):
+        """Closes (or extends) rounds whose deadline passes between updates."""
+        while True:
+            self.coordinator.wait_for_deadline(timeout=1.0)
+            if not self.coordinator.deadline_passed():
+                continue
+            with self.round_gate.exclusive():
+                if not self.coordinator.deadline_passed():
+                    continue
+                if self.coordinator.ready_to_close():
+                    print(f"⏰ Round {self.current_round}: deadline reached with {self.accumulator.count} updates, closing.")
+                    self.aggregate_weights()
+                else:
+                    self.coordinator.extend_deadline()
+
+    def _close_round(self, admitted_round):
+        with self.round_gate.exclusive():
+            # Another handler or the watchdog may have closed this round while we waited
+            if self.current_round == admitted_round and self.coordinator.ready_to_close():
+                self.aggregate_weights()
+
     def aggregate_weights(self):
         """
         1. Performs FedAvg math.
-        2. Generates a SHA-256 hash of the result.
-        3. Anchors the hash to the DLT (Blockchain).
+        2. Hashes the resulting tensors (canonical, no serialize-then-hash).
+        3. Hands the hash to the background committer for anchoring on the DLT (Blockchain).
+        Must run inside round_gate.exclusive(), so no update is being folded meanwhile.
+        The next round opens without waiting for the ledger; see AnchorCommitter.
         """
         # --- PHASE 1: Mathematical Averaging ---
-        with torch.no_grad():
-            global_dict = self.global_model.state_dict()
+        # The weighted sum was accumulated on arrival; only the division is left
+        started = time.perf_counter()
+        with TRACER.span('aggregate', self.current_round, strategy=AGGREGATOR):
+            self.accumulator.finalize(self.global_model)
+        aggregated = time.perf_counter()
             
-            for key in global_dict.keys():
-                # FIX 1: We must access ['model'] because 'm' is now a dictionary
-                all_layers = [m['model'].state_dict()[key].float() for m in self.received_updates]
-                global_dict[key].copy_(torch.stack(all_layers).mean(0))
-            
-        print(f"✅ Round {self.current_round}: New Global Model created.")
+        print(f"✅ Round {self.current_round}: New Global Model created ({AGGREGATOR}).")
+
+        if self.round_bytes_raw:
+            saved = 100.0 * (1 - self.round_bytes_in / self.round_bytes_raw)
+            print(f"📉 Round {self.current_round} uploads: {self.round_bytes_in / 1024:.1f} KB received "
+                  f"vs {self.round_bytes_raw / 1024:.1f} KB uncompressed ({saved:.1f}% saved)")
 
         # --- PHASE 2: Generate Digital Fingerprint (ZTNA Integrity) ---
-        model_bytes = get_weights_as_bytes(self.global_model)
-        model_hash = generate_model_hash(model_bytes)
+        # The same blob + hash is served to every worker for the next round
+        with TRACER.span('hash', self.current_round):
+            snapshot = build_snapshot(self.global_model, self.current_round + 1)
+        model_hash = snapshot.model_hash
+        fingerprinted = time.perf_counter()
 
         # --- PHASE 3: Anchor to DLT (Immutable Audit Trail) ---
-        print(f"🔗 [DLT] Anchoring Model Hash to Blockchain: {model_hash[:16]}...")
+        # One block per round: the model hash plus the Merkle root of every update that went into it
+        updates_root, num_updates = self.update_audit.seal(self.current_round)
+        print(f"🔗 [DLT] Anchoring Model Hash to Blockchain: {model_hash[:16]}... "
+              f"(+ Merkle root of {num_updates} updates: {updates_root[:16]}...)")
         
-        self.dlt.add_model_update(
-            round_num=self.current_round, 
-            model_hash=model_hash
-        )
+        # Only blocks here if ANCHOR_MAX_PENDING rounds are already waiting (back-pressure)
+        with TRACER.span('anchor_submit', self.current_round):
+            self.committer.submit(
+                round_num=self.current_round, 
+                model_hash=model_hash,
+                updates_root=updates_root,
+                num_updates=num_updates,
+                weights_data=snapshot.weights_data
+            )
+        submitted = time.perf_counter()
+        AGGREGATE_SECONDS.observe(aggregated - started)
+        HASH_SECONDS.observe(fingerprinted - aggregated)
+        ROUND_SECONDS.observe(time.time() - self.round_started)
+        ROUNDS.inc()
+        self.phase_timings = {
+            "round": self.current_round,
+            "round_ms": round((time.time() - self.round_started) * 1000, 1),
+            "aggregate_ms": round((aggregated - started) * 1000, 2),
+            "fingerprint_ms": round((fingerprinted - aggregated) * 1000, 2),
+            "anchor_submit_ms": round((submitted - fingerprinted) * 1000, 2),
+        }
 
         # --- PHASE 4: Finalize Round ---
         self.current_round += 1
+        self.model_snapshot = snapshot
+        if self.delta_sync is not None:
+            self.delta_sync.add_base(snapshot)
         
         # FIX 2: CRITICAL! Clear the buffer so we don't re-use old updates next round
-        self.received_updates = []
+        self.accumulator.reset()
+        self.round_bytes_in = 0
+        self.round_bytes_raw = 0
 
-def serve():
+        # --- PHASE 5: Open the next round (wakes long-polling workers) ---
+        self.round_started = time.time()
+        self.coordinator.open_round(self.current_round)
+
+def build_sync_server(servicer, options=None, max_workers=GRPC_THREADS):
+    """Creates (but does not start) the thread-pool gRPC server around a servicer."""
+    server = grpc.server(
+        futures.ThreadPoolExecutor(max_workers=max_workers),
+        options=options
+    )
+    # Register the SAME servicer instance we created above
+    pb2_grpc.add_FederatedLearningServicer_to_server(servicer, server)
+    return server
+
+def serve(use_aio=False, rollback_round=None):
     global global_servicer # We need to update the global variable
 
     print("🔧 Initializing Federated Learning Logic...")
     # 1. Instantiate the Servicer Logic FIRST
     # We do this before creating the server so we can link it to Flask
-    servicer = FederatedLearningServicer() 
+    servicer = FederatedLearningServicer(rollback_round) 
     global_servicer = servicer # <--- LINKAGE HAPPENS HERE
 
-    # 2. Start Flask in a Background Thread
-    def run_flask():
-        # Port 5000 for REST API
-        app.run(host='0.0.0.0', port=5000, use_reloader=False) 
-    
-    dashboard_thread = threading.Thread(target=run_flask)
-    dashboard_thread.daemon = True # Ensures thread dies when main program exits
-    dashboard_thread.start()
-    print("🌍 Dashboard REST API live on port 5000")
+    if METRICS_PORT:
+        start_metrics_server(METRICS_PORT)
+    if TRACE_DIR:
+        TRACER.enable(TRACE_DIR, 'parameter-server')
+
+    # 2. Start the Dashboard REST API (port 5000)
+    dashboard_process = None
+    if DASHBOARD_MODE == 'process':
+        # Own interpreter: HTTP traffic never takes the GIL from the gRPC handlers
+        dashboard_process = subprocess.Popen([
+            sys.executable, os.path.join(current_dir, 'dashboard_api.py'),
+            '--port', '5000', '--snapshot', servicer.snapshot_path, '--ledger', servicer.dlt.filename
+        ])
+    elif DASHBOARD_MODE == 'thread':
+        def run_flask():
+            app.run(host='0.0.0.0', port=5000, use_reloader=False) 
+        
+        dashboard_thread = threading.Thread(target=run_flask)
+        dashboard_thread.daemon = True # Ensures thread dies when main program exits
+        dashboard_thread.start()
+        print("🌍 Dashboard REST API live on port 5000")
 
     # 3. Load Certificates (Your Original Code)
     with open('../certs/server-key.pem', 'rb') as f: s_key = f.read()
@@ -173,68 +881,34 @@ def serve():
     ]
 
     # 5. Start gRPC Server
-    server = grpc.server(
-        futures.ThreadPoolExecutor(max_workers=10),
-        options=options
-    )
-    
-    # Register the SAME servicer instance we created above
-    pb2_grpc.add_FederatedLearningServicer_to_server(servicer, server)
-    
-    server.add_secure_port('[::]:50051', creds)
-    
-    print("🚀 SCTL Parameter Server live on port 50051 (mTLS + Data Handling Enabled)")
-    server.start()
-    server.wait_for_termination()
+    try:
+        if use_aio:
+            # Event-loop server: connections are cheap, CPU work goes to an executor
+            asyncio.run(serve_aio(servicer, '[::]:50051', creds, options))
+            return
 
-# --- DASHBOARD API LAYER ---
-app = Flask(__name__)
-CORS(app) # Allow the frontend to connect
+        server = build_sync_server(servicer, options)
+        server.add_secure_port('[::]:50051', creds)
+        
+        print("🚀 SCTL Parameter Server live on port 50051 (mTLS + Data Handling Enabled)")
+        server.start()
+        server.wait_for_termination()
+    finally:
+        # Rounds that already closed must still reach the ledger
+        servicer.committer.close()
+        if dashboard_process is not None:
+            dashboard_process.terminate()
 
+# --- DASHBOARD API LAYER ---
+# In-process Flask app (SCTL_DASHBOARD=thread); the routes live in dashboard_api.py
 # We need a reference to the running servicer to read its state
 global_servicer = None
-
-@app.route('/api/system-overview', methods=['GET'])
-def get_system_overview():
-    """Feeds the 'SystemOverview' and 'SecurityMonitor' components"""
-    if not global_servicer: return jsonify({"status": "Initializing..."})
-    
-    return jsonify({
-        "metrics": [                              #{len(global_servicer.received_updates)}
-            {"label": "Active Edge Workers", "value": "1/5", "color": "text-green-500"},
-            {"label": "FL Rounds Completed", "value": str(global_servicer.current_round), "color": "text-blue-500"},
-            {"label": "Models Verified", "value": str(len(global_servicer.dlt.chain)), "color": "text-purple-500"},
-            {"label": "Trust Score", "value": "100%", "color": "text-emerald-500"},
-        ],
-        "services": [
-             {"name": "API Gateway", "status": "running", "uptime": 100},
-             {"name": "Parameter Server", "status": "running", "uptime": 99.9},
-             {"name": "HashiCorp Vault", "status": "running", "uptime": 100},
-             {"name": "Blockchain Ledger", "status": "running", "uptime": 100},
-        ]
-    })
-
-@app.route('/api/blockchain', methods=['GET'])
-def get_blockchain_data():
-    """Feeds the 'BlockchainTrust' component"""
-    if not global_servicer: return jsonify([])
-
-    # Convert our internal Python DLT chain to the React format
-    formatted_blocks = []
-    # We slice [-5:] to only show the 5 most recent blocks like the UI expects
-    for block in global_servicer.dlt.chain[-5:]:
-        formatted_blocks.append({
-            "block": block['index'],
-            "hash": f"{block['model_hash'][:10]}...", # Shorten hash for UI
-            "timestamp": time.ctime(block['timestamp']).split()[3], # Extract HH:MM:SS
-            "verified": True
-        })
-    
-    # Reverse so the newest is at the top
-    return jsonify(formatted_blocks[::-1])
-
-def run_flask():
-    app.run(host='0.0.0.0', port=5000)
+app = build_dashboard_app(lambda: global_servicer)
 
 if __name__ == '__main__':
-    serve()  
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="SCTL Parameter Server")
+    parser.add_argument('--aio', action='store_true', help="Serve gRPC with grpc.aio instead of a thread pool")
+    parser.add_argument('--rollback-to', type=int, metavar='ROUND',
+                        help="Resume from the checkpointed model of an earlier anchored round")
+    args = parser.parse_args()
+    serve(use_aio=args.aio, rollback_round=args.rollback_to)  
\ No newline at end of file
@@ -0,0 +1,134 @@
+import mmap
+import os
+import threading
+from collections import Counter, deque
+
+from dlt_network.append_log import AppendLog
+from shared.tensor_codec import decode_state_dict
+
+
+class CheckpointStore:
+    """
+    Content-addressed history of the global model: one file per distinct model, named
+    by the canonical model hash anchored on the ledger, holding the blob served to
+    workers (SCTL flat-tensor format). Rounds that produced the same weights share a
+    file, and a damaged file cannot pass as a checkpoint (its name is its hash).
+
+    - refs.jsonl records round -> model hash, so a round's model is one dict lookup away.
+    - Retention: the last keep_last rounds stay, plus every keep_every-th round
+      (0 = none); a file is deleted once no retained round refers to it.
+    - open() memory-maps a checkpoint and wraps its tensors in place: nothing is
+      unpickled or copied until the caller loads them into a model.
+    """
+    def __init__(self, directory="sctl_checkpoints", keep_last=10, keep_every=0):
+        self.directory = directory
+        self.keep_last = max(keep_last, 1)
+        self.keep_every = keep_every
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+
+        # round -> model hash, in the order rounds were checkpointed
+        self.rounds = {}
+        refs_filename = os.path.join(directory, 'refs.jsonl')
+        if os.path.exists(refs_filename):
+            for ref in AppendLog.load(refs_filename):
+                self.rounds[ref['round']] = ref['model_hash']
+        self.refs = AppendLog(refs_filename)
+
+        # model hash -> number of retained rounds pointing at it
+        self._retained = Counter()
+        self._window = deque()
+        for round_num, model_hash in self.rounds.items():
+            self._retain(round_num, model_hash, evict=False)
+
+    def path(self, model_hash):
+        return os.path.join(self.directory, f"{model_hash}.sctw")
+
+    def has(self, model_hash):
+        return os.path.exists(self.path(model_hash))
+
+    def model_hash(self, round_num):
+        """Hash of the model checkpointed for round_num, or None."""
+        return self.rounds.get(round_num)
+
+    def history(self):
+        """(round, model hash) of every checkpointed round, newest first (evicted ones included)."""
+        with self._lock:
+            return list(reversed(self.rounds.items()))
+
+    def put(self, round_num, model_hash, weights_data):
+        """
+        Durably stores a round's model (once per distinct hash) and records the round.
+        Safe to retry. Returns the checkpoint's path.
+        """
+        path = self.path(model_hash)
+        if not os.path.exists(path):
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(weights_data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            self._sync_directory()
+
+        with self._lock:
+            previous = self.rounds.get(round_num)
+            if previous == model_hash:
+                return path
+            if previous is not None:
+                # Round re-checkpointed (e.g. re-run after a rollback): its old model loses this reference
+                self._forget(round_num, previous)
+            self.rounds[round_num] = model_hash
+            seq = self.refs.write({'round': round_num, 'model_hash': model_hash})
+            self._retain(round_num, model_hash, evict=True)
+        self.refs.sync(seq)
+        return path
+
+    def _retain(self, round_num, model_hash, evict):
+        """Caller holds self._lock (or is __init__). Slides the keep_last window by one round."""
+        self._retained[model_hash] += 1
+        self._window.append((round_num, model_hash))
+        if len(self._window) <= self.keep_last:
+            return
+        old_round, old_hash = self._window.popleft()
+        if self.keep_every and old_round % self.keep_every == 0:
+            return    # Long-term history: kept for good
+        self._release(old_hash, evict)
+
+    def _forget(self, round_num, model_hash):
+        """Caller holds self._lock. Drops round_num's reference to model_hash, if it is still retained."""
+        if (round_num, model_hash) in self._window:
+            self._window.remove((round_num, model_hash))
+        elif not (self.keep_every and round_num % self.keep_every == 0):
+            return    # Already slid out of the window and released
+        self._release(model_hash, evict=True)
+
+    def _release(self, model_hash, evict):
+        self._retained[model_hash] -= 1
+        if self._retained[model_hash] <= 0:
+            del self._retained[model_hash]
+            if evict:
+                try:
+                    os.remove(self.path(model_hash))
+                except FileNotFoundError:
+                    pass
+
+    def _sync_directory(self):
+        # The rename itself must survive a crash, not just the file contents
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def open(self, model_hash):
+        """
+        Memory-maps a checkpoint. Returns (state_dict, blob): the tensors alias the read-only
+        mapping (copy them, e.g. with load_state_dict, before mutating). None if not stored.
+        """
+        try:
+            with open(self.path(model_hash), 'rb') as f:
+                blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None    # ValueError: empty file
+        return decode_state_dict(blob), blob
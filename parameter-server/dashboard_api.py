@@ -0,0 +1,238 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+from flask import Blueprint, Flask, Response, current_app, jsonify, request
+from flask_cors import CORS
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+project_root = os.path.abspath(os.path.join(current_dir, '..'))
+sys.path.append(project_root)
+
+from dashboard_feed import DashboardFeed
+from state_snapshot import SnapshotReader, default_snapshot_path
+from dlt_network.ledger_tail import LedgerTail
+
+# --- DASHBOARD API LAYER ---
+# The same routes run either inside the parameter server (source = the servicer) or in
+# separate API processes (source = SnapshotSource). A source only needs two attributes:
+# .dashboard (a DashboardFeed) and .dlt (anything with the LedgerView queries).
+api = Blueprint('api', __name__)
+
+# SSE comment line sent when nothing changed, so proxies keep idle streams open
+STREAM_KEEPALIVE_S = 15
+
+# Upper bound for any paginated ledger query
+MAX_PAGE_SIZE = 500
+
+# How often an API process checks the shared snapshot for a new version
+SNAPSHOT_POLL_S = float(os.environ.get('SCTL_SNAPSHOT_POLL_S', 0.2))
+
+
+def build_dashboard_app(get_source):
+    """Flask app serving the dashboard API from whatever get_source() returns (None while starting)."""
+    app = Flask(__name__)
+    CORS(app) # Allow the frontend to connect
+    app.config['SCTL_SOURCE'] = get_source
+    app.register_blueprint(api)
+    return app
+
+
+def _source():
+    return current_app.config['SCTL_SOURCE']()
+
+
+class SnapshotSource:
+    """
+    What a standalone API process serves from: the state snapshot the parameter server
+    publishes in shared memory, plus a read-only tail of its ledger log. Nothing here
+    talks to the training process, so HTTP load never contends with model ingestion.
+    """
+    def __init__(self, snapshot_path, ledger_filename, poll_s=SNAPSHOT_POLL_S):
+        self.reader = SnapshotReader(snapshot_path)
+        self.dlt = LedgerTail(ledger_filename)
+        self.dashboard = DashboardFeed(self._load_state, min_interval_s=0)
+        self.poll_s = poll_s
+        threading.Thread(target=self._poll, name="snapshot-poll", daemon=True).start()
+
+    def _load_state(self):
+        _, payload = self.reader.read()
+        return json.loads(payload) if payload else {}
+
+    def _poll(self):
+        seen = self.reader.sequence()
+        while True:
+            time.sleep(self.poll_s)
+            try:
+                sequence = self.reader.sequence()
+                if sequence != seen:
+                    seen = sequence
+                    # Blocks are appended before the snapshot that mentions them is published
+                    self.dlt.refresh()
+                    self.dashboard.touch()
+            except Exception as e:
+                print(f"⚠️ [Dashboard] Could not follow the parameter server state: {e}")
+
+
+def _conditional(etag, build, max_age=1):
+    """
+    ETag / If-None-Match: answers 304 without building the body when the client (or the
+    nginx cache in front of us) already holds this version; build() makes the full response.
+    """
+    if request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = build()
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    return response
+
+def _snapshot_response(section):
+    """Serves a section of the precomputed dashboard snapshot as-is (no JSON building)."""
+    source = _source()
+    cached = source.dashboard.get(section) if source else None
+    if cached is None:
+        return jsonify({"status": "Initializing..."})
+    body, etag = cached
+    return _conditional(etag, lambda: current_app.response_class(body, mimetype='application/json'))
+
+def _ledger_etag(ledger):
+    # The ledger only grows, so its length versions every query over it
+    return f"chain-{len(ledger.chain)}"
+
+@api.route('/api/stream', methods=['GET'])
+def stream_dashboard():
+    """
+    Server-sent events for useRealTimeData: the whole dashboard state, pushed once per
+    change. Every open tab receives the same pre-serialized snapshot.
+    """
+    source = _source()
+    if not source: return jsonify({"status": "Initializing..."}), 503
+    feed = source.dashboard
+
+    def events():
+        version = 0
+        while True:
+            version, body = feed.wait(version, STREAM_KEEPALIVE_S)
+            if body is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"id: {version}\ndata: {body}\n\n"
+
+    return Response(events(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',   # nginx: flush each event immediately
+    })
+
+@api.route('/api/system-overview', methods=['GET'])
+def get_system_overview():
+    """Feeds the 'SystemOverview' and 'SecurityMonitor' components"""
+    return _snapshot_response('overview')
+
+def _page_size(default=5):
+    return max(1, min(request.args.get('limit', default, type=int), MAX_PAGE_SIZE))
+
+def format_block(block):
+    """Compact block format used by the React dashboard"""
+    return {
+        "block": block['index'],
+        "hash": f"{block['model_hash'][:10]}...", # Shorten hash for UI
+        "timestamp": time.ctime(block['timestamp']).split()[3], # Extract HH:MM:SS
+        "verified": True
+    }
+
+@api.route('/api/blockchain', methods=['GET'])
+def get_blockchain_data():
+    """
+    Feeds the 'BlockchainTrust' component: newest-first pages of the ledger.
+    ?limit=N&offset=K skips the K newest blocks; ?cursor=<next_cursor> continues a
+    previous page and stays stable while new blocks are being appended.
+    """
+    source = _source()
+    if not source: return jsonify({"blocks": [], "total": 0, "next_cursor": None})
+    ledger = source.dlt
+
+    def build():
+        blocks, next_cursor = ledger.recent_blocks(
+            _page_size(),
+            before=request.args.get('cursor', type=int),
+            offset=max(request.args.get('offset', 0, type=int), 0)
+        )
+        return jsonify({
+            "blocks": [format_block(block) for block in blocks],
+            "total": len(ledger.chain),
+            "next_cursor": next_cursor
+        })
+    return _conditional(_ledger_etag(ledger), build)
+
+# --- LEDGER AUDIT QUERIES (full blocks, index lookups instead of chain scans) ---
+@api.route('/api/blockchain/block/<int:index>', methods=['GET'])
+def get_block(index):
+    source = _source()
+    if not source: return jsonify({"blocks": []})
+    block = source.dlt.get_block(index)
+    if block is None:
+        return _conditional(_ledger_etag(source.dlt), lambda: jsonify({"blocks": []}))
+    # An anchored block never changes: its own hash is a permanent ETag
+    return _conditional(block['hash'], lambda: jsonify({"blocks": [block]}), max_age=3600)
+
+@api.route('/api/blockchain/round/<int:round_num>', methods=['GET'])
+def get_blocks_by_round(round_num):
+    source = _source()
+    if not source: return jsonify({"blocks": []})
+    return _conditional(_ledger_etag(source.dlt), lambda: jsonify(
+        {"blocks": source.dlt.blocks_by_round(round_num)[:MAX_PAGE_SIZE]}))
+
+@api.route('/api/blockchain/hash/<model_hash>', methods=['GET'])
+def get_blocks_by_hash(model_hash):
+    source = _source()
+    if not source: return jsonify({"blocks": []})
+    return _conditional(_ledger_etag(source.dlt), lambda: jsonify(
+        {"blocks": source.dlt.blocks_by_hash(model_hash)[:MAX_PAGE_SIZE]}))
+
+@api.route('/api/blockchain/range', methods=['GET'])
+def get_blocks_in_range():
+    """Blocks anchored in [start, end) (UNIX seconds), oldest first, paginated with ?cursor="""
+    source = _source()
+    if not source: return jsonify({"blocks": [], "next_cursor": None})
+
+    start = request.args.get('start', 0.0, type=float)
+    end = request.args.get('end', float('inf'), type=float)
+    after = None
+    if request.args.get('cursor'):
+        try:
+            timestamp, index = request.args['cursor'].split(':')
+            after = (float(timestamp), int(index))
+        except ValueError:
+            return jsonify({"error": "Malformed cursor"}), 400
+
+    def build():
+        blocks, cursor = source.dlt.blocks_in_time_range(start, end, _page_size(100), after)
+        return jsonify({
+            "blocks": blocks,
+            "next_cursor": f"{cursor[0]!r}:{cursor[1]}" if cursor else None
+        })
+    return _conditional(_ledger_etag(source.dlt), build)
+
+
+def build_standalone_app(snapshot_path=None, ledger_filename="sctl_ledger.jsonl"):
+    """WSGI entry point for extra API processes, e.g. gunicorn -w 4 -k gthread 'dashboard_api:build_standalone_app()'."""
+    source = SnapshotSource(snapshot_path or os.environ.get('SCTL_SNAPSHOT_PATH') or default_snapshot_path(ledger_filename),
+                            ledger_filename)
+    return build_dashboard_app(lambda: source)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="SCTL dashboard API (reads the parameter server's shared snapshot)")
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--snapshot', default=None, help="Shared snapshot file (default: SCTL_SNAPSHOT_PATH, else derived from --ledger)")
+    parser.add_argument('--ledger', default="sctl_ledger.jsonl", help="Ledger log written by the parameter server")
+    args = parser.parse_args()
+
+    app = build_standalone_app(args.snapshot, args.ledger)
+    print(f"🌍 Dashboard REST API live on port {args.port} (out-of-process)")
+    app.run(host='0.0.0.0', port=args.port, threaded=True, use_reloader=False)
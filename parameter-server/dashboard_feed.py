@@ -0,0 +1,75 @@
+import hashlib
+import json
+import threading
+import time
+
+
+class DashboardFeed:
+    """
+    Precomputed dashboard state shared by every reader (SSE streams and REST GETs).
+
+    Servicer code only calls touch() when something changed; a background thread
+    rebuilds the state with build_state() at most once per min_interval_s and
+    serializes it once. Readers get the cached JSON, so dashboard load no longer
+    grows with the number of open browser tabs, and nothing is built on a gRPC thread.
+    """
+    def __init__(self, build_state, min_interval_s=0.5, on_publish=None):
+        self.build_state = build_state
+        self.min_interval_s = min_interval_s
+        # Called with the whole-state JSON after each rebuild (e.g. to share it with API processes)
+        self.on_publish = on_publish
+        self._cond = threading.Condition()
+        self._dirty = True
+        self.version = 0
+        # section name -> (JSON body, ETag); '' is the whole state as pushed on /api/stream
+        self._bodies = {}
+
+        threading.Thread(target=self._run, name="dashboard-feed", daemon=True).start()
+
+    def touch(self):
+        """Marks the state as changed. Cheap enough for any hot path."""
+        with self._cond:
+            self._dirty = True
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._dirty)
+                self._dirty = False
+            try:
+                self._publish(self.build_state())
+            except Exception as e:
+                print(f"⚠️ [Dashboard] Could not build state snapshot: {e}")
+            # Coalesce bursts (e.g. a whole round of uploads) into one rebuild
+            time.sleep(self.min_interval_s)
+
+    def _publish(self, state):
+        bodies = {'': self._encode(state)}
+        for name, section in state.items():
+            bodies[name] = self._encode(section)
+        with self._cond:
+            self.version += 1
+            self._bodies = bodies
+            self._cond.notify_all()
+        if self.on_publish is not None:
+            self.on_publish(bodies[''][0])
+
+    @staticmethod
+    def _encode(value):
+        body = json.dumps(value, separators=(',', ':'))
+        return body, hashlib.sha1(body.encode()).hexdigest()[:16]
+
+    def get(self, section=''):
+        """(JSON body, ETag) of a state section, or None before the first snapshot."""
+        return self._bodies.get(section)
+
+    def wait(self, after_version, timeout):
+        """
+        Blocks until a snapshot newer than after_version exists (or timeout).
+        Returns (version, whole-state JSON body or None on timeout).
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self.version > after_version and self._bodies, timeout):
+                return after_version, None
+            return self.version, self._bodies[''][0]
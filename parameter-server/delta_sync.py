@@ -0,0 +1,63 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from shared.model_diff import encode_model_diff
+from shared.tensor_codec import decode_state_dict
+
+
+class DeltaSyncCache:
+    """
+    The last few global models (bases) and the diffs from each of them to the model being served.
+
+    A worker that synced within the last max_bases rounds downloads a lossless diff
+    instead of the full weights; older bases fall back to a full download. Each
+    (base, target) diff is computed once, by the first worker asking for it: at the
+    start of a round the whole fleet asks for the same pair, the rest get the cached blob.
+    """
+    def __init__(self, max_bases=4, min_saving=0.1):
+        self.max_bases = max_bases
+        # Diffs that save less than this share of the full blob are not worth a decode step
+        self.min_saving = min_saving
+        self._lock = threading.Lock()
+        self._bases = OrderedDict()     # model hash -> served weights blob
+        self._diffs = OrderedDict()     # (base hash, target hash) -> diff blob, or None if not worth it
+
+    def add_base(self, snapshot):
+        """Remembers a served model so later diffs can be taken against it."""
+        with self._lock:
+            self._bases[snapshot.model_hash] = snapshot.weights_data
+            self._bases.move_to_end(snapshot.model_hash)
+            while len(self._bases) > self.max_bases:
+                self._bases.popitem(last=False)
+
+    def diff(self, base_hash, snapshot):
+        """Diff from the model base_hash to snapshot's model, or None (unknown base or no real saving)."""
+        key = (base_hash, snapshot.model_hash)
+        with self._lock:
+            future = self._diffs.get(key)
+            computing = future is None
+            if computing:
+                base_blob = self._bases.get(base_hash)
+                if base_blob is None:
+                    return None
+                # Later requests for this pair wait on the future instead of redoing the diff
+                future = self._diffs[key] = Future()
+                while len(self._diffs) > self.max_bases:
+                    self._diffs.popitem(last=False)
+            else:
+                self._diffs.move_to_end(key)
+
+        if computing:
+            # Outside the lock: other pairs, and lookups of finished diffs, are not held up
+            try:
+                diff = encode_model_diff(decode_state_dict(base_blob), decode_state_dict(snapshot.weights_data))
+                if diff is not None and len(diff) > (1 - self.min_saving) * len(snapshot.weights_data):
+                    diff = None
+                future.set_result(diff)
+            except BaseException as e:
+                future.set_exception(e)
+                with self._lock:
+                    if self._diffs.get(key) is future:
+                        del self._diffs[key]    # Let the next request try again
+        return future.result()
@@ -0,0 +1,29 @@
+from collections import namedtuple
+
+from shared.utils import get_weights_as_bytes
+from shared.model_hash import layer_digests, combine_digests
+
+# Immutable, per-round view of the global model as served to workers.
+# Built once when a round closes and swapped in with a single attribute assignment,
+# so GetGlobalModel never serializes or hashes on the request path.
+ModelSnapshot = namedtuple('ModelSnapshot', ['round_number', 'weights_data', 'model_hash', 'layer_hashes'])
+
+
+def build_snapshot(model, round_number):
+    """
+    Serializes and fingerprints the model exactly once for a given round.
+    The hash is taken over the tensors themselves, not over the serialized blob.
+    """
+    state_dict = model.state_dict()
+    layer_hashes = layer_digests(state_dict)
+    return ModelSnapshot(
+        round_number=round_number,
+        weights_data=get_weights_as_bytes(model),
+        model_hash=combine_digests(layer_hashes),
+        layer_hashes=layer_hashes,
+    )
+
+
+def is_current(snapshot, round_number, model_hash):
+    """True if a worker reporting (round_number, model_hash) already holds this snapshot."""
+    return bool(model_hash) and round_number == snapshot.round_number and model_hash == snapshot.model_hash
@@ -0,0 +1,164 @@
+import functools
+import threading
+
+import torch
+
+from aggregation import FedAvgAccumulator
+
+# --- BYZANTINE-ROBUST AGGREGATION ---
+# Every strategy takes the round's updates as ONE [workers x params] fp32 matrix
+# (full weights, deltas already rebased) plus a [workers] weight vector, and
+# returns the aggregated flat [params] vector. No per-layer Python loops.
+
+# Columns sorted per block by trimmed_mean
+_SORT_BLOCK = 4096
+
+
+def weighted_mean(updates, weights):
+    """Plain FedAvg over the matrix: sum(w_k * W_k) / sum(w_k)."""
+    return torch.mv(updates.t(), weights) / weights.sum()
+
+
+def trimmed_mean(updates, weights, trim_ratio=0.1):
+    """
+    Coordinate-wise trimmed mean: per parameter, drop the trim_ratio largest and
+    smallest values and average the rest (unweighted, as in Yin et al. 2018).
+    """
+    num_workers, num_params = updates.shape
+    trim = min(int(trim_ratio * num_workers), (num_workers - 1) // 2)
+    if trim == 0:
+        return updates.mean(dim=0)
+    # Sort a block of columns at a time: sort() materializes values AND int64 indices,
+    # which for the whole matrix would triple the round's peak memory
+    result = torch.empty(num_params, dtype=updates.dtype)
+    for start in range(0, num_params, _SORT_BLOCK):
+        ordered = torch.sort(updates[:, start:start + _SORT_BLOCK], dim=0).values
+        result[start:start + _SORT_BLOCK] = ordered[trim:num_workers - trim].mean(dim=0)
+    return result
+
+
+def coordinate_median(updates, weights):
+    """Coordinate-wise median (unweighted). With an even count, the lower median is used."""
+    return updates.median(dim=0).values
+
+
+def _krum_scores(updates, num_byzantine):
+    """Krum score per worker: sum of squared distances to its n - f - 2 nearest neighbours."""
+    num_workers = updates.shape[0]
+    squared_norms = (updates * updates).sum(dim=1)
+    # ||a - b||^2 = ||a||^2 + ||b||^2 - 2 a.b, one GEMM for all pairs
+    distances = squared_norms[:, None] + squared_norms[None, :] - 2.0 * (updates @ updates.t())
+    distances.clamp_(min=0.0).fill_diagonal_(float('inf'))
+    neighbours = min(max(num_workers - num_byzantine - 2, 1), num_workers - 1)
+    return distances.topk(neighbours, dim=1, largest=False).values.sum(dim=1)
+
+
+def krum(updates, weights, num_byzantine=1):
+    """Krum (Blanchard et al. 2017): the single update closest to its neighbours."""
+    if updates.shape[0] == 1:
+        return updates[0].clone()
+    return updates[_krum_scores(updates, num_byzantine).argmin()].clone()
+
+
+def multi_krum(updates, weights, num_byzantine=1):
+    """Multi-Krum: sample-weighted mean of the n - f updates with the best Krum scores."""
+    num_workers = updates.shape[0]
+    if num_workers == 1:
+        return updates[0].clone()
+    keep = max(num_workers - num_byzantine, 1)
+    chosen = _krum_scores(updates, num_byzantine).topk(keep, largest=False).indices
+    return weighted_mean(updates[chosen], weights[chosen])
+
+
+STRATEGIES = {
+    'fedavg': weighted_mean,
+    'trimmed_mean': trimmed_mean,
+    'median': coordinate_median,
+    'krum': krum,
+    'multi_krum': multi_krum,
+}
+
+
+class RobustAccumulator(FedAvgAccumulator):
+    """
+    Keeps every accepted update of the round as a row of one preallocated
+    [workers x params] matrix, so a robust strategy can be applied at finalize().
+    Same interface as FedAvgAccumulator (add_flat / staged streaming updates),
+    so the servicer does not care which one it holds.
+    """
+    def __init__(self, template_state_dict, strategy, capacity=8, max_pending=16):
+        super().__init__(template_state_dict, max_pending=max_pending)
+        self.strategy = strategy
+        self._rows_lock = threading.Lock()
+        self._rows = 0
+        self._matrix = torch.empty(capacity, self.num_params, dtype=torch.float32)
+        self._weights = torch.empty(capacity, dtype=torch.float32)
+        self._is_delta = torch.empty(capacity, dtype=torch.bool)
+
+    @property
+    def count(self):
+        with self._rows_lock:
+            return self._rows
+
+    def _grow(self):
+        # Doubling keeps the amortized cost per update O(params); rows are reused across rounds
+        capacity = self._matrix.shape[0] * 2
+        matrix = torch.empty(capacity, self.num_params, dtype=torch.float32)
+        matrix[:self._rows].copy_(self._matrix[:self._rows])
+        self._matrix = matrix
+        self._weights = torch.cat([self._weights, torch.empty_like(self._weights)])
+        self._is_delta = torch.cat([self._is_delta, torch.empty_like(self._is_delta)])
+
+    def add_flat(self, flat, num_samples, is_delta=False, weight_scale=1.0):
+        if flat.numel() != self.num_params:
+            raise ValueError(f"Flat update has {flat.numel()} values, expected {self.num_params}")
+        weight = self._weight(num_samples, weight_scale)
+        with self._rows_lock:
+            if self._rows == self._matrix.shape[0]:
+                self._grow()
+            self._matrix[self._rows].copy_(flat)
+            self._weights[self._rows] = weight
+            self._is_delta[self._rows] = is_delta
+            self._rows += 1
+
+    def finalize(self, model):
+        """Applies the strategy to the round's update matrix and writes the result into the model."""
+        rows = self._rows
+        if rows == 0:
+            raise RuntimeError("Cannot aggregate a round with no updates")
+        if not self._weights[:rows].sum().item() > 0.0:
+            raise RuntimeError("Cannot aggregate a round whose updates carry no weight")
+
+        global_dict = model.state_dict()
+        with torch.no_grad():
+            updates = self._matrix[:rows]
+            delta_rows = self._is_delta[:rows].nonzero().squeeze(1)
+            if delta_rows.numel():
+                # Deltas become full weights so every row is comparable
+                base = torch.cat([global_dict[key].reshape(-1).to(torch.float32) for key, *_ in self.layout])
+                updates.index_add_(0, delta_rows, base.expand(delta_rows.numel(), -1))
+
+            aggregate = self.strategy(updates, self._weights[:rows])
+            for key, shape, dtype, offset, numel in self.layout:
+                global_dict[key].copy_(aggregate[offset:offset + numel].view(shape).to(dtype))
+        return model
+
+    def reset(self):
+        with self._rows_lock:
+            self._rows = 0
+
+
+def build_accumulator(strategy, template_state_dict, trim_ratio=0.1, num_byzantine=1):
+    """Returns the accumulator for a deployment's configured aggregation strategy."""
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown aggregation strategy '{strategy}' (choose from {sorted(STRATEGIES)})")
+    if strategy == 'fedavg':
+        # Plain FedAvg needs no update matrix: keep the streaming running sum
+        return FedAvgAccumulator(template_state_dict)
+
+    options = {
+        'trimmed_mean': {'trim_ratio': trim_ratio},
+        'krum': {'num_byzantine': num_byzantine},
+        'multi_krum': {'num_byzantine': num_byzantine},
+    }.get(strategy, {})
+    return RobustAccumulator(template_state_dict, functools.partial(STRATEGIES[strategy], **options))
@@ -0,0 +1,212 @@
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bound for a single WaitForNextRound long-poll
+LONG_POLL_MAX_S = 60
+
+
+class UpdateRejected(Exception):
+    """Raised by RoundCoordinator.admit when an update must not count toward the round."""
+    def __init__(self, reason, stale=False):
+        super().__init__(reason)
+        self.stale = stale
+
+
+class RoundGate:
+    """
+    Shared/exclusive gate around a round.
+    Any number of handlers may fold updates concurrently (shared); closing the round
+    (exclusive) waits for in-flight folds to drain and holds new ones back meanwhile.
+    """
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._active = 0
+        self._closing = False
+
+    @contextmanager
+    def shared(self):
+        with self._cond:
+            self._cond.wait_for(lambda: not self._closing)
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                if self._active == 0:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def exclusive(self):
+        with self._cond:
+            # Only one closer at a time; later closers queue behind it
+            self._cond.wait_for(lambda: not self._closing)
+            self._closing = True
+            self._cond.wait_for(lambda: self._active == 0)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._closing = False
+                self._cond.notify_all()
+
+
+class RoundCoordinator:
+    """
+    Decides who trains in a round and when the round closes.
+
+    - Selection: up to ceil(target * (1 + over_selection)) workers get the model per round,
+      so stragglers do not hold the round hostage.
+    - Closing: as soon as `target` updates arrived, or at the deadline if at least `quorum` did.
+      A deadline missed without quorum reopens selection and extends the round.
+    - Staleness: updates for an older round are dropped, or down-weighted by
+      stale_discount ** staleness when stale_policy == 'downweight' (up to max_staleness).
+    """
+    def __init__(self, target=3, quorum=1, deadline_s=15.0, over_selection=0.3,
+                 stale_policy='drop', stale_discount=0.5, max_staleness=2):
+        if not 1 <= quorum <= target:
+            raise ValueError("Quorum must be between 1 and the target update count")
+        self.target = target
+        self.quorum = quorum
+        self.deadline_s = deadline_s
+        self.max_selected = math.ceil(target * (1 + over_selection))
+        self.stale_policy = stale_policy
+        self.stale_discount = stale_discount
+        self.max_staleness = max_staleness
+
+        # One condition guards all round state and wakes long-polling workers
+        self.cond = threading.Condition()
+        self.current_round = 0
+        self.selected = set()
+        self.contributors = set()
+        self.accepted = 0
+        self.deadline = time.time() + deadline_s
+        self.listeners = []
+        self.parked = 0     # threads currently blocked in wait_for_round
+
+    def add_listener(self, callback):
+        """Registers callback(round_number), invoked whenever a new round opens."""
+        self.listeners.append(callback)
+
+    def open_round(self, round_number):
+        """Starts a new round and wakes every worker waiting for it."""
+        with self.cond:
+            self.current_round = round_number
+            self.selected = set()
+            self.contributors = set()
+            self.accepted = 0
+            self.deadline = time.time() + self.deadline_s
+            self.cond.notify_all()
+        for callback in self.listeners:
+            callback(round_number)
+
+    def select(self, worker_id):
+        """Returns True if the worker may train in the current round."""
+        with self.cond:
+            if worker_id in self.selected:
+                return True
+            if len(self.selected) >= self.max_selected:
+                return False
+            self.selected.add(worker_id)
+            return True
+
+    def admit(self, worker_id, round_number):
+        """
+        Checks an incoming update against the round state.
+        Returns the weight multiplier to apply, or raises UpdateRejected.
+        """
+        with self.cond:
+            staleness = self.current_round - round_number
+            if staleness < 0:
+                raise UpdateRejected(f"Round {round_number} has not started yet (current: {self.current_round})")
+            if staleness > 0:
+                if self.stale_policy != 'downweight' or staleness > self.max_staleness:
+                    raise UpdateRejected(f"Stale update for round {round_number} (current: {self.current_round})", stale=True)
+                return self.stale_discount ** staleness
+
+            if worker_id in self.contributors:
+                raise UpdateRejected(f"{worker_id} already contributed to round {round_number}")
+            if worker_id not in self.selected and len(self.selected) >= self.max_selected:
+                raise UpdateRejected(f"{worker_id} was not selected for round {round_number}")
+            # Claimed at admission so two concurrent uploads from one worker cannot both count
+            self.selected.add(worker_id)
+            self.contributors.add(worker_id)
+            return 1.0
+
+    def release(self, worker_id):
+        """Undoes an admission whose update then failed to accumulate."""
+        with self.cond:
+            self.contributors.discard(worker_id)
+
+    def participants(self):
+        """(selected, contributed) worker ids of the current round."""
+        with self.cond:
+            return set(self.selected), set(self.contributors)
+
+    def record(self):
+        """Counts an admitted update as accumulated. Returns the round's update count."""
+        with self.cond:
+            self.accepted += 1
+            return self.accepted
+
+    def ready_to_close(self):
+        """True once the round has enough updates to aggregate."""
+        with self.cond:
+            if self.accepted >= self.target:
+                return True
+            return self.accepted >= self.quorum and time.time() >= self.deadline
+
+    def deadline_passed(self):
+        with self.cond:
+            return time.time() >= self.deadline
+
+    def extend_deadline(self):
+        """Deadline passed without quorum: let fresh workers in and give the round more time."""
+        with self.cond:
+            self.selected = set(self.contributors)
+            self.deadline = time.time() + self.deadline_s
+            print(f"⏰ Round {self.current_round}: quorum {self.quorum} not met by deadline, extending.")
+
+    def wait_for_deadline(self, timeout=None):
+        """Blocks until the current round's deadline (or the timeout) passes."""
+        with self.cond:
+            remaining = self.deadline - time.time()
+            if timeout is not None:
+                remaining = min(remaining, timeout)
+            if remaining > 0:
+                self.cond.wait(remaining)
+
+    def poll_timeout(self, timeout):
+        """How long a long-poll may wait: never past the current round's deadline (if still ahead)."""
+        with self.cond:
+            remaining = self.deadline - time.time()
+        return min(timeout, remaining) if remaining > 0 else timeout
+
+    def wait_for_round(self, after_round, timeout, max_parked=None):
+        """
+        Long-poll: blocks until a round newer than after_round opens, or the timeout expires.
+        A wait never outlasts the round's deadline, and with max_parked waiters already
+        blocked it returns the current status at once instead of holding another thread.
+        """
+        with self.cond:
+            if self.current_round > after_round or (max_parked is not None and self.parked >= max_parked):
+                return self.status()
+            timeout = self.poll_timeout(timeout)
+            self.parked += 1
+            try:
+                self.cond.wait_for(lambda: self.current_round > after_round, timeout)
+            finally:
+                self.parked -= 1
+            return self.status()
+
+    def status(self):
+        with self.cond:
+            return {
+                'round_number': self.current_round,
+                'deadline_ms': int(self.deadline * 1000),
+                'updates_received': self.accepted,
+                'target_updates': self.target,
+                'quorum': self.quorum,
+            }
@@ -0,0 +1,34 @@
+from shared.metrics import Counter, Gauge, Histogram, SIZE_BUCKETS
+
+# --- PARAMETER SERVER METRICS ---
+# Where round time goes: one histogram per phase of an update's and a round's life.
+# Served on GET /metrics (SCTL_METRICS_PORT) by app.serve().
+
+DECODE_SECONDS = Histogram(
+    'sctl_update_decode_seconds', "Decoding an upload into a flat fp32 update (incl. validation in the ingest pool)")
+VALIDATE_SECONDS = Histogram(
+    'sctl_update_validate_seconds', "NaN/Inf and norm checks on a decoded update (in-process decoding only)")
+ACCUMULATE_SECONDS = Histogram(
+    'sctl_update_accumulate_seconds', "Folding an admitted update into the round's accumulator")
+AGGREGATE_SECONDS = Histogram(
+    'sctl_round_aggregate_seconds', "Finalizing the round's aggregate into the global model")
+HASH_SECONDS = Histogram(
+    'sctl_round_hash_seconds', "Serializing and fingerprinting the new global model")
+LEDGER_APPEND_SECONDS = Histogram(
+    'sctl_ledger_append_seconds', "Persisting a round's Merkle leaves and ledger block (incl. fsync)")
+ROUND_SECONDS = Histogram(
+    'sctl_round_duration_seconds', "Wall-clock time from a round opening to it closing",
+    buckets=(1, 2.5, 5, 10, 15, 30, 60, 120, 300, 600))
+
+RPC_BYTES_RECEIVED = Counter('sctl_rpc_received_bytes_total', "Payload bytes received per RPC", ['rpc'])
+RPC_BYTES_SENT = Counter('sctl_rpc_sent_bytes_total', "Payload bytes sent per RPC", ['rpc'])
+MODEL_DOWNLOADS = Counter('sctl_model_downloads_total', "Global model downloads by kind (full, delta, not_modified)", ['kind'])
+UPDATE_BYTES = Histogram('sctl_update_size_bytes', "Size of uploaded update payloads", buckets=SIZE_BUCKETS)
+
+UPDATES = Counter('sctl_updates_total', "Uploaded updates by outcome", ['result'])
+ROUNDS = Counter('sctl_rounds_total', "Rounds aggregated")
+ANCHOR_RETRIES = Counter('sctl_anchor_retries_total', "Failed ledger anchoring attempts that were retried")
+
+ANCHOR_QUEUE_DEPTH = Gauge('sctl_anchor_queue_depth', "Closed rounds waiting to be anchored on the ledger")
+ROUND_BUFFERED_UPDATES = Gauge('sctl_round_buffered_updates', "Updates accumulated in the open round")
+INGEST_SLOTS_FREE = Gauge('sctl_ingest_free_slots', "Idle shared-memory slots of the ingest process pool")
@@ -0,0 +1,100 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import time
+
+# --- SHARED DASHBOARD SNAPSHOT (mmap'd file) ---
+# [ SEQ (u64 LE) | LENGTH (u32 LE) | JSON PAYLOAD ... ]
+# Single writer, any number of reader processes, no locks: SEQ is a seqlock counter.
+# The writer makes it odd before touching the payload and even again afterwards,
+# so a reader that sees the same even SEQ before and after copying got a clean snapshot.
+_SEQ = struct.Struct('<Q')
+_LENGTH = struct.Struct('<I')
+_HEADER_SIZE = _SEQ.size + _LENGTH.size
+
+DEFAULT_CAPACITY = 4 * 1024 * 1024
+
+
+def default_snapshot_path(ledger_filename="sctl_ledger.jsonl"):
+    """
+    Segment of the server writing ledger_filename: named after the ledger's absolute path, so
+    servers on one host never share a segment while a server and its API processes (given the
+    same ledger) always do. Prefers tmpfs, so publishing a snapshot never touches a disk.
+    """
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir()
+    deployment = hashlib.sha1(os.path.abspath(ledger_filename).encode()).hexdigest()[:12]
+    return os.path.join(base, f'sctl_dashboard_state-{deployment}')
+
+
+class SnapshotWriter:
+    """The parameter server's side: overwrites the snapshot in place."""
+    def __init__(self, path, capacity=DEFAULT_CAPACITY):
+        self.path = path
+        self.capacity = capacity
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            os.ftruncate(fd, _HEADER_SIZE + capacity)
+            self._map = mmap.mmap(fd, _HEADER_SIZE + capacity)
+        finally:
+            os.close(fd)
+        # Continue the counter across restarts so readers never see it go backwards
+        previous = _SEQ.unpack_from(self._map, 0)[0]
+        self._seq = (previous + 1) & ~1
+        if previous % 2:
+            # A writer died mid-update: that payload is torn, show nothing until we publish
+            _SEQ.pack_into(self._map, 0, 0)
+
+    def write(self, payload):
+        """Publishes `payload` (bytes). Returns False if it does not fit."""
+        if len(payload) > self.capacity:
+            print(f"⚠️ [Dashboard] Snapshot of {len(payload)} bytes exceeds the {self.capacity} byte segment")
+            return False
+        _SEQ.pack_into(self._map, 0, self._seq + 1)
+        self._map[_HEADER_SIZE:_HEADER_SIZE + len(payload)] = payload
+        _LENGTH.pack_into(self._map, _SEQ.size, len(payload))
+        self._seq += 2
+        _SEQ.pack_into(self._map, 0, self._seq)
+        return True
+
+    def close(self):
+        self._map.close()
+
+
+class SnapshotReader:
+    """An API process's side: maps the segment read-only once it exists."""
+    def __init__(self, path):
+        self.path = path
+        self._map = None
+
+    def _mapped(self):
+        if self._map is None:
+            try:
+                with open(self.path, 'rb') as f:
+                    self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (FileNotFoundError, ValueError):
+                return None    # Writer not started yet (or the file is still empty)
+        return self._map
+
+    def sequence(self):
+        """Current version counter: cheap enough to poll for changes."""
+        view = self._mapped()
+        return _SEQ.unpack_from(view, 0)[0] if view is not None else 0
+
+    def read(self, retries=1000):
+        """Returns (sequence, payload bytes), or (0, None) if nothing was published yet."""
+        view = self._mapped()
+        if view is None:
+            return 0, None
+        for _ in range(retries):
+            before = _SEQ.unpack_from(view, 0)[0]
+            if before == 0:
+                return 0, None
+            if before % 2 == 0:
+                length = _LENGTH.unpack_from(view, _SEQ.size)[0]
+                payload = view[_HEADER_SIZE:_HEADER_SIZE + length]
+                if _SEQ.unpack_from(view, 0)[0] == before:
+                    return before, payload
+            time.sleep(0.0005)    # Writer mid-update: it finishes in microseconds
+        raise TimeoutError(f"Dashboard snapshot {self.path} kept changing while being read")
@@ -0,0 +1,87 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from dlt_network.append_log import AppendLog
+from shared.merkle import build_levels, leaf_hash, merkle_proof, merkle_root
+
+
+class UpdateAudit:
+    """
+    Collects one Merkle leaf per accepted update and seals one tree per round.
+    Only the root goes on the ledger; the leaves of every sealed round are kept in
+    their own append-only log, so inclusion proofs still work after a restart.
+    """
+    def __init__(self, filename="sctl_update_trees.jsonl", cached_trees=16):
+        self._lock = threading.Lock()
+        self._pending = []
+        # round -> leaf records (canonical JSON strings), for every sealed round
+        self.rounds = {}
+        if os.path.exists(filename):
+            for sealed in AppendLog.load(filename):
+                self.rounds[sealed['round']] = sealed['leaves']
+        self.log = AppendLog(filename)
+        # round -> log sequence number of its leaves, for rounds written this session
+        self._written = {}
+
+        # Recently used trees: round -> (levels, {worker_id: [leaf positions]})
+        self.cached_trees = cached_trees
+        self._trees = OrderedDict()
+
+    def add(self, record):
+        """Records an accepted update for the round currently being collected."""
+        with self._lock:
+            self._pending.append(record)
+
+    def seal(self, round_number):
+        """
+        Closes the round's tree in memory. Returns (root, number of leaves).
+        Must run while no update is being folded (inside round_gate.exclusive()).
+        """
+        with self._lock:
+            leaves, self._pending = self._pending, []
+            self.rounds[round_number] = leaves
+            levels, _ = self._tree(round_number)
+        return merkle_root(levels), len(leaves)
+
+    def persist(self, round_number):
+        """Makes a sealed round's leaves durable. Safe to retry: the record is written once."""
+        seq = self._written.get(round_number)
+        if seq is None:
+            seq = self._written[round_number] = self.log.write(
+                {'round': round_number, 'leaves': self.rounds[round_number]}
+            )
+        self.log.sync(seq)
+
+    def _tree(self, round_number):
+        tree = self._trees.get(round_number)
+        if tree is None:
+            leaves = self.rounds[round_number]
+            positions = {}
+            for position, record in enumerate(leaves):
+                positions.setdefault(json.loads(record)['worker_id'], []).append(position)
+            tree = (build_levels([leaf_hash(record) for record in leaves]), positions)
+            self._trees[round_number] = tree
+            if len(self._trees) > self.cached_trees:
+                self._trees.popitem(last=False)
+        else:
+            self._trees.move_to_end(round_number)
+        return tree
+
+    def proof(self, round_number, worker_id, update_sha256=""):
+        """
+        Inclusion proof for a worker's update in a sealed round (optionally the one whose
+        payload hashed to update_sha256). Returns (record, position, num_leaves, path, root) or None.
+        """
+        if round_number not in self.rounds:
+            return None
+        with self._lock:
+            levels, positions = self._tree(round_number)
+        leaves = self.rounds[round_number]
+        for position in positions.get(worker_id, []):
+            record = leaves[position]
+            if update_sha256 and json.loads(record)['sha256'] != update_sha256:
+                continue
+            return record, position, len(leaves), merkle_proof(levels, position), merkle_root(levels)
+        return None
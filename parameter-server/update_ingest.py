@@ -0,0 +1,322 @@
+import atexit
+import math
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+import torch
+
+import federated_service_pb2 as pb2
+from shared.utils import load_state_dict_from_bytes
+from shared.update_codec import decode_update, _SCALE, _IDX, _VAL
+from shared.tensor_codec import ALIGNMENT
+from aggregation import StagingBusy
+
+# Input segments grow in steps of this size, so slightly larger blobs do not reallocate
+_SEGMENT_STEP = 1024 * 1024
+
+# Streamed updates: room for the preamble + JSON header on top of the tensor data
+_HEADER_SLACK = 64 * 1024
+# Wire dtype of every tensor an encoding carries (see shared.update_codec)
+_WIRE_DTYPES = {pb2.ENCODING_RAW: 'float32', pb2.ENCODING_FP16: 'float16', pb2.ENCODING_INT8: 'int8'}
+_ITEMSIZE = {'float32': 4, 'float16': 2, 'int8': 1, 'int32': 4}
+
+
+class InvalidUpdate(ValueError):
+    """The blob decoded, but its contents are not acceptable (architecture, NaN/Inf, norm bound)."""
+
+
+def decode_blob(blob, encoding, is_delta):
+    """Decodes an uploaded blob: full fp32 weights (flat or legacy format) or a codec-encoded update."""
+    if encoding == pb2.ENCODING_RAW and not is_delta:
+        return load_state_dict_from_bytes(blob)
+    return decode_update(blob, encoding)
+
+
+def expected_layers(layout):
+    """{name: (shape, offset, numel)} of the global model, for the per-layer checks below."""
+    return {key: (shape, offset, numel) for key, shape, _, offset, numel in layout}
+
+
+def check_dense_layer(key, tensor, expected):
+    """A decoded dense layer must be a known, floating point layer of the right shape. Returns (offset, numel)."""
+    if key not in expected:
+        raise InvalidUpdate(f"Unknown layer '{key}' in update")
+    shape, offset, numel = expected[key]
+    if not tensor.is_floating_point():
+        raise InvalidUpdate(f"Layer '{key}' has non-float dtype {tensor.dtype}")
+    if tuple(tensor.shape) != shape:
+        raise InvalidUpdate(f"Layer '{key}' has shape {tuple(tensor.shape)}, expected {shape}")
+    return offset, numel
+
+
+def check_sparse_layer(key, indices, values, expected):
+    """A top-k layer must be known, with one value per index and every index in range. Returns (offset, numel)."""
+    if key not in expected:
+        raise InvalidUpdate(f"Unknown layer '{key}' in sparse update")
+    _, offset, numel = expected[key]
+    if indices.numel() != values.numel():
+        raise InvalidUpdate(f"Layer '{key}' has {indices.numel()} indices but {values.numel()} values")
+    if indices.numel() and (indices.min() < 0 or indices.max() >= numel):
+        raise InvalidUpdate(f"Layer '{key}' has sparse indices out of range")
+    return offset, numel
+
+
+def flatten_update(decoded, encoding, layout, out):
+    """
+    Writes a decoded update into `out` (flat fp32, global model layout), checking every layer
+    against the architecture. Dense updates must match name, shape and be floating point;
+    top-k updates must only touch known layers with in-range indices.
+    """
+    expected = expected_layers(layout)
+
+    if encoding == pb2.ENCODING_TOPK:
+        unknown = set(decoded) - set(expected)
+        if unknown:
+            raise InvalidUpdate(f"Unknown layers in sparse update: {sorted(unknown)}")
+        out.zero_()
+        for key, (indices, values) in decoded.items():
+            offset, numel = check_sparse_layer(key, indices, values, expected)
+            out[offset:offset + numel].index_add_(0, indices, values.to(torch.float32))
+        return out
+
+    if set(decoded) != set(expected):
+        raise InvalidUpdate(f"Expected layers {sorted(expected)}, got {sorted(decoded)}")
+    for key in expected:
+        offset, numel = check_dense_layer(key, decoded[key], expected)
+        out[offset:offset + numel].copy_(decoded[key].reshape(-1))
+    return out
+
+
+def _aligned(n):
+    return -(-n // ALIGNMENT) * ALIGNMENT
+
+
+def max_update_size(layout, encoding):
+    """Largest blob a well-formed update in `encoding` can be for this model layout."""
+    per_param = {pb2.ENCODING_FP16: 2, pb2.ENCODING_INT8: 1, pb2.ENCODING_TOPK: 8}.get(encoding, 4)
+    size = _HEADER_SLACK
+    for _, _, _, _, numel in layout:
+        size += _aligned(numel * per_param) + 2 * ALIGNMENT
+    return size
+
+
+def check_update_header(entries, encoding, layout):
+    """
+    Checks a streamed update's wire header against the model before any tensor data is
+    buffered: every entry must be a tensor the encoding produces for a known layer, with
+    the right dtype, shape and byte count, in order. Raises InvalidUpdate.
+    """
+    shapes = {key: shape for key, shape, _, _, _ in layout}
+    numels = {key: numel for key, _, _, _, numel in layout}
+    seen, held, end = set(), {}, 0   # held: layers waiting for their scale / values
+    for entry in entries:
+        try:
+            name, dtype, shape, offset, nbytes = entry
+            shape = tuple(int(dim) for dim in shape)
+            if not isinstance(name, str):
+                raise TypeError(name)
+        except (TypeError, ValueError):
+            raise InvalidUpdate(f"Malformed header entry {entry!r}")
+        if name in seen:
+            raise InvalidUpdate(f"Tensor '{name}' appears twice")
+        seen.add(name)
+        # Tensors must follow each other, with at most alignment padding in between
+        if not isinstance(offset, int) or not end <= offset < end + ALIGNMENT:
+            raise InvalidUpdate(f"Tensor '{name}' has an unexpected offset {offset}")
+
+        if encoding == pb2.ENCODING_TOPK:
+            key, _, suffix = name.rpartition('#')
+            if key not in shapes or '#' + suffix not in (_IDX, _VAL) or len(shape) != 1 or shape[0] > numels[key]:
+                raise InvalidUpdate(f"Unexpected sparse tensor '{name}' {list(shape)}")
+            if '#' + suffix == _IDX:
+                expected_dtype = 'int32'
+                held[key] = shape
+            else:
+                expected_dtype = 'float32'
+                if held.pop(key, None) != shape:
+                    raise InvalidUpdate(f"Values of '{key}' do not follow matching indices")
+        elif encoding == pb2.ENCODING_INT8 and name.endswith(_SCALE):
+            key = name[:-len(_SCALE)]
+            if key not in held or shape != ():
+                raise InvalidUpdate(f"Unexpected scale tensor '{name}'")
+            del held[key]
+            expected_dtype = 'float32'
+        else:
+            if name not in shapes or shape != shapes[name]:
+                raise InvalidUpdate(f"Layer '{name}' {list(shape)} does not match the model")
+            expected_dtype = _WIRE_DTYPES.get(encoding)
+            if encoding == pb2.ENCODING_INT8:
+                held[name] = shape
+
+        if dtype != expected_dtype:
+            raise InvalidUpdate(f"Tensor '{name}' has dtype {dtype}, expected {expected_dtype}")
+        numel = math.prod(shape)
+        if nbytes != numel * _ITEMSIZE[dtype]:
+            raise InvalidUpdate(f"Tensor '{name}' declares {nbytes} bytes for shape {list(shape)}")
+        end = offset + nbytes
+
+    if held:
+        raise InvalidUpdate(f"Layers without their {'values' if encoding == pb2.ENCODING_TOPK else 'scale'}: {sorted(held)}")
+    if encoding != pb2.ENCODING_TOPK and len(seen) != len(layout) * (2 if encoding == pb2.ENCODING_INT8 else 1):
+        raise InvalidUpdate(f"Expected every layer of the model, got {len(seen)} tensors")
+
+
+def check_values(flat, max_norm=math.inf):
+    """Rejects updates containing NaN/Inf or whose L2 norm exceeds max_norm."""
+    if not torch.isfinite(flat).all():
+        raise InvalidUpdate("Update contains NaN or Inf values")
+    if max_norm < math.inf:
+        norm = torch.linalg.vector_norm(flat).item()
+        if norm > max_norm:
+            raise InvalidUpdate(f"Update norm {norm:.2f} exceeds the bound of {max_norm:.2f}")
+
+
+# --- WORKER PROCESS SIDE ---
+_worker_layout = None
+_worker_max_norm = math.inf
+_worker_segments = {}
+
+
+def _init_worker(layout, max_norm):
+    global _worker_layout, _worker_max_norm
+    # Parallelism comes from the processes; intra-op threads would only oversubscribe the cores
+    torch.set_num_threads(1)
+    _worker_layout = layout
+    _worker_max_norm = max_norm
+
+
+def _attach(key, name):
+    """Maps a server-owned segment once per worker; re-maps if the server replaced it."""
+    segment = _worker_segments.get(key)
+    if segment is None or segment.name != name:
+        if segment is not None:
+            segment.close()
+        segment = shared_memory.SharedMemory(name=name)
+        _worker_segments[key] = segment
+    return segment
+
+
+def _ingest_in_worker(slot_index, input_name, size, output_name, num_params, encoding, is_delta):
+    blob = _attach((slot_index, 'in'), input_name).buf[:size]
+    out = torch.frombuffer(_attach((slot_index, 'out'), output_name).buf, dtype=torch.float32, count=num_params)
+    try:
+        flatten_update(decode_blob(blob, encoding, is_delta), encoding, _worker_layout, out)
+    except InvalidUpdate:
+        raise
+    except Exception as e:
+        # Decoder errors may carry objects that do not pickle back to the server
+        raise InvalidUpdate(f"Could not decode update: {e}") from None
+    check_values(out, _worker_max_norm)
+
+
+# --- SERVER SIDE ---
+class _Slot:
+    """A pair of shared-memory segments: the raw blob in, the flat fp32 update out."""
+    def __init__(self, index, num_params):
+        self.index = index
+        self.input = None
+        self.output = shared_memory.SharedMemory(create=True, size=num_params * 4)
+        self.flat = torch.frombuffer(self.output.buf, dtype=torch.float32, count=num_params)
+
+    def load(self, blob):
+        if self.input is None or self.input.size < len(blob):
+            self._release_input()
+            size = max(_SEGMENT_STEP, -(-len(blob) // _SEGMENT_STEP) * _SEGMENT_STEP)
+            self.input = shared_memory.SharedMemory(create=True, size=size)
+        self.input.buf[:len(blob)] = blob
+
+    def _release_input(self):
+        if self.input is not None:
+            self.input.close()
+            self.input.unlink()
+            self.input = None
+
+    def close(self):
+        self._release_input()
+        del self.flat
+        self.output.close()
+        self.output.unlink()
+
+
+class IngestPool:
+    """
+    Decodes and validates update blobs in worker processes, so ingest is not
+    serialized on the server's GIL. Blobs go in and flat fp32 updates come back
+    through preallocated shared-memory slots; only a few ints are pickled per update.
+    """
+    def __init__(self, layout, num_params, processes, max_norm=math.inf):
+        self.num_params = num_params
+        self._executor_args = (processes, layout, max_norm)
+        self._executor_lock = threading.Lock()
+        self.executor = self._new_executor()
+        # Two slots per process: one being decoded while the previous one is folded
+        self._slots = queue.Queue()
+        self._all_slots = [_Slot(i, num_params) for i in range(processes * 2)]
+        for slot in self._all_slots:
+            self._slots.put(slot)
+        atexit.register(self.shutdown)
+
+    def _new_executor(self):
+        processes, layout, max_norm = self._executor_args
+        # Forking a process that already runs gRPC threads is unsafe; spawn clean workers instead
+        return ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(layout, max_norm)
+        )
+
+    def _replace_broken(self, executor):
+        """A worker process died: every call after it would fail, so start a fresh pool (once)."""
+        with self._executor_lock:
+            if self.executor is executor:
+                print("⚠️ [Ingest] A decode process died, restarting the pool.")
+                executor.shutdown(wait=False)
+                self.executor = self._new_executor()
+
+    @contextmanager
+    def decode(self, blob, encoding, is_delta, timeout=30.0):
+        """
+        Yields the decoded, validated update as a flat fp32 tensor in the global model layout.
+        The tensor lives in shared memory and is only valid inside the `with` block.
+        Raises InvalidUpdate for blobs that fail decoding or validation, StagingBusy if no
+        slot frees up within `timeout`, TimeoutError if the decode takes longer than that.
+        """
+        try:
+            slot = self._slots.get(timeout=timeout)
+        except queue.Empty:
+            raise StagingBusy(f"All {len(self._all_slots)} ingest slots are busy, retry shortly") from None
+        future = None
+        try:
+            slot.load(blob)
+            executor = self.executor
+            try:
+                future = executor.submit(
+                    _ingest_in_worker, slot.index, slot.input.name, len(blob),
+                    slot.output.name, self.num_params, encoding, is_delta
+                )
+                future.result(timeout=timeout)
+            except BrokenProcessPool:
+                self._replace_broken(executor)
+                raise RuntimeError("Decode process died; the ingest pool was restarted") from None
+            yield slot.flat
+        finally:
+            if future is None or future.done():
+                self._slots.put(slot)
+            else:
+                # Timed out: a process still writes into this slot, recycle it once it is done
+                future.add_done_callback(lambda _: self._slots.put(slot))
+
+    def free_slots(self):
+        return self._slots.qsize()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+        for slot in self._all_slots:
+            slot.close()
+        self._all_slots = []
@@ -24,25 +24,45 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x17\x66\x65\x64\x65rated_service.proto\x12\x0esctl_federated\"!\n\x0cModelRequest\x12\x11\n\tworker_id\x18\x01 \x01(\t\":\n\x0cModelWeights\x12\x14\n\x0cround_number\x18\x01 \x01(\x05\x12\x14\n\x0cweights_data\x18\x02 \x01(\x0c\"x\n\x0bModelUpdate\x12\x11\n\tworker_id\x18\x01 \x01(\t\x12\x14\n\x0cround_number\x18\x02 \x01(\x05\x12\x14\n\x0cweights_data\x18\x03 \x01(\x0c\x12\x13\n\x0bnum_samples\x18\x04 \x01(\x05\x12\x15\n\ranomaly_score\x18\x05 \x01(\x02\"3\n\x0f\x41\x63knowledgement\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\x19\n\x04Ping\x12\x11\n\tclient_id\x18\x01 \x01(\t\"\x16\n\x04Pong\x12\x0e\n\x06status\x18\x01 \x01(\t2\xf3\x01\n\x11\x46\x65\x64\x65ratedLearning\x12N\n\x0eGetGlobalModel\x12\x1c.sctl_federated.ModelRequest\x1a\x1c.sctl_federated.ModelWeights\"\x00\x12Q\n\x0fSendModelUpdate\x12\x1b.sctl_federated.ModelUpdate\x1a\x1f.sctl_federated.Acknowledgement\"\x00\x12;\n\x0bHealthCheck\x12\x14.sctl_federated.Ping\x1a\x14.sctl_federated.Pong\"\x00\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x17\x66\x65\x64\x65rated_service.proto\x12\x0esctl_federated\"a\n\x0cModelRequest\x12\x11\n\tworker_id\x18\x01 \x01(\t\x12\x14\n\x0cround_number\x18\x02 \x01(\x05\x12\x12\n\nmodel_hash\x18\x03 \x01(\t\x12\x14\n\x0c\x61\x63\x63\x65pt_delta\x18\x04 \x01(\x08\"\xe2\x02\n\x0cModelWeights\x12\x14\n\x0cround_number\x18\x01 \x01(\x05\x12\x14\n\x0cweights_data\x18\x02 \x01(\x0c\x12\x12\n\nmodel_hash\x18\x03 \x01(\t\x12\x14\n\x0cnot_modified\x18\x04 \x01(\x08\x12;\n\x13supported_encodings\x18\x05 \x03(\x0e\x32\x1e.sctl_federated.UpdateEncoding\x12\x12\n\nround_full\x18\x06 \x01(\x08\x12\x19\n\x11round_deadline_ms\x18\x07 \x01(\x03\x12\x43\n\x0clayer_hashes\x18\x08 \x03(\x0b\x32-.sctl_federated.ModelWeights.LayerHashesEntry\x12\x17\n\x0f\x64\x65lta_base_hash\x18\t \x01(\t\x1a\x32\n\x10LayerHashesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xd5\x01\n\x0bModelUpdate\x12\x11\n\tworker_id\x18\x01 \x01(\t\x12\x14\n\x0cround_number\x18\x02 \x01(\x05\x12\x14\n\x0cweights_data\x18\x03 \x01(\x0c\x12\x13\n\x0bnum_samples\x18\x04 \x01(\x05\x12\x15\n\ranomaly_score\x18\x05 \x01(\x02\x12\x30\n\x08\x65ncoding\x18\x06 \x01(\x0e\x32\x1e.sctl_federated.UpdateEncoding\x12\x10\n\x08is_delta\x18\x07 \x01(\x08\x12\x17\n\x0f\x62\x61se_model_hash\x18\x08 \x01(\t\"c\n\x11ModelWeightsChunk\x12,\n\x06header\x18\x01 \x01(\x0b\x32\x1c.sctl_federated.ModelWeights\x12\x12\n\ntotal_size\x18\x02 \x01(\x03\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\x0c\"q\n\x10ModelUpdateChunk\x12+\n\x06header\x18\x01 \x01(\x0b\x32\x1b.sctl_federated.ModelUpdate\x12\x12\n\ntotal_size\x18\x02 \x01(\x03\x12\x0c\n\x04\x64\x61ta\x18\x03 \x01(\x0c\x12\x0e\n\x06sha256\x18\x04 \x01(\t\"H\n\nRoundQuery\x12\x11\n\tworker_id\x18\x01 \x01(\t\x12\x13\n\x0b\x61\x66ter_round\x18\x02 \x01(\x05\x12\x12\n\ntimeout_ms\x18\x03 \x01(\x05\"\x92\x01\n\x0bRoundStatus\x12\x14\n\x0cround_number\x18\x01 \x01(\x05\x12\x13\n\x0b\x64\x65\x61\x64line_ms\x18\x02 \x01(\x03\x12\x18\n\x10updates_received\x18\x03 \x01(\x05\x12\x16\n\x0etarget_updates\x18\x04 \x01(\x05\x12\x0e\n\x06quorum\x18\x05 \x01(\x05\x12\x16\n\x0e\x61nchored_round\x18\x06 \x01(\x05\"N\n\x0cProofRequest\x12\x11\n\tworker_id\x18\x01 \x01(\t\x12\x14\n\x0cround_number\x18\x02 \x01(\x05\x12\x15\n\rupdate_sha256\x18\x03 \x01(\t\"5\n\tProofStep\x12\x0f\n\x07sibling\x18\x01 \x01(\t\x12\x17\n\x0fsibling_on_left\x18\x02 \x01(\x08\"\x8f\x01\n\x0bUpdateProof\x12\x0c\n\x04leaf\x18\x01 \x01(\t\x12\x12\n\nleaf_index\x18\x02 \x01(\x05\x12\x12\n\nnum_leaves\x18\x03 \x01(\x05\x12\'\n\x04path\x18\x04 \x03(\x0b\x32\x19.sctl_federated.ProofStep\x12\x0c\n\x04root\x18\x05 \x01(\t\x12\x13\n\x0b\x62lock_index\x18\x06 \x01(\x05\"3\n\x0f\x41\x63knowledgement\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\x19\n\x04Ping\x12\x11\n\tclient_id\x18\x01 \x01(\t\"\x16\n\x04Pong\x12\x0e\n\x06status\x18\x01 \x01(\t*[\n\x0eUpdateEncoding\x12\x10\n\x0c\x45NCODING_RAW\x10\x00\x12\x11\n\rENCODING_FP16\x10\x01\x12\x11\n\rENCODING_INT8\x10\x02\x12\x11\n\rENCODING_TOPK\x10\x03\x32\xce\x04\n\x11\x46\x65\x64\x65ratedLearning\x12N\n\x0eGetGlobalModel\x12\x1c.sctl_federated.ModelRequest\x1a\x1c.sctl_federated.ModelWeights\"\x00\x12Q\n\x0fSendModelUpdate\x12\x1b.sctl_federated.ModelUpdate\x1a\x1f.sctl_federated.Acknowledgement\"\x00\x12;\n\x0bHealthCheck\x12\x14.sctl_federated.Ping\x1a\x14.sctl_federated.Pong\"\x00\x12[\n\x14GetGlobalModelStream\x12\x1c.sctl_federated.ModelRequest\x1a!.sctl_federated.ModelWeightsChunk\"\x00\x30\x01\x12^\n\x15SendModelUpdateStream\x12 .sctl_federated.ModelUpdateChunk\x1a\x1f.sctl_federated.Acknowledgement\"\x00(\x01\x12M\n\x10WaitForNextRound\x12\x1a.sctl_federated.RoundQuery\x1a\x1b.sctl_federated.RoundStatus\"\x00\x12M\n\x0eGetUpdateProof\x12\x1c.sctl_federated.ProofRequest\x1a\x1b.sctl_federated.UpdateProof\"\x00\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'federated_service_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
+  _globals['_MODELWEIGHTS_LAYERHASHESENTRY']._loaded_options = None
+  _globals['_MODELWEIGHTS_LAYERHASHESENTRY']._serialized_options = b'8\001'
+  _globals['_UPDATEENCODING']._serialized_start=1539
+  _globals['_UPDATEENCODING']._serialized_end=1630
   _globals['_MODELREQUEST']._serialized_start=43
-  _globals['_MODELREQUEST']._serialized_end=76
-  _globals['_MODELWEIGHTS']._serialized_start=78
-  _globals['_MODELWEIGHTS']._serialized_end=136
-  _globals['_MODELUPDATE']._serialized_start=138
-  _globals['_MODELUPDATE']._serialized_end=258
-  _globals['_ACKNOWLEDGEMENT']._serialized_start=260
-  _globals['_ACKNOWLEDGEMENT']._serialized_end=311
-  _globals['_PING']._serialized_start=313
-  _globals['_PING']._serialized_end=338
-  _globals['_PONG']._serialized_start=340
-  _globals['_PONG']._serialized_end=362
-  _globals['_FEDERATEDLEARNING']._serialized_start=365
-  _globals['_FEDERATEDLEARNING']._serialized_end=608
+  _globals['_MODELREQUEST']._serialized_end=140
+  _globals['_MODELWEIGHTS']._serialized_start=143
+  _globals['_MODELWEIGHTS']._serialized_end=497
+  _globals['_MODELWEIGHTS_LAYERHASHESENTRY']._serialized_start=447
+  _globals['_MODELWEIGHTS_LAYERHASHESENTRY']._serialized_end=497
+  _globals['_MODELUPDATE']._serialized_start=500
+  _globals['_MODELUPDATE']._serialized_end=713
+  _globals['_MODELWEIGHTSCHUNK']._serialized_start=715
+  _globals['_MODELWEIGHTSCHUNK']._serialized_end=814
+  _globals['_MODELUPDATECHUNK']._serialized_start=816
+  _globals['_MODELUPDATECHUNK']._serialized_end=929
+  _globals['_ROUNDQUERY']._serialized_start=931
+  _globals['_ROUNDQUERY']._serialized_end=1003
+  _globals['_ROUNDSTATUS']._serialized_start=1006
+  _globals['_ROUNDSTATUS']._serialized_end=1152
+  _globals['_PROOFREQUEST']._serialized_start=1154
+  _globals['_PROOFREQUEST']._serialized_end=1232
+  _globals['_PROOFSTEP']._serialized_start=1234
+  _globals['_PROOFSTEP']._serialized_end=1287
+  _globals['_UPDATEPROOF']._serialized_start=1290
+  _globals['_UPDATEPROOF']._serialized_end=1433
+  _globals['_ACKNOWLEDGEMENT']._serialized_start=1435
+  _globals['_ACKNOWLEDGEMENT']._serialized_end=1486
+  _globals['_PING']._serialized_start=1488
+  _globals['_PING']._serialized_end=1513
+  _globals['_PONG']._serialized_start=1515
+  _globals['_PONG']._serialized_end=1537
+  _globals['_FEDERATEDLEARNING']._serialized_start=1633
+  _globals['_FEDERATEDLEARNING']._serialized_end=2223
 # @@protoc_insertion_point(module_scope)
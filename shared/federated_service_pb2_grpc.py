@@ -50,6 +50,26 @@ class FederatedLearningStub(object):
                 request_serializer=federated__service__pb2.Ping.SerializeToString,
                 response_deserializer=federated__service__pb2.Pong.FromString,
                 _registered_method=True)
+        self.GetGlobalModelStream = channel.unary_stream(
+                '/sctl_federated.FederatedLearning/GetGlobalModelStream',
+                request_serializer=federated__service__pb2.ModelRequest.SerializeToString,
+                response_deserializer=federated__service__pb2.ModelWeightsChunk.FromString,
+                _registered_method=True)
+        self.SendModelUpdateStream = channel.stream_unary(
+                '/sctl_federated.FederatedLearning/SendModelUpdateStream',
+                request_serializer=federated__service__pb2.ModelUpdateChunk.SerializeToString,
+                response_deserializer=federated__service__pb2.Acknowledgement.FromString,
+                _registered_method=True)
+        self.WaitForNextRound = channel.unary_unary(
+                '/sctl_federated.FederatedLearning/WaitForNextRound',
+                request_serializer=federated__service__pb2.RoundQuery.SerializeToString,
+                response_deserializer=federated__service__pb2.RoundStatus.FromString,
+                _registered_method=True)
+        self.GetUpdateProof = channel.unary_unary(
+                '/sctl_federated.FederatedLearning/GetUpdateProof',
+                request_serializer=federated__service__pb2.ProofRequest.SerializeToString,
+                response_deserializer=federated__service__pb2.UpdateProof.FromString,
+                _registered_method=True)
 
 
 class FederatedLearningServicer(object):
@@ -77,6 +97,33 @@ class FederatedLearningServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def GetGlobalModelStream(self, request, context):
+        """4. Chunked variants of (1) and (2): fixed-size slices, so model size is not bound by message limits
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SendModelUpdateStream(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WaitForNextRound(self, request, context):
+        """5. Long-poll: returns as soon as a round newer than RoundQuery.after_round opens (or on timeout)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetUpdateProof(self, request, context):
+        """6. Merkle inclusion proof that a worker's update is part of a round anchored on the DLT
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_FederatedLearningServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -95,6 +142,26 @@ def add_FederatedLearningServicer_to_server(servicer, server):
                     request_deserializer=federated__service__pb2.Ping.FromString,
                     response_serializer=federated__service__pb2.Pong.SerializeToString,
             ),
+            'GetGlobalModelStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.GetGlobalModelStream,
+                    request_deserializer=federated__service__pb2.ModelRequest.FromString,
+                    response_serializer=federated__service__pb2.ModelWeightsChunk.SerializeToString,
+            ),
+            'SendModelUpdateStream': grpc.stream_unary_rpc_method_handler(
+                    servicer.SendModelUpdateStream,
+                    request_deserializer=federated__service__pb2.ModelUpdateChunk.FromString,
+                    response_serializer=federated__service__pb2.Acknowledgement.SerializeToString,
+            ),
+            'WaitForNextRound': grpc.unary_unary_rpc_method_handler(
+                    servicer.WaitForNextRound,
+                    request_deserializer=federated__service__pb2.RoundQuery.FromString,
+                    response_serializer=federated__service__pb2.RoundStatus.SerializeToString,
+            ),
+            'GetUpdateProof': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetUpdateProof,
+                    request_deserializer=federated__service__pb2.ProofRequest.FromString,
+                    response_serializer=federated__service__pb2.UpdateProof.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'sctl_federated.FederatedLearning', rpc_method_handlers)
@@ -187,3 +254,111 @@ class FederatedLearning(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def GetGlobalModelStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/sctl_federated.FederatedLearning/GetGlobalModelStream',
+            federated__service__pb2.ModelRequest.SerializeToString,
+            federated__service__pb2.ModelWeightsChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def SendModelUpdateStream(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/sctl_federated.FederatedLearning/SendModelUpdateStream',
+            federated__service__pb2.ModelUpdateChunk.SerializeToString,
+            federated__service__pb2.Acknowledgement.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def WaitForNextRound(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/sctl_federated.FederatedLearning/WaitForNextRound',
+            federated__service__pb2.RoundQuery.SerializeToString,
+            federated__service__pb2.RoundStatus.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetUpdateProof(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/sctl_federated.FederatedLearning/GetUpdateProof',
+            federated__service__pb2.ProofRequest.SerializeToString,
+            federated__service__pb2.UpdateProof.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -0,0 +1,68 @@
+import hashlib
+import json
+
+# --- PER-ROUND MERKLE TREES ---
+# RFC 6962-style domain separation: a leaf can never be passed off as an inner node.
+# An odd node at the end of a level is promoted unchanged (no duplication, so two
+# different leaf lists can never produce the same root).
+_LEAF_PREFIX = b'\x00'
+_NODE_PREFIX = b'\x01'
+
+EMPTY_ROOT = hashlib.sha256(b'').hexdigest()
+
+
+def leaf_record(round_number, worker_id, update_sha256, num_samples, encoding, is_delta, trained_round):
+    """Canonical JSON for one accepted update: what its Merkle leaf commits to."""
+    return json.dumps({
+        'round': round_number,
+        'worker_id': worker_id,
+        'sha256': update_sha256,
+        'num_samples': num_samples,
+        'encoding': encoding,
+        'is_delta': is_delta,
+        'trained_round': trained_round,
+    }, sort_keys=True, separators=(',', ':'))
+
+
+def leaf_hash(record):
+    return hashlib.sha256(_LEAF_PREFIX + record.encode()).digest()
+
+
+def _node_hash(left, right):
+    return hashlib.sha256(_NODE_PREFIX + left + right).digest()
+
+
+def build_levels(leaf_hashes):
+    """Every level of the tree as lists of raw digests, leaves first, root last."""
+    levels = [list(leaf_hashes)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parents = [_node_hash(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            parents.append(level[-1])
+        levels.append(parents)
+    return levels
+
+
+def merkle_root(levels):
+    return levels[-1][0].hex() if levels[0] else EMPTY_ROOT
+
+
+def merkle_proof(levels, position):
+    """O(log n) inclusion proof for leaf `position`: [(sibling_hex, sibling_on_left), ...] up to the root."""
+    path = []
+    for level in levels[:-1]:
+        sibling = position ^ 1
+        if sibling < len(level):
+            path.append((level[sibling].hex(), sibling < position))
+        position //= 2
+    return path
+
+
+def verify_proof(record, path, root):
+    """True if `record` is a leaf of the tree with the given root."""
+    node = leaf_hash(record)
+    for sibling_hex, sibling_on_left in path:
+        sibling = bytes.fromhex(sibling_hex)
+        node = _node_hash(sibling, node) if sibling_on_left else _node_hash(node, sibling)
+    return node.hex() == root
@@ -0,0 +1,50 @@
+import zlib
+
+import numpy as np
+import torch
+
+from shared.tensor_codec import encode_state_dict, decode_state_dict, raw_bytes, tensor_from_raw_bytes
+
+# --- GLOBAL MODEL DIFFS (delta-sync downloads) ---
+# Lossless, so the result still matches the anchored model hash bit for bit.
+# Per layer: XOR of the base and target bytes, split into byte planes (all first bytes
+# of every element, then all second bytes, ...) and zlib-compressed. One round of SGD
+# rarely touches the sign/exponent bytes, so those planes are mostly zeros.
+# Carried in the flat-tensor wire format as {layer name: uint8 tensor of compressed bytes};
+# dtypes and shapes come from the base model the receiver already holds.
+COMPRESSION_LEVEL = 1
+
+
+def _byte_planes(data, itemsize):
+    return np.ascontiguousarray(data.reshape(-1, itemsize).T)
+
+
+def encode_model_diff(base_state, target_state, level=COMPRESSION_LEVEL):
+    """Diff turning base_state into target_state. Returns None if the two have different layouts."""
+    if list(base_state) != list(target_state):
+        return None
+    layers = {}
+    for name, target in target_state.items():
+        base = base_state[name]
+        if base.dtype != target.dtype or base.shape != target.shape:
+            return None
+        xor = np.bitwise_xor(raw_bytes(base).numpy(), raw_bytes(target).numpy())
+        compressed = zlib.compress(_byte_planes(xor, target.element_size()), level)
+        layers[name] = torch.frombuffer(bytearray(compressed), dtype=torch.uint8)
+    return encode_state_dict(layers)
+
+
+def apply_model_diff(base_state, diff_blob):
+    """Rebuilds the target state_dict from the base it was taken against. New tensors, base untouched."""
+    diff = decode_state_dict(diff_blob)
+    if list(diff) != list(base_state):
+        raise ValueError("Model diff does not match the layers of the base model")
+    target_state = {}
+    for name, base in base_state.items():
+        itemsize = base.element_size()
+        planes = np.frombuffer(zlib.decompress(memoryview(diff[name].numpy())), dtype=np.uint8)
+        if planes.size != base.numel() * itemsize:
+            raise ValueError(f"Model diff for layer '{name}' has the wrong size")
+        data = np.bitwise_xor(planes.reshape(itemsize, -1).T.reshape(-1), raw_bytes(base).numpy())
+        target_state[name] = tensor_from_raw_bytes(data, base.dtype, base.shape)
+    return target_state
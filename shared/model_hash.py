@@ -0,0 +1,48 @@
+import hashlib
+import json
+
+from shared.tensor_codec import dtype_name, raw_bytes
+
+# --- CANONICAL MODEL FINGERPRINT (v1) ---
+# Hashes the weights themselves, not a serialized blob: each layer digest covers
+# [name, dtype, shape] + the tensor's raw little-endian bytes, read in place through
+# a memoryview. The model hash chains the layer digests in state_dict order, so it
+# is identical whatever wire format (flat, legacy torch.save) carried the weights.
+HASH_VERSION = b'sctl-model-v1'
+
+
+def layer_digest(name, tensor):
+    """SHA-256 (hex) of one named tensor."""
+    header = json.dumps([name, dtype_name(tensor.dtype), list(tensor.shape)], separators=(',', ':'))
+    digest = hashlib.sha256(header.encode() + b'\n')
+    digest.update(memoryview(raw_bytes(tensor).numpy()))
+    return digest.hexdigest()
+
+
+def layer_digests(state_dict):
+    """{layer name: digest} for every tensor, for verifying a subset of layers."""
+    return {name: layer_digest(name, tensor) for name, tensor in state_dict.items()}
+
+
+def combine_digests(digests):
+    """Model hash from per-layer digests (in state_dict order)."""
+    model_digest = hashlib.sha256(HASH_VERSION)
+    for name, digest in digests.items():
+        model_digest.update(name.encode() + b'\x00' + bytes.fromhex(digest))
+    return model_digest.hexdigest()
+
+
+def state_dict_hash(state_dict):
+    """Canonical model hash: what the server anchors on the DLT and serves as model_hash."""
+    return combine_digests(layer_digests(state_dict))
+
+
+def verify_state_dict(state_dict, model_hash, expected_layers=None):
+    """
+    Checks downloaded weights against the served hash. With expected_layers
+    ({name: digest}) also returns the names of the layers that differ, so a caller
+    can tell which part of the model was damaged. Returns (ok, mismatched layers).
+    """
+    digests = layer_digests(state_dict)
+    mismatched = [name for name, digest in (expected_layers or {}).items() if digests.get(name) != digest]
+    return combine_digests(digests) == model_hash and not mismatched, mismatched
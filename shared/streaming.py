@@ -0,0 +1,71 @@
+import hashlib
+
+import federated_service_pb2 as pb2
+
+# Fixed slice size for chunked transfers. Well below gRPC's 4 MB default message
+# limit, so streamed models of any size need no raised channel/nginx limits.
+CHUNK_SIZE = 256 * 1024
+
+
+def iter_slices(blob, chunk_size=CHUNK_SIZE):
+    """
+    Yields (data, is_last) for consecutive chunk_size slices of blob.
+    Only one slice is copied at a time; an empty blob still yields one empty slice.
+    """
+    view = memoryview(blob)
+    for start in range(0, max(len(view), 1), chunk_size):
+        yield bytes(view[start:start + chunk_size]), start + chunk_size >= len(view)
+
+
+def iter_update_chunks(update, blob, chunk_size=CHUNK_SIZE):
+    """
+    Client side of SendModelUpdateStream.
+    The first chunk carries the ModelUpdate metadata, the last one the SHA-256 of the payload.
+    """
+    running_hash = hashlib.sha256()
+    for i, (data, is_last) in enumerate(iter_slices(blob, chunk_size)):
+        running_hash.update(data)
+        chunk = pb2.ModelUpdateChunk(data=data)
+        if i == 0:
+            chunk.header.CopyFrom(update)
+            chunk.total_size = len(blob)
+        if is_last:
+            chunk.sha256 = running_hash.hexdigest()
+        yield chunk
+
+
+def iter_weights_chunks(weights, blob, chunk_size=CHUNK_SIZE):
+    """Server side of GetGlobalModelStream. The first chunk carries the ModelWeights metadata."""
+    for i, (data, _) in enumerate(iter_slices(blob, chunk_size)):
+        chunk = pb2.ModelWeightsChunk(data=data)
+        if i == 0:
+            chunk.header.CopyFrom(weights)
+            chunk.total_size = len(blob)
+        yield chunk
+
+
+def assemble_weights(chunks):
+    """
+    Client side of GetGlobalModelStream: writes chunks into one preallocated buffer.
+    header.model_hash covers the tensors, not these bytes: check it on the decoded
+    weights with shared.model_hash.verify_state_dict.
+    Returns (header, buffer); buffer is empty when header.not_modified is set.
+    """
+    header, buffer, position = None, None, 0
+    for chunk in chunks:
+        if header is None:
+            if not chunk.HasField('header'):
+                raise ValueError("First model chunk is missing its header")
+            header = chunk.header
+            buffer = bytearray(chunk.total_size)
+        end = position + len(chunk.data)
+        if end > len(buffer):
+            raise ValueError("Model stream is longer than announced")
+        buffer[position:end] = chunk.data
+        position = end
+
+    if header is None:
+        raise ValueError("Empty model stream")
+    if not header.not_modified and position != len(buffer):
+        raise ValueError(f"Model stream truncated: {position}/{len(buffer)} bytes")
+    return header, buffer
@@ -0,0 +1,191 @@
+import json
+import struct
+import sys
+import warnings
+
+import torch
+
+# --- SCTL FLAT-TENSOR WIRE FORMAT (v1) ---
+# [ MAGIC (4) | VERSION (u8) | HEADER_LEN (u32 LE) | JSON HEADER | pad | DATA ]
+# The JSON header lists [name, dtype, shape, offset, nbytes] per tensor, offsets are
+# relative to the start of DATA. DATA is one contiguous little-endian buffer with
+# every tensor aligned to ALIGNMENT bytes so the decoder can wrap it in place.
+MAGIC = b'SCTW'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct('<4sBI')
+
+_DTYPES = {
+    'float32': torch.float32,
+    'float16': torch.float16,
+    'bfloat16': torch.bfloat16,
+    'float64': torch.float64,
+    'int64': torch.int64,
+    'int32': torch.int32,
+    'int16': torch.int16,
+    'int8': torch.int8,
+    'uint8': torch.uint8,
+    'bool': torch.bool,
+}
+_DTYPE_NAMES = {dtype: name for name, dtype in _DTYPES.items()}
+
+_LITTLE_ENDIAN_HOST = sys.byteorder == 'little'
+
+
+def _align(n):
+    return (n + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def dtype_name(dtype):
+    """Wire name of a torch dtype ('float32', 'int8', ...)."""
+    if dtype not in _DTYPE_NAMES:
+        raise TypeError(f"Unsupported dtype {dtype}")
+    return _DTYPE_NAMES[dtype]
+
+
+def raw_bytes(tensor):
+    """Returns a uint8 view over the tensor's storage in little-endian order."""
+    flat = tensor.detach().cpu().contiguous().reshape(-1)
+    if not _LITTLE_ENDIAN_HOST and flat.element_size() > 1:
+        flat = torch.from_numpy(flat.numpy().byteswap())
+    return flat.view(torch.uint8)
+
+
+def tensor_from_raw_bytes(data, dtype, shape):
+    """Inverse of raw_bytes: wraps little-endian bytes (any writable buffer) as a tensor, without copying."""
+    return _wrap_tensor(data, dtype_name(dtype), list(shape), 0, len(data))
+
+
+def is_flat_format(blob):
+    """True if the blob was produced by encode_state_dict (vs a legacy torch.save zip)."""
+    return len(blob) >= _PREAMBLE.size and bytes(blob[:4]) == MAGIC
+
+
+def encode_state_dict(state_dict):
+    """Serializes a dict of tensors into the flat wire format with a single data copy."""
+    entries = []
+    raw_views = []
+    offset = 0
+    for name, tensor in state_dict.items():
+        if tensor.dtype not in _DTYPE_NAMES:
+            raise TypeError(f"Unsupported dtype {tensor.dtype} for layer '{name}'")
+        raw = raw_bytes(tensor)
+        offset = _align(offset)
+        entries.append([name, _DTYPE_NAMES[tensor.dtype], list(tensor.shape), offset, raw.numel()])
+        raw_views.append((offset, raw))
+        offset += raw.numel()
+
+    header = json.dumps({'tensors': entries}, separators=(',', ':')).encode()
+    preamble = _PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header)) + header
+    data_start = _align(len(preamble))
+
+    # bytes.join copies each tensor's buffer exactly once, straight into the output
+    parts = [preamble, bytes(data_start - len(preamble))]
+    position = 0
+    for tensor_offset, raw in raw_views:
+        parts.append(bytes(tensor_offset - position))
+        parts.append(memoryview(raw.numpy()))
+        position = tensor_offset + raw.numel()
+    return b''.join(parts)
+
+
+def _parse_header(view):
+    """Parses the preamble + JSON header. Returns (entries, data_start) or None if incomplete."""
+    if len(view) < _PREAMBLE.size:
+        return None
+    magic, version, header_len = _PREAMBLE.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise ValueError("Not an SCTL flat-tensor blob")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported wire format version {version}")
+
+    header_end = _PREAMBLE.size + header_len
+    if len(view) < header_end:
+        return None
+    header = json.loads(bytes(view[_PREAMBLE.size:header_end]))
+    return header['tensors'], _align(header_end)
+
+
+def _wrap_tensor(buffer, dtype_name, shape, start, nbytes):
+    dtype = _DTYPES[dtype_name]
+    if nbytes == 0:
+        return torch.empty(shape, dtype=dtype)
+    tensor = torch.frombuffer(buffer, dtype=dtype, count=nbytes // dtype.itemsize, offset=start)
+    if not _LITTLE_ENDIAN_HOST and tensor.element_size() > 1:
+        tensor = torch.from_numpy(tensor.numpy().byteswap())
+    return tensor.view(shape)
+
+
+def decode_state_dict(blob):
+    """
+    Wraps the flat wire format as a dict of tensors WITHOUT copying the data.
+    The returned tensors alias `blob`; treat them as read-only.
+    """
+    view = memoryview(blob)
+    parsed = _parse_header(view)
+    if parsed is None:
+        raise ValueError("Truncated SCTL flat-tensor header")
+    entries, data_start = parsed
+
+    state_dict = {}
+    with warnings.catch_warnings():
+        # bytes objects are read-only; frombuffer warns but aliasing them is intended here
+        warnings.simplefilter('ignore', UserWarning)
+        for name, dtype_name, shape, offset, nbytes in entries:
+            start = data_start + offset
+            if start + nbytes > len(view):
+                raise ValueError(f"Layer '{name}' runs past the end of the blob")
+            state_dict[name] = _wrap_tensor(view, dtype_name, shape, start, nbytes)
+    return state_dict
+
+
+class StreamDecoder:
+    """
+    Incremental decoder for chunked transfers: feed() raw chunks in order and get
+    back (name, tensor) for every tensor that became complete. At most one partial
+    tensor plus one chunk is buffered, never the whole blob.
+    on_header(entries) is called once the header has arrived, before any tensor data is
+    buffered, so a receiver can reject sizes and shapes it does not expect by raising.
+    """
+    def __init__(self, on_header=None):
+        self._on_header = on_header
+        self._pending = bytearray()
+        self._position = 0      # Absolute blob offset of _pending[0]
+        self._entries = None
+        self._data_start = 0
+        self._next = 0
+
+    def feed(self, chunk):
+        self._pending += chunk
+        completed = []
+
+        if self._entries is None:
+            parsed = _parse_header(memoryview(self._pending))
+            if parsed is None:
+                return completed
+            entries, data_start = parsed
+            if self._on_header is not None:
+                self._on_header(entries)
+            self._entries, self._data_start = entries, data_start
+
+        while self._next < len(self._entries):
+            name, dtype_name, shape, offset, nbytes = self._entries[self._next]
+            start = self._data_start + offset - self._position
+            if len(self._pending) < start + nbytes:
+                break
+            # Slicing a bytearray copies just this tensor, so it can outlive _pending
+            completed.append((name, _wrap_tensor(self._pending[start:start + nbytes], dtype_name, shape, 0, nbytes)))
+            self._next += 1
+
+        # Drop everything before the next tensor we still need
+        if self.finished():
+            consumed = len(self._pending)
+        else:
+            _, _, _, offset, _ = self._entries[self._next]
+            consumed = min(len(self._pending), self._data_start + offset - self._position)
+        del self._pending[:consumed]
+        self._position += consumed
+        return completed
+
+    def finished(self):
+        return self._entries is not None and self._next == len(self._entries)
@@ -0,0 +1,215 @@
+import argparse
+import glob
+import itertools
+import json
+import os
+import random
+import threading
+import time
+import zlib
+
+# --- ROUND TIMELINE TRACING (Chrome trace event format, opens in Perfetto / chrome://tracing) ---
+# Opt-in: every process holds a disabled TRACER until enable() is called. Disabled, span()
+# returns a shared no-op context manager, so instrumented hot paths cost one attribute
+# check and nothing is recorded or allocated.
+#
+# Enabled, spans are buffered per round and written to <trace_dir>/round-<n>.<process>.json
+# when the round is done. Workers pass their span's identity to the server in gRPC metadata
+# (TRACE_METADATA_KEY): the server's span for that call is linked to the worker's span by a
+# flow arrow, and both are tagged with the worker id and filed under the same round.
+# merge_round() joins the files of every process into one timeline: round-<n>.json.
+
+TRACE_METADATA_KEY = 'sctl-trace'
+
+
+def _now_us():
+    # Wall clock, so timelines recorded on different hosts line up (as far as NTP allows)
+    return time.time_ns() // 1000
+
+
+class _NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set_round(self, round_num):
+        pass
+
+    def metadata(self):
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """One slice of a round's timeline. Events are recorded on exit, so set_round() may still move it."""
+    def __init__(self, tracer, name, round_num, args, flow_in=None):
+        self.tracer = tracer
+        self.name = name
+        self.round_num = round_num
+        self.args = args
+        self.flow_in = flow_in
+        self.flow_out = None
+
+    def __enter__(self):
+        self.tid = threading.get_native_id()
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        events = [{'ph': 'X', 'name': self.name, 'cat': self.tracer.process_name,
+                   'ts': self.start, 'dur': _now_us() - self.start, 'tid': self.tid, 'args': self.args}]
+        if self.flow_in is not None:
+            events.append({'ph': 'f', 'bp': 'e', 'name': 'rpc', 'cat': 'rpc', 'id': self.flow_in,
+                           'ts': self.start, 'tid': self.tid})
+        if self.flow_out is not None:
+            flow_id, ts = self.flow_out
+            events.append({'ph': 's', 'name': 'rpc', 'cat': 'rpc', 'id': flow_id, 'ts': ts, 'tid': self.tid})
+        self.tracer._record(self.round_num, events)
+        return False
+
+    def set_round(self, round_num):
+        """Files the span under another round, e.g. once a download says which round it is for."""
+        self.round_num = round_num
+
+    def metadata(self):
+        """gRPC metadata that links the server's span for this call to this span (a flow arrow)."""
+        flow_id = random.getrandbits(53)
+        self.flow_out = (flow_id, _now_us())
+        return ((TRACE_METADATA_KEY, f"{self.args.get('worker', '')}/{flow_id}"),)
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.trace_dir = None
+        self.process_name = None
+        self.pid = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()   # Flushes may come from several threads (e.g. late upload spans)
+        self._rounds = {}           # round number -> [trace events]
+        self._thread_names = {}     # native tid -> thread name
+
+    def enable(self, trace_dir, process_name):
+        os.makedirs(trace_dir, exist_ok=True)
+        self.trace_dir = trace_dir
+        self.process_name = process_name
+        # Containers all run as pid 1: derive the track id from the name so merged timelines don't collide
+        self.pid = zlib.crc32(process_name.encode()) & 0x7fffffff
+        self.enabled = True
+        print(f"🧵 Tracing rounds to {trace_dir} as '{process_name}'")
+
+    def span(self, name, round_num, **args):
+        """Times a `with` block as one slice of round_num's timeline. args show up in Perfetto."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, round_num, args)
+
+    def rpc_span(self, name, context, round_num, worker, **args):
+        """
+        Server-side span for an RPC. If the caller sent TRACE_METADATA_KEY, the span is
+        linked to the worker's span for the same call.
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        flow_in = None
+        for key, value in context.invocation_metadata() or ():
+            if key == TRACE_METADATA_KEY:
+                try:
+                    flow_in = int(value.rsplit('/', 1)[1])
+                except (IndexError, ValueError):
+                    pass    # Malformed trace context: record the span unlinked
+                break
+        return _Span(self, name, round_num, dict(args, worker=worker), flow_in)
+
+    def _record(self, round_num, events):
+        tid = events[0]['tid']
+        for event in events:
+            event['pid'] = self.pid
+        with self._lock:
+            if tid not in self._thread_names:
+                self._thread_names[tid] = threading.current_thread().name
+            self._rounds.setdefault(round_num, []).extend(events)
+
+    def flush_round(self, round_num):
+        """Writes the spans of round_num (and of any older round still buffered) to disk."""
+        if not self.enabled:
+            return
+        with self._lock:
+            done = sorted(r for r in self._rounds if r <= round_num)
+            batches = [(r, self._rounds.pop(r)) for r in done]
+            thread_names = dict(self._thread_names)
+        with self._write_lock:
+            for r, events in batches:
+                try:
+                    self._write(r, events, thread_names)
+                except (OSError, ValueError, TypeError) as e:
+                    # Runs on the anchoring thread: a trace problem must never stop it
+                    print(f"⚠️ [Trace] Could not write the timeline of round {r}: {e}")
+
+    def _write(self, round_num, events, thread_names):
+        path = round_file(self.trace_dir, round_num, self.process_name)
+        if os.path.exists(path):
+            # Late spans for a round already written (e.g. a stale upload): extend the file
+            try:
+                with open(path) as f:
+                    events = json.load(f)['traceEvents'] + events
+            except (ValueError, KeyError, TypeError) as e:
+                # Damaged (e.g. written by a tool that crashed mid-write): start it over
+                print(f"⚠️ [Trace] Timeline of round {round_num} is unreadable ({e}), rewriting it")
+        header = [{'ph': 'M', 'name': 'process_name', 'pid': self.pid, 'tid': 0,
+                   'args': {'name': self.process_name}}]
+        header += [{'ph': 'M', 'name': 'thread_name', 'pid': self.pid, 'tid': tid, 'args': {'name': name}}
+                   for tid, name in thread_names.items()]
+        events = header + [e for e in events if e['ph'] != 'M']
+        # Written aside and renamed over: a crash mid-write never leaves a half-written timeline
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, 'w') as f:
+                json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+
+def round_file(trace_dir, round_num, process_name=None):
+    if process_name is None:
+        return os.path.join(trace_dir, f"round-{round_num:06d}.json")
+    safe_name = ''.join(c if c.isalnum() or c in '-_' else '_' for c in process_name)
+    return os.path.join(trace_dir, f"round-{round_num:06d}.{safe_name}.json")
+
+
+def merge_round(trace_dir, round_num):
+    """Joins every process's timeline of a round into round-<n>.json. Returns its path."""
+    pattern = os.path.join(trace_dir, f"round-{round_num:06d}.*.json")
+    events = list(itertools.chain.from_iterable(
+        json.load(open(path))['traceEvents'] for path in sorted(glob.glob(pattern))))
+    if not events:
+        return None
+    path = round_file(trace_dir, round_num)
+    with open(path, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+    return path
+
+
+# One tracer per process (parameter server or edge worker)
+TRACER = Tracer()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge per-process round timelines into one Perfetto trace")
+    parser.add_argument('trace_dir')
+    parser.add_argument('rounds', nargs='*', type=int, help="Rounds to merge (default: all)")
+    args = parser.parse_args()
+
+    rounds = args.rounds or sorted({int(os.path.basename(p).split('.')[0].split('-')[1])
+                                    for p in glob.glob(os.path.join(args.trace_dir, 'round-*.*.json'))})
+    for r in rounds:
+        merged = merge_round(args.trace_dir, r)
+        print(f"🧵 Round {r}: {merged or 'no spans'}")
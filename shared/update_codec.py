@@ -0,0 +1,166 @@
+import math
+
+import torch
+
+import federated_service_pb2 as pb2
+from shared.tensor_codec import encode_state_dict, decode_state_dict, StreamDecoder
+
+# --- MODEL UPDATE COMPRESSION ---
+# Every encoding is carried inside the flat-tensor wire format; only the tensors differ:
+#   RAW   name -> fp32 tensor
+#   FP16  name -> fp16 tensor
+#   INT8  name -> int8 tensor, name#scale -> fp32 scalar (symmetric, per tensor)
+#   TOPK  name#idx -> int32 flat indices, name#val -> fp32 values (deltas only)
+ENCODING_NAMES = {
+    pb2.ENCODING_RAW: 'raw',
+    pb2.ENCODING_FP16: 'fp16',
+    pb2.ENCODING_INT8: 'int8',
+    pb2.ENCODING_TOPK: 'topk',
+}
+ENCODINGS_BY_NAME = {name: encoding for encoding, name in ENCODING_NAMES.items()}
+
+SUPPORTED_ENCODINGS = list(ENCODING_NAMES)
+
+_SCALE = '#scale'
+_IDX = '#idx'
+_VAL = '#val'
+
+
+def _quantize_int8(tensor):
+    scale = tensor.abs().max().item() / 127.0
+    if scale == 0.0:
+        scale = 1.0
+    quantized = torch.clamp(torch.round(tensor / scale), -127, 127).to(torch.int8)
+    return quantized, scale
+
+
+def _top_k(tensor, ratio):
+    flat = tensor.reshape(-1)
+    k = min(flat.numel(), max(1, math.ceil(ratio * flat.numel())))
+    _, indices = torch.topk(flat.abs(), k, sorted=False)
+    return indices.to(torch.int32), flat[indices]
+
+
+def encode_update(state_dict, encoding, topk_ratio=0.01):
+    """
+    Compresses a dict of fp32 tensors (full weights or deltas) for upload.
+    Returns (blob, reconstructed) where `reconstructed` is exactly what the server
+    will decode, so callers can compute the compression error for error feedback.
+    """
+    tensors = {}
+    reconstructed = {}
+    for name, tensor in state_dict.items():
+        tensor = tensor.detach().to(torch.float32)
+        if encoding == pb2.ENCODING_RAW:
+            tensors[name] = tensor
+            reconstructed[name] = tensor
+        elif encoding == pb2.ENCODING_FP16:
+            tensors[name] = tensor.to(torch.float16)
+            reconstructed[name] = tensors[name].to(torch.float32)
+        elif encoding == pb2.ENCODING_INT8:
+            quantized, scale = _quantize_int8(tensor)
+            tensors[name] = quantized
+            tensors[name + _SCALE] = torch.tensor(scale, dtype=torch.float32)
+            reconstructed[name] = quantized.to(torch.float32) * scale
+        elif encoding == pb2.ENCODING_TOPK:
+            indices, values = _top_k(tensor, topk_ratio)
+            tensors[name + _IDX] = indices
+            tensors[name + _VAL] = values
+            sparse = torch.zeros_like(tensor).reshape(-1)
+            sparse[indices.long()] = values
+            reconstructed[name] = sparse.view(tensor.shape)
+        else:
+            raise ValueError(f"Unknown update encoding {encoding}")
+    return encode_state_dict(tensors), reconstructed
+
+
+def decode_update(blob, encoding):
+    """
+    Decodes an uploaded update.
+    Dense encodings return {name: tensor}; TOPK returns {name: (indices, values)}.
+    FP16/RAW tensors are returned as zero-copy views, INT8 is dequantized per layer.
+    """
+    tensors = decode_state_dict(blob)
+
+    if encoding in (pb2.ENCODING_RAW, pb2.ENCODING_FP16):
+        return tensors
+
+    if encoding == pb2.ENCODING_INT8:
+        return {
+            name: tensor.to(torch.float32) * tensors[name + _SCALE]
+            for name, tensor in tensors.items() if not name.endswith(_SCALE)
+        }
+
+    if encoding == pb2.ENCODING_TOPK:
+        return {
+            name[:-len(_IDX)]: (tensor.long(), tensors[name[:-len(_IDX)] + _VAL])
+            for name, tensor in tensors.items() if name.endswith(_IDX)
+        }
+
+    raise ValueError(f"Unknown update encoding {encoding}")
+
+
+class StreamingUpdateDecoder:
+    """
+    Chunked counterpart of decode_update: yields the same (name, layer) items,
+    layer by layer, as soon as each one has fully arrived.
+    on_header(entries) sees the wire header before any layer is buffered (see StreamDecoder).
+    """
+    def __init__(self, encoding, on_header=None):
+        if encoding not in ENCODING_NAMES:
+            raise ValueError(f"Unknown update encoding {encoding}")
+        self.encoding = encoding
+        self._decoder = StreamDecoder(on_header)
+        self._held = {}     # int8 tensors waiting for their scale, top-k indices waiting for values
+
+    def feed(self, chunk):
+        for name, tensor in self._decoder.feed(chunk):
+            if self.encoding in (pb2.ENCODING_RAW, pb2.ENCODING_FP16):
+                yield name, tensor
+            elif self.encoding == pb2.ENCODING_INT8:
+                if name.endswith(_SCALE):
+                    layer = name[:-len(_SCALE)]
+                    yield layer, self._held.pop(layer).to(torch.float32) * tensor
+                else:
+                    self._held[name] = tensor
+            elif name.endswith(_IDX):
+                self._held[name[:-len(_IDX)]] = tensor.long()
+            else:
+                layer = name[:-len(_VAL)]
+                yield layer, (self._held.pop(layer), tensor)
+
+    def finished(self):
+        return self._decoder.finished() and not self._held
+
+
+class UpdateEncoder:
+    """
+    Worker-side encoder. For delta uploads it keeps an error-feedback residual:
+    whatever compression dropped this round is added back into next round's delta.
+    """
+    def __init__(self, encoding, as_delta, topk_ratio=0.01):
+        if encoding == pb2.ENCODING_TOPK and not as_delta:
+            raise ValueError("Top-k sparsification is only defined for delta updates")
+        self.encoding = encoding
+        self.as_delta = as_delta
+        self.topk_ratio = topk_ratio
+        self.residual = {}
+
+    def encode(self, state_dict, base_state_dict=None):
+        """Returns the blob to upload for this round's locally trained weights."""
+        if not self.as_delta:
+            blob, _ = encode_update(state_dict, self.encoding, self.topk_ratio)
+            return blob
+
+        with torch.no_grad():
+            delta = {}
+            for name, tensor in state_dict.items():
+                delta[name] = tensor.to(torch.float32) - base_state_dict[name].to(torch.float32)
+                if name in self.residual:
+                    delta[name] += self.residual[name]
+
+            blob, reconstructed = encode_update(delta, self.encoding, self.topk_ratio)
+
+            # Error feedback: carry what was not transmitted into the next round
+            self.residual = {name: delta[name] - reconstructed[name] for name in delta}
+        return blob
@@ -1,22 +1,30 @@
 import io
 import torch
-import hashlib
+
+from shared.tensor_codec import encode_state_dict, decode_state_dict, is_flat_format
+from shared.model_hash import state_dict_hash
 
 def get_weights_as_bytes(model):
-    """Converts SimpleCNN state_dict to a binary blob."""
-    buffer = io.BytesIO()
-    # Serialize the dictionary of tensors
-    torch.save(model.state_dict(), buffer)
-    return buffer.getvalue()
+    """Converts SimpleCNN state_dict to a binary blob (SCTL flat-tensor format)."""
+    return encode_state_dict(model.state_dict())
 
-def load_weights_from_bytes(model, weights_bytes):
-    """Injects the binary blob back into a SimpleCNN instance."""
+def load_state_dict_from_bytes(weights_bytes):
+    """Decodes a binary blob into a plain state_dict (no model instance needed)."""
+    if is_flat_format(weights_bytes):
+        # Zero-copy: the tensors alias weights_bytes
+        return decode_state_dict(weights_bytes)
+
+    # LEGACY: torch.save zip blobs from older workers. Kept readable for one release.
     buffer = io.BytesIO(weights_bytes)
     # weights_only=True is a security best practice
-    weights = torch.load(buffer, weights_only=True)
+    return torch.load(buffer, weights_only=True)
+
+def load_weights_from_bytes(model, weights_bytes):
+    """Injects the binary blob back into a SimpleCNN instance."""
+    weights = load_state_dict_from_bytes(weights_bytes)
     model.load_state_dict(weights)
     return model
 
 def generate_model_hash(weights_blob):
-    """Generates a SHA=256 hash of the model weights."""
-    return hashlib.sha256(weights_blob).hexdigest()
\ No newline at end of file
+    """Canonical hash of the weights in a blob (same value whatever format the blob uses)."""
+    return state_dict_hash(load_state_dict_from_bytes(weights_blob))